@@ -0,0 +1,256 @@
+import math
+import re
+import time
+from collections import OrderedDict
+
+# Límites por defecto: evitan que una expresión pegada bloquee la calculadora
+MAX_CARACTERES = 500
+MAX_PROFUNDIDAD = 100
+MAX_BITS = 10_000  # tamaño máximo de un entero intermedio (~3000 cifras)
+TIEMPO_MAXIMO = 0.5  # segundos
+
+class ErrorExpresion(Exception):
+    """La expresión no es válida o no se puede evaluar"""
+
+class ErrorPresupuesto(ErrorExpresion):
+    """La evaluación supera el tiempo o el tamaño permitidos"""
+
+# --- Tokenizador ---
+
+# Los números admiten exponente (1e+20) para poder leer los resultados que muestra la calculadora
+PATRON_TOKEN = re.compile(r"\s*(?:((?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?)|(\*\*|//|[-+*/%()]))")
+
+def tokenizar(texto):
+    """Convierte el texto en una lista de tokens (números y operadores)"""
+    if len(texto) > MAX_CARACTERES:
+        raise ErrorPresupuesto("Expresión demasiado larga")
+    tokens = []
+    posicion = 0
+    texto = texto.rstrip()
+    while posicion < len(texto):
+        coincidencia = PATRON_TOKEN.match(texto, posicion)
+        if coincidencia is None:
+            raise ErrorExpresion(f"Carácter no válido: {texto[posicion:].strip()[0]!r}")
+        numero, operador = coincidencia.groups()
+        if numero is not None:
+            es_decimal = '.' in numero or 'e' in numero or 'E' in numero
+            tokens.append(('num', float(numero) if es_decimal else int(numero)))
+        else:
+            tokens.append(('op', operador))
+        posicion = coincidencia.end()
+    if not tokens:
+        raise ErrorExpresion("Expresión vacía")
+    return tokens
+
+def normalizar(tokens):
+    """Forma canónica de la expresión, usada como clave de la caché"""
+    return ''.join(repr(valor) if tipo == 'num' else valor for tipo, valor in tokens)
+
+# --- Analizador sintáctico (misma precedencia que Python) ---
+#   suma     := producto (('+' | '-') producto)*
+#   producto := unario (('*' | '/' | '//' | '%') unario)*
+#   unario   := ('+' | '-') unario | potencia
+#   potencia := atomo ('**' unario)?
+#   atomo    := NUMERO | '(' suma ')'
+
+class _Analizador:
+    def __init__(self, tokens):
+        self.tokens = tokens
+        self.posicion = 0
+        self.profundidad = 0
+
+    def _actual(self):
+        if self.posicion < len(self.tokens):
+            return self.tokens[self.posicion]
+        return (None, None)
+
+    def _es_operador(self, *operadores):
+        tipo, valor = self._actual()
+        return tipo == 'op' and valor in operadores
+
+    def _consumir(self):
+        token = self._actual()
+        self.posicion += 1
+        return token
+
+    def analizar(self):
+        arbol = self._suma()
+        if self.posicion != len(self.tokens):
+            raise ErrorExpresion("Sintaxis no válida")
+        return arbol
+
+    def _entrar(self):
+        self.profundidad += 1
+        if self.profundidad > MAX_PROFUNDIDAD:
+            raise ErrorPresupuesto("Expresión demasiado anidada")
+
+    def _suma(self):
+        arbol = self._producto()
+        while self._es_operador('+', '-'):
+            operador = self._consumir()[1]
+            arbol = ('bin', operador, arbol, self._producto())
+        return arbol
+
+    def _producto(self):
+        arbol = self._unario()
+        while self._es_operador('*', '/', '//', '%'):
+            operador = self._consumir()[1]
+            arbol = ('bin', operador, arbol, self._unario())
+        return arbol
+
+    def _unario(self):
+        if self._es_operador('+', '-'):
+            self._entrar()
+            operador = self._consumir()[1]
+            arbol = ('un', operador, self._unario())
+            self.profundidad -= 1
+            return arbol
+        return self._potencia()
+
+    def _potencia(self):
+        base = self._atomo()
+        if self._es_operador('**'):
+            self._entrar()
+            self._consumir()
+            arbol = ('bin', '**', base, self._unario())
+            self.profundidad -= 1
+            return arbol
+        return base
+
+    def _atomo(self):
+        tipo, valor = self._consumir()
+        if tipo == 'num':
+            return ('num', valor)
+        if tipo == 'op' and valor == '(':
+            self._entrar()
+            arbol = self._suma()
+            if not self._es_operador(')'):
+                raise ErrorExpresion("Falta ')'")
+            self._consumir()
+            self.profundidad -= 1
+            return arbol
+        raise ErrorExpresion("Sintaxis no válida")
+
+def analizar(tokens):
+    """Construye el árbol sintáctico de una lista de tokens"""
+    return _Analizador(tokens).analizar()
+
+# --- Compilación a funciones ---
+
+def _bits(valor):
+    return valor.bit_length() if isinstance(valor, int) else 0
+
+def _comprobar_tamano(valor, max_bits):
+    if isinstance(valor, int) and valor.bit_length() > max_bits:
+        raise ErrorPresupuesto("Resultado demasiado grande")
+    return valor
+
+def _potencia(base, exponente, max_bits):
+    if isinstance(base, int) and isinstance(exponente, int) and exponente > 0 and abs(base) > 1:
+        # Estimar el tamaño antes de calcular: bits ≈ exponente · log2|base|
+        if exponente * math.log2(abs(base)) > max_bits:
+            raise ErrorPresupuesto("Resultado demasiado grande")
+    resultado = base ** exponente
+    # (-1) ** 0.5 da un complejo, que la calculadora no sabe mostrar ni operar
+    if isinstance(resultado, complex):
+        raise ErrorExpresion("El resultado no es un número real")
+    return resultado
+
+def _multiplicar(a, b, max_bits):
+    if _bits(a) + _bits(b) > max_bits + 1:
+        raise ErrorPresupuesto("Resultado demasiado grande")
+    return a * b
+
+OPERACIONES = {
+    '+': lambda a, b, max_bits: _comprobar_tamano(a + b, max_bits),
+    '-': lambda a, b, max_bits: _comprobar_tamano(a - b, max_bits),
+    '*': _multiplicar,
+    '/': lambda a, b, max_bits: a / b,
+    '//': lambda a, b, max_bits: a // b,
+    '%': lambda a, b, max_bits: a % b,
+    '**': _potencia,
+}
+
+def compilar(arbol):
+    """Convierte el árbol en una función evaluar(limite_tiempo, max_bits)"""
+    tipo = arbol[0]
+    if tipo == 'num':
+        valor = arbol[1]
+        return lambda limite, max_bits: valor
+
+    if tipo == 'un':
+        operando = compilar(arbol[2])
+        if arbol[1] == '-':
+            return lambda limite, max_bits: -operando(limite, max_bits)
+        return lambda limite, max_bits: +operando(limite, max_bits)
+
+    _, operador, izquierda, derecha = arbol
+    funcion_izquierda = compilar(izquierda)
+    funcion_derecha = compilar(derecha)
+    operacion = OPERACIONES[operador]
+
+    def evaluar_binaria(limite, max_bits):
+        a = funcion_izquierda(limite, max_bits)
+        b = funcion_derecha(limite, max_bits)
+        if time.perf_counter() > limite:
+            raise ErrorPresupuesto("Tiempo de cálculo agotado")
+        return operacion(a, b, max_bits)
+
+    return evaluar_binaria
+
+# --- Evaluación con caché ---
+
+class Evaluador:
+    """Evalúa expresiones de la calculadora con caché LRU y límites de tiempo y tamaño.
+
+    La caché se indexa por la forma normalizada de la expresión y guarda tanto
+    resultados como errores deterministas (sintaxis, división por cero); los
+    errores por tiempo agotado no se guardan porque dependen de la máquina.
+    """
+    def __init__(self, tamano_cache=256, tiempo_maximo=TIEMPO_MAXIMO, max_bits=MAX_BITS):
+        self.tamano_cache = tamano_cache
+        self.tiempo_maximo = tiempo_maximo
+        self.max_bits = max_bits
+        self.cache = OrderedDict()
+
+    def _guardar(self, clave, entrada):
+        self.cache[clave] = entrada
+        self.cache.move_to_end(clave)
+        if len(self.cache) > self.tamano_cache:
+            self.cache.popitem(last=False)
+
+    def evaluar(self, texto):
+        """Devuelve el valor de la expresión o lanza ErrorExpresion"""
+        tokens = tokenizar(texto)
+        clave = normalizar(tokens)
+
+        if clave in self.cache:
+            self.cache.move_to_end(clave)
+            resultado, error = self.cache[clave]
+            if error is not None:
+                raise ErrorExpresion(error)
+            return resultado
+
+        try:
+            funcion = compilar(analizar(tokens))
+            resultado = funcion(time.perf_counter() + self.tiempo_maximo, self.max_bits)
+        except ErrorPresupuesto:
+            raise
+        except ErrorExpresion as e:
+            self._guardar(clave, (None, str(e)))
+            raise
+        except RecursionError:
+            raise ErrorPresupuesto("Expresión demasiado anidada")
+        except (ArithmeticError, ValueError, TypeError) as e:
+            # División por cero, desbordamiento de float, operaciones no válidas, etc.
+            self._guardar(clave, (None, str(e)))
+            raise ErrorExpresion(str(e))
+
+        self._guardar(clave, (resultado, None))
+        return resultado
+
+_evaluador = Evaluador()
+
+def evaluar(texto):
+    """Evalúa una expresión con el evaluador compartido"""
+    return _evaluador.evaluar(texto)
@@ -1,4 +1,11 @@
+import queue
+import threading
 import tkinter as tk
+from expresiones import evaluar, ErrorExpresion
+
+# Resultados que devuelve el hilo de cálculo
+resultados = queue.Queue()
+calculando = False
 
 def presionar(boton):
     # Añadir el carácter presionado a la expresión
@@ -8,12 +15,43 @@ def borrar():
     # Vaciar la pantalla
     expresion.set("")
 
+def evaluar_texto(texto):
+    # Evalúa la expresión con el evaluador restringido (sin eval)
+    try:
+        return str(evaluar(texto))
+    except ErrorExpresion:
+        return "Error"
+
+def calcular_en_hilo(texto):
+    # Siempre deja un resultado en la cola, aunque falle algo inesperado,
+    # para que recoger_resultado termine y se pueda volver a calcular
+    resultado = "Error"
+    try:
+        resultado = evaluar_texto(texto)
+    except Exception:
+        pass
+    finally:
+        resultados.put(resultado)
+
 def calcular():
+    global calculando
+    if calculando:
+        return
+    calculando = True
+    # Evaluar fuera del hilo de la interfaz para que la ventana no se bloquee
+    texto = expresion.get()
+    threading.Thread(target=calcular_en_hilo, args=(texto,), daemon=True).start()
+    ventana.after(10, recoger_resultado)
+
+def recoger_resultado():
+    global calculando
     try:
-        resultado = eval(expresion.get())  # Evalúa la expresión
-        expresion.set(str(resultado))
-    except:
-        expresion.set("Error")
+        resultado = resultados.get_nowait()
+    except queue.Empty:
+        ventana.after(10, recoger_resultado)
+        return
+    expresion.set(resultado)
+    calculando = False
 
 # Crear ventana
 ventana = tk.Tk()
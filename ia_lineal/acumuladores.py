@@ -0,0 +1,179 @@
+import hashlib
+import json
+import os
+from multiprocessing import Pool
+import numpy as np
+import pandas as pd
+from modelo_manual import ModeloManual
+
+class AcumuladorRegresion:
+    """Estadísticos suficientes de una regresión lineal simple que se pueden combinar.
+
+    Guarda el número de puntos, las medias y los co-momentos centrados
+    (Σ(x-x̄)², Σ(y-ȳ)², Σ(x-x̄)(y-ȳ)). Dos acumuladores se combinan con la
+    fórmula paralela de Chan et al., de modo que reducir fragmentos por
+    separado y combinarlos en cualquier orden da el mismo ajuste global.
+    """
+    def __init__(self, n=0, media_x=0.0, media_y=0.0, m2_x=0.0, m2_y=0.0, c_xy=0.0):
+        self.n = int(n)
+        self.media_x = float(media_x)
+        self.media_y = float(media_y)
+        self.m2_x = float(m2_x)
+        self.m2_y = float(m2_y)
+        self.c_xy = float(c_xy)
+
+    @classmethod
+    def desde_arrays(cls, X, y):
+        """Crea un acumulador a partir de arrays de datos"""
+        X = np.asarray(X, dtype=float).ravel()
+        y = np.asarray(y, dtype=float).ravel()
+        if len(X) != len(y):
+            raise ValueError("X e y deben tener la misma longitud")
+        if len(X) == 0:
+            return cls()
+        media_x = np.mean(X)
+        media_y = np.mean(y)
+        dx = X - media_x
+        dy = y - media_y
+        return cls(len(X), media_x, media_y, np.dot(dx, dx), np.dot(dy, dy), np.dot(dx, dy))
+
+    def combinar(self, otro):
+        """Devuelve un nuevo acumulador con los datos de ambos"""
+        if otro.n == 0:
+            return self.copia()
+        if self.n == 0:
+            return otro.copia()
+        n = self.n + otro.n
+        delta_x = otro.media_x - self.media_x
+        delta_y = otro.media_y - self.media_y
+        factor = self.n * otro.n / n
+        return AcumuladorRegresion(
+            n,
+            self.media_x + delta_x * otro.n / n,
+            self.media_y + delta_y * otro.n / n,
+            self.m2_x + otro.m2_x + delta_x * delta_x * factor,
+            self.m2_y + otro.m2_y + delta_y * delta_y * factor,
+            self.c_xy + otro.c_xy + delta_x * delta_y * factor,
+        )
+
+    def agregar(self, X, y):
+        """Incorpora un bloque de datos al acumulador"""
+        combinado = self.combinar(AcumuladorRegresion.desde_arrays(X, y))
+        self.__dict__.update(combinado.__dict__)
+        return self
+
+    def copia(self):
+        return AcumuladorRegresion(**self.a_dict())
+
+    def __add__(self, otro):
+        return self.combinar(otro)
+
+    def __radd__(self, otro):
+        # Permite usar sum() sobre una lista de acumuladores
+        if otro == 0:
+            return self.copia()
+        return otro.combinar(self)
+
+    @property
+    def pendiente(self):
+        if self.m2_x == 0:
+            return 0.0
+        return self.c_xy / self.m2_x
+
+    @property
+    def intercepto(self):
+        return self.media_y - self.pendiente * self.media_x
+
+    @property
+    def r2(self):
+        if self.m2_y == 0:
+            return 1.0
+        ss_res = max(self.m2_y - self.pendiente * self.c_xy, 0.0)
+        return 1 - ss_res / self.m2_y
+
+    def modelo(self):
+        """Devuelve el modelo lineal ajustado con la interfaz de sklearn"""
+        return ModeloManual(self.pendiente, self.intercepto)
+
+    def a_dict(self):
+        return {
+            'n': self.n,
+            'media_x': self.media_x,
+            'media_y': self.media_y,
+            'm2_x': self.m2_x,
+            'm2_y': self.m2_y,
+            'c_xy': self.c_xy,
+        }
+
+    @classmethod
+    def desde_dict(cls, datos):
+        return cls(**datos)
+
+    def guardar(self, nombre_archivo):
+        """Guarda el acumulador en un archivo JSON"""
+        with open(nombre_archivo, 'w', encoding='utf-8') as f:
+            json.dump(self.a_dict(), f)
+
+    @classmethod
+    def cargar(cls, nombre_archivo):
+        """Carga un acumulador desde un archivo JSON"""
+        with open(nombre_archivo, 'r', encoding='utf-8') as f:
+            return cls.desde_dict(json.load(f))
+
+    def __repr__(self):
+        return (f"AcumuladorRegresion(n={self.n}, m={self.pendiente:.4f}, "
+                f"b={self.intercepto:.4f}, r2={self.r2:.4f})")
+
+def reducir_archivo(nombre_archivo, columna_x='Horas', columna_y='Nota', tamano_bloque=100_000):
+    """Reduce un CSV a un acumulador leyéndolo por bloques"""
+    acumulador = AcumuladorRegresion()
+    for bloque in pd.read_csv(nombre_archivo, usecols=[columna_x, columna_y], chunksize=tamano_bloque):
+        acumulador.agregar(bloque[columna_x].to_numpy(), bloque[columna_y].to_numpy())
+    return acumulador
+
+def _firma_archivo(nombre_archivo, columna_x, columna_y):
+    """Identifica el contenido de un archivo por ruta, tamaño y fecha de modificación"""
+    info = os.stat(nombre_archivo)
+    return {
+        'ruta': os.path.abspath(nombre_archivo),
+        'tamano': info.st_size,
+        'modificado': info.st_mtime_ns,
+        'columnas': [columna_x, columna_y],
+    }
+
+def reducir_con_cache(nombre_archivo, directorio_cache, columna_x='Horas', columna_y='Nota'):
+    """Reduce un CSV reutilizando el acumulador guardado si el archivo no ha cambiado"""
+    firma = _firma_archivo(nombre_archivo, columna_x, columna_y)
+    # Una entrada por ruta y columnas; tamaño y fecha se comprueban al leer, así
+    # un archivo modificado reemplaza su entrada antigua en vez de acumular otra
+    clave = hashlib.sha1(json.dumps([firma['ruta'], firma['columnas']]).encode('utf-8')).hexdigest()
+    ruta_cache = os.path.join(directorio_cache, f"{clave}.json")
+
+    try:
+        with open(ruta_cache, 'r', encoding='utf-8') as f:
+            guardado = json.load(f)
+        if guardado['firma'] == firma:
+            return AcumuladorRegresion.desde_dict(guardado['acumulador'])
+    except (FileNotFoundError, KeyError, ValueError):
+        pass
+
+    acumulador = reducir_archivo(nombre_archivo, columna_x, columna_y)
+    os.makedirs(directorio_cache, exist_ok=True)
+    temporal = ruta_cache + '.tmp'
+    with open(temporal, 'w', encoding='utf-8') as f:
+        json.dump({'firma': firma, 'acumulador': acumulador.a_dict()}, f)
+    os.replace(temporal, ruta_cache)
+    return acumulador
+
+def _reducir_tarea(argumentos):
+    nombre_archivo, directorio_cache, columna_x, columna_y = argumentos
+    if directorio_cache is None:
+        return reducir_archivo(nombre_archivo, columna_x, columna_y)
+    return reducir_con_cache(nombre_archivo, directorio_cache, columna_x, columna_y)
+
+def ajustar_en_paralelo(archivos, procesos=None, directorio_cache=None, columna_x='Horas', columna_y='Nota'):
+    """Reduce cada archivo en un proceso distinto y combina los resultados en el ajuste global"""
+    tareas = [(archivo, directorio_cache, columna_x, columna_y) for archivo in archivos]
+    with Pool(processes=procesos) as pool:
+        parciales = pool.map(_reducir_tarea, tareas)
+    return sum(parciales, AcumuladorRegresion())
@@ -0,0 +1,132 @@
+import warnings
+import numpy as np
+import metricas
+
+def sigmoide(z):
+    """Función logística estable numéricamente"""
+    return np.exp(-np.logaddexp(0.0, -z))
+
+class RegresionLogistica:
+    """Clasificador aprobado/suspenso: estima P(nota ≥ umbral_nota) a partir de las variables.
+
+    Con metodo='newton' ajusta por Newton/IRLS, con gradiente y hessiana
+    calculados de forma vectorizada sobre todas las filas. Con metodo='lotes'
+    usa descenso de gradiente por mini-lotes, pensado para datos muy grandes:
+    se detiene cuando el cambio de w en una época, dividido por la tasa y el
+    número de lotes (≈ el gradiente medio), baja de tol_lotes, y avisa si
+    llega a `epocas` sin conseguirlo.
+    Sigue la interfaz de sklearn (fit, predict, predict_proba, coef_, intercept_).
+    """
+    def __init__(self, umbral_nota=5.0, metodo='newton', l2=1e-4, max_iter=50, tol=1e-8,
+                 tamano_lote=1024, tasa=1.0, epocas=1000, tol_lotes=1e-3, semilla=42):
+        self.umbral_nota = umbral_nota
+        self.metodo = metodo
+        self.l2 = l2
+        self.max_iter = max_iter
+        self.tol = tol
+        self.tamano_lote = tamano_lote
+        self.tasa = tasa
+        self.epocas = epocas
+        self.tol_lotes = tol_lotes
+        self.semilla = semilla
+
+    @staticmethod
+    def _preparar(X):
+        X = np.asarray(X, dtype=float)
+        if X.ndim == 0:
+            X = X.reshape(1, 1)
+        elif X.ndim == 1:
+            X = X.reshape(-1, 1)
+        return X
+
+    @metricas.medido('entrenamiento_logistica')
+    def fit(self, X, notas):
+        """Ajusta el clasificador; las etiquetas son notas ≥ umbral_nota"""
+        X = self._preparar(X)
+        etiquetas = (np.asarray(notas, dtype=float).ravel() >= self.umbral_nota).astype(float)
+
+        # Estandarizar mejora el condicionamiento; los coeficientes se devuelven en la escala original
+        self._media = X.mean(axis=0)
+        self._escala = X.std(axis=0)
+        self._escala[self._escala == 0] = 1.0
+        Xa = np.column_stack([np.ones(len(X)), (X - self._media) / self._escala])
+
+        if self.metodo == 'newton':
+            w = self._ajustar_newton(Xa, etiquetas)
+        elif self.metodo == 'lotes':
+            w = self._ajustar_lotes(Xa, etiquetas)
+        else:
+            raise ValueError(f"Método desconocido: {self.metodo}")
+
+        self.coef_ = w[1:] / self._escala
+        self.intercept_ = w[0] - np.dot(self.coef_, self._media)
+        return self
+
+    def _ajustar_newton(self, Xa, etiquetas):
+        """Newton/IRLS: w ← w - H⁻¹·g con H = Xᵀ·diag(p(1-p))·X + λI"""
+        n, k = Xa.shape
+        w = np.zeros(k)
+        penalizacion = self.l2 * n * np.eye(k)
+        penalizacion[0, 0] = 0.0  # el intercepto no se penaliza
+        self.n_iter_ = 0
+        for iteracion in range(self.max_iter):
+            p = sigmoide(Xa @ w)
+            gradiente = Xa.T @ (p - etiquetas) + penalizacion @ w
+            pesos = p * (1.0 - p)
+            hessiana = (Xa.T * pesos) @ Xa + penalizacion
+            paso = np.linalg.solve(hessiana + 1e-12 * np.eye(k), gradiente)
+            w -= paso
+            self.n_iter_ = iteracion + 1
+            if np.max(np.abs(paso)) < self.tol:
+                break
+        return w
+
+    def _ajustar_lotes(self, Xa, etiquetas):
+        """Descenso de gradiente por mini-lotes con tasa decreciente"""
+        n, k = Xa.shape
+        w = np.zeros(k)
+        rng = np.random.RandomState(self.semilla)
+        n_lotes = -(-n // self.tamano_lote)
+        self.n_iter_ = 0
+        for epoca in range(self.epocas):
+            tasa = self.tasa / np.sqrt(1.0 + epoca)
+            orden = rng.permutation(n)
+            w_anterior = w.copy()
+            for inicio in range(0, n, self.tamano_lote):
+                lote = orden[inicio:inicio + self.tamano_lote]
+                p = sigmoide(Xa[lote] @ w)
+                gradiente = Xa[lote].T @ (p - etiquetas[lote]) / len(lote)
+                gradiente[1:] += self.l2 * w[1:]
+                w -= tasa * gradiente
+            self.n_iter_ = epoca + 1
+            # Normalizar por la tasa evita que su decaimiento parezca convergencia
+            if np.max(np.abs(w - w_anterior)) / (tasa * n_lotes) < self.tol_lotes:
+                break
+        else:
+            warnings.warn(f"El descenso por mini-lotes no convergió en {self.epocas} épocas; "
+                          "aumenta epocas o tasa, o usa metodo='newton'")
+        return w
+
+    @metricas.medido('prediccion_logistica')
+    def probabilidad_aprobar(self, X):
+        """P(nota ≥ umbral) para cada fila de X (acepta escalares y arrays)"""
+        X = self._preparar(X)
+        return sigmoide(X @ self.coef_ + self.intercept_)
+
+    def predict_proba(self, X):
+        """Probabilidades [suspenso, aprobado] por fila, como en sklearn"""
+        p = self.probabilidad_aprobar(X)
+        return np.column_stack([1.0 - p, p])
+
+    def predict(self, X):
+        """1 si se predice aprobado, 0 si no"""
+        return (self.probabilidad_aprobar(X) >= 0.5).astype(int)
+
+def recomendacion_por_probabilidad(probabilidad):
+    """Consejo según la probabilidad de aprobar"""
+    if probabilidad >= 0.8:
+        return "✅ ¡Excelente! Con esas horas es muy probable que apruebes."
+    elif probabilidad >= 0.5:
+        return "⚠️ Con esas horas probablemente apruebes, pero considera estudiar más."
+    else:
+        return "❌ Con esas horas es más probable suspender. Te recomiendo estudiar más."
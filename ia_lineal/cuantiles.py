@@ -0,0 +1,146 @@
+import numpy as np
+
+class BocetoKLL:
+    """Boceto de cuantiles KLL: memoria acotada, actualización incremental y combinable.
+
+    Los valores se guardan en niveles; un valor del nivel h representa 2^h
+    valores originales. Cuando un nivel supera su capacidad se ordena y se
+    promueve al nivel siguiente uno de cada dos elementos (empezando en una
+    posición al azar), así que el peso total se conserva y el error de rango
+    es insesgado. La capacidad del nivel más alto es k y la de cada nivel
+    inferior 2/3 de la del siguiente, de modo que se guardan unos 3·k valores
+    sea cual sea n, y el error de rango es del orden de 1.7 / k (k=200 → ~1 %).
+    Dos bocetos se combinan uniendo sus niveles, por lo que se pueden calcular
+    por bloques, archivos o procesos y juntarlos al final. Mínimo y máximo son exactos.
+    """
+    def __init__(self, k=200, semilla=42):
+        self.k = k
+        self.rng = np.random.RandomState(semilla)
+        self.niveles = [np.empty(0)]
+        self._pendientes = []
+        self._n_pendientes = 0
+        self._ordenados = None
+        self._en_niveles = 0
+        self._limite = self._capacidad_total()
+        self.n = 0
+        self.minimo = np.inf
+        self.maximo = -np.inf
+
+    @classmethod
+    def con_error(cls, error, semilla=42):
+        """Boceto con un error de rango aproximado `error` (p. ej. 0.01 para ±1 %)"""
+        return cls(int(np.ceil(1.7 / error)), semilla)
+
+    @property
+    def error_estimado(self):
+        return 1.7 / self.k
+
+    @property
+    def tamano(self):
+        """Número de valores guardados"""
+        return self._en_niveles + self._n_pendientes
+
+    def _capacidad(self, h):
+        return max(2, int(np.ceil(self.k * (2 / 3) ** (len(self.niveles) - 1 - h))))
+
+    def _capacidad_total(self):
+        return sum(self._capacidad(h) for h in range(len(self.niveles)))
+
+    def agregar(self, valores):
+        """Añade un valor o un array de valores"""
+        valores = np.asarray(valores, dtype=float).ravel()
+        if len(valores) == 0:
+            return self
+        self.n += len(valores)
+        self.minimo = min(self.minimo, valores.min())
+        self.maximo = max(self.maximo, valores.max())
+        self._pendientes.append(valores)
+        self._n_pendientes += len(valores)
+        self._ordenados = None
+        # Compactación perezosa: solo cuando se llena el espacio total, no el nivel 0
+        if self._en_niveles + self._n_pendientes >= self._limite:
+            self._compactar()
+        return self
+
+    def _compactar(self):
+        """Pasa los pendientes al nivel 0 y compacta, de abajo arriba, los niveles llenos"""
+        if self._pendientes:
+            self.niveles[0] = np.concatenate([self.niveles[0]] + self._pendientes)
+            self._pendientes = []
+            self._n_pendientes = 0
+        h = 0
+        while h < len(self.niveles):
+            nivel = self.niveles[h]
+            if len(nivel) >= self._capacidad(h):
+                if h + 1 == len(self.niveles):
+                    self.niveles.append(np.empty(0))
+                ordenado = np.sort(nivel)
+                # Con un número impar de valores, el último se queda en este nivel
+                sobrante = len(ordenado) % 2
+                pares = ordenado[:len(ordenado) - sobrante]
+                self.niveles[h] = ordenado[len(pares):]
+                self.niveles[h + 1] = np.concatenate([self.niveles[h + 1], pares[self.rng.randint(2)::2]])
+            h += 1
+        self._en_niveles = sum(len(nivel) for nivel in self.niveles)
+        self._limite = self._capacidad_total()
+
+    def combinar(self, otro):
+        """Devuelve un nuevo boceto con los datos de ambos"""
+        combinado = BocetoKLL(max(self.k, otro.k))
+        combinado.rng = self.rng
+        altura = max(len(self.niveles), len(otro.niveles))
+        combinado.niveles = [
+            np.concatenate([b.niveles[h] for b in (self, otro) if h < len(b.niveles)])
+            for h in range(altura)
+        ]
+        combinado._pendientes = self._pendientes + otro._pendientes
+        combinado._n_pendientes = self._n_pendientes + otro._n_pendientes
+        combinado.n = self.n + otro.n
+        combinado.minimo = min(self.minimo, otro.minimo)
+        combinado.maximo = max(self.maximo, otro.maximo)
+        combinado._compactar()
+        return combinado
+
+    def _ponderados(self):
+        """(valores ordenados, pesos acumulados), calculados una vez por cada estado del boceto"""
+        if self._ordenados is None:
+            valores = np.concatenate(self.niveles + self._pendientes)
+            pesos = np.concatenate([np.full(len(nivel), 2.0 ** h) for h, nivel in enumerate(self.niveles)]
+                                   + [np.ones(self._n_pendientes)])
+            orden = np.argsort(valores, kind='stable')
+            self._ordenados = valores[orden], np.cumsum(pesos[orden])
+        return self._ordenados
+
+    def cuantiles(self, qs):
+        """Cuantiles aproximados para un array de probabilidades en [0, 1]"""
+        qs = np.asarray(qs, dtype=float)
+        if self.n == 0:
+            return np.full(qs.shape, np.nan)
+        valores, acumulados = self._ponderados()
+        if self.tamano == self.n:
+            # Aún no se ha compactado nada: cuantil exacto, interpolado como np.quantile
+            return np.quantile(valores, np.clip(qs, 0, 1))
+        indices = np.searchsorted(acumulados, qs * acumulados[-1], side='left')
+        resultado = valores[np.clip(indices, 0, len(valores) - 1)]
+        resultado = np.where(qs <= 0, self.minimo, resultado)
+        return np.where(qs >= 1, self.maximo, resultado)
+
+    def cuantil(self, q):
+        return float(self.cuantiles([q])[0])
+
+    def rango(self, x):
+        """Fracción aproximada de valores <= x"""
+        if self.n == 0:
+            return np.nan
+        valores, acumulados = self._ponderados()
+        i = np.searchsorted(valores, x, side='right')
+        return acumulados[i - 1] / acumulados[-1] if i > 0 else 0.0
+
+    def histograma(self, bins=10, rango=None):
+        """Histograma aproximado (conteos, bordes) a partir de los valores ponderados"""
+        valores, acumulados = self._ponderados()
+        pesos = np.diff(acumulados, prepend=0.0)
+        return np.histogram(valores, bins=bins, range=rango, weights=pesos)
+
+    def __repr__(self):
+        return f"BocetoKLL(k={self.k}, n={self.n}, guardados={self.tamano})"
@@ -0,0 +1,64 @@
+from collections import namedtuple
+import numpy as np
+
+CurvaAprendizaje = namedtuple('CurvaAprendizaje', ['n', 'pendiente', 'intercepto', 'r2'])
+
+def generar_muestras(n_max, ruido=0.5, replicas=1, semilla=42):
+    """Genera `replicas` muestras de tamaño n_max (una por fila).
+
+    La fila r usa la semilla semilla + r, así que coincide con la celda de
+    tamaño n_max y repetición r de experimentos_grid.generar_celdas.
+    """
+    horas = np.empty((replicas, n_max))
+    notas = np.empty((replicas, n_max))
+    for r in range(replicas):
+        rng = np.random.RandomState(semilla + r)
+        horas[r] = rng.uniform(0.5, 8.0, n_max)
+        notas[r] = 0.8 * horas[r] + 1.5 + rng.normal(0, ruido, n_max)
+    return horas, np.clip(notas, 0, 10)
+
+def curva_aprendizaje(x, y, n_min=2):
+    """Ajuste lineal y R² de todos los prefijos x[:n], y[:n] con n = n_min..len(x).
+
+    Con sumas acumuladas de x, y, x², xy e y² cada prefijo se resuelve en
+    O(1), de modo que la curva completa cuesta una pasada sobre los datos.
+    Acepta arrays 1D o 2D [réplicas, n]; en 2D cada fila es una curva y se
+    calculan todas a la vez. Los datos se centran antes de acumular para no
+    perder precisión con muestras grandes.
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    una_fila = x.ndim == 1
+    x = np.atleast_2d(x)
+    y = np.atleast_2d(y)
+
+    centro_x = x.mean(axis=1, keepdims=True)
+    centro_y = y.mean(axis=1, keepdims=True)
+    dx = x - centro_x
+    dy = y - centro_y
+
+    n = np.arange(1, x.shape[1] + 1, dtype=float)
+    suma_x = np.cumsum(dx, axis=1)
+    suma_y = np.cumsum(dy, axis=1)
+    s_xx = np.cumsum(dx * dx, axis=1) - suma_x * suma_x / n
+    s_xy = np.cumsum(dx * dy, axis=1) - suma_x * suma_y / n
+    s_yy = np.cumsum(dy * dy, axis=1) - suma_y * suma_y / n
+
+    inicio = n_min - 1
+    n, suma_x, suma_y = n[inicio:], suma_x[:, inicio:], suma_y[:, inicio:]
+    s_xx, s_xy, s_yy = s_xx[:, inicio:], s_xy[:, inicio:], s_yy[:, inicio:]
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        pendiente = s_xy / s_xx
+        r2 = np.where(s_yy > 0, s_xy * s_xy / (s_xx * s_yy), 1.0)  # sin variación en y, R² = 1
+    intercepto = (suma_y / n + centro_y) - pendiente * (suma_x / n + centro_x)
+
+    if una_fila:
+        pendiente, intercepto, r2 = pendiente[0], intercepto[0], r2[0]
+    return CurvaAprendizaje(n.astype(int), pendiente, intercepto, r2)
+
+def valores_en(curva, tamanos):
+    """Recorta la curva a los tamaños pedidos (búsqueda por índice, sin recalcular)"""
+    indices = np.asarray(tamanos) - curva.n[0]
+    return CurvaAprendizaje(curva.n[indices], curva.pendiente[..., indices],
+                            curva.intercepto[..., indices], curva.r2[..., indices])
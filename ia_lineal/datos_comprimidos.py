@@ -0,0 +1,163 @@
+from collections import namedtuple
+import numpy as np
+import pandas as pd
+from modelo_manual import ModeloManual
+from estadisticas import ResumenColumna
+
+DiagnosticosGrupos = namedtuple('DiagnosticosGrupos', [
+    'apalancamiento',    # h de cada fila del grupo (todas comparten x)
+    'residuos_medios',   # ȳ_g - ŷ(x_g)
+    'studentizados',     # residuo medio / su error estándar
+    'cook',              # distancia de Cook al eliminar el grupo entero
+    'influyentes',       # máscara booleana de grupos influyentes (Cook > 4 / número de grupos)
+])
+
+class DatosComprimidos:
+    """Datos (x, y) agrupados por valor de x: x único, número de filas, Σy, Σy², mín. y máx. de y.
+
+    Con x registrada a poca resolución (horas enteras o medias horas) millones
+    de filas se quedan en unas decenas de grupos, y el ajuste, R², los
+    estadísticos y los diagnósticos de residuos se calculan con fórmulas
+    ponderadas sobre los grupos, en O(grupos) en lugar de O(filas).
+    """
+    def __init__(self, x, conteo, suma_y, suma_y2, minimo_y, maximo_y):
+        self.x = np.asarray(x, dtype=float)
+        self.conteo = np.asarray(conteo, dtype=np.int64)
+        self.suma_y = np.asarray(suma_y, dtype=float)
+        self.suma_y2 = np.asarray(suma_y2, dtype=float)
+        self.minimo_y = np.asarray(minimo_y, dtype=float)
+        self.maximo_y = np.asarray(maximo_y, dtype=float)
+
+    @classmethod
+    def desde_arrays(cls, x, y):
+        x = np.asarray(x, dtype=float).ravel()
+        y = np.asarray(y, dtype=float).ravel()
+        unicos, grupo, conteo = np.unique(x, return_inverse=True, return_counts=True)
+        minimo_y = np.full(len(unicos), np.inf)
+        maximo_y = np.full(len(unicos), -np.inf)
+        np.minimum.at(minimo_y, grupo, y)
+        np.maximum.at(maximo_y, grupo, y)
+        return cls(unicos, conteo,
+                   np.bincount(grupo, weights=y, minlength=len(unicos)),
+                   np.bincount(grupo, weights=y * y, minlength=len(unicos)),
+                   minimo_y, maximo_y)
+
+    @classmethod
+    def desde_df(cls, df, columna_x='Horas', columna_y='Nota'):
+        return cls.desde_arrays(df[columna_x].to_numpy(dtype=float), df[columna_y].to_numpy(dtype=float))
+
+    @classmethod
+    def desde_csv(cls, nombre_archivo, columna_x='Horas', columna_y='Nota', tamano_bloque=100_000):
+        """Comprime un CSV leyéndolo por bloques"""
+        comprimidos = cls.desde_arrays([], [])
+        for bloque in pd.read_csv(nombre_archivo, usecols=[columna_x, columna_y], chunksize=tamano_bloque):
+            comprimidos = comprimidos.combinar(cls.desde_df(bloque, columna_x, columna_y))
+        return comprimidos
+
+    def combinar(self, otro):
+        """Une dos compresiones sumando los grupos con la misma x"""
+        unicos, grupo = np.unique(np.concatenate([self.x, otro.x]), return_inverse=True)
+        def sumar(a, b):
+            return np.bincount(grupo, weights=np.concatenate([a, b]), minlength=len(unicos))
+        minimo_y = np.full(len(unicos), np.inf)
+        maximo_y = np.full(len(unicos), -np.inf)
+        np.minimum.at(minimo_y, grupo, np.concatenate([self.minimo_y, otro.minimo_y]))
+        np.maximum.at(maximo_y, grupo, np.concatenate([self.maximo_y, otro.maximo_y]))
+        return DatosComprimidos(unicos, sumar(self.conteo, otro.conteo).astype(np.int64),
+                                sumar(self.suma_y, otro.suma_y), sumar(self.suma_y2, otro.suma_y2),
+                                minimo_y, maximo_y)
+
+    @property
+    def n(self):
+        """Número de filas originales"""
+        return int(self.conteo.sum())
+
+    @property
+    def medias_y(self):
+        return self.suma_y / self.conteo
+
+    @property
+    def ss_dentro(self):
+        """Suma de cuadrados de y dentro de cada grupo: Σy² - (Σy)²/n_g"""
+        return np.maximum(self.suma_y2 - self.suma_y * self.medias_y, 0.0)
+
+    def _medias(self):
+        n = self.n
+        return np.dot(self.conteo, self.x) / n, self.suma_y.sum() / n
+
+    def _s_xx(self, x_media):
+        dx = self.x - x_media
+        return np.dot(self.conteo, dx * dx)
+
+    def ajustar(self):
+        """Recta de mínimos cuadrados con todas las filas, calculada sobre los grupos"""
+        x_media, y_media = self._medias()
+        dx = self.x - x_media
+        s_xx = np.dot(self.conteo, dx * dx)
+        # Σ (x_i - x̄)(y_i - ȳ) = Σ_g (x_g - x̄)·Σy_g porque Σ_g n_g (x_g - x̄) = 0
+        m = np.dot(dx, self.suma_y) / s_xx if s_xx > 0 else 0.0
+        return ModeloManual(m, y_media - m * x_media)
+
+    def ss_res(self, m, b):
+        """Σ (y_i - (m·x_i + b))² = SS dentro de los grupos + Σ n_g (ȳ_g - ŷ_g)²"""
+        residuos_medios = self.medias_y - (m * self.x + b)
+        return float(self.ss_dentro.sum() + np.dot(self.conteo, residuos_medios * residuos_medios))
+
+    def ss_tot(self):
+        _, y_media = self._medias()
+        entre = self.medias_y - y_media
+        return float(self.ss_dentro.sum() + np.dot(self.conteo, entre * entre))
+
+    def r2(self, m, b):
+        ss_tot = self.ss_tot()
+        if ss_tot == 0:
+            return 1.0  # Si no hay variación, R² = 1
+        return 1 - self.ss_res(m, b) / ss_tot
+
+    def resumen(self):
+        """ResumenColumna de x e y (los índices son posiciones de grupo, no de fila)"""
+        x_media, y_media = self._medias()
+        n = self.n
+        std_x = np.sqrt(self._s_xx(x_media) / (n - 1)) if n > 1 else float('nan')
+        std_y = np.sqrt(self.ss_tot() / (n - 1)) if n > 1 else float('nan')
+        return {
+            'x': ResumenColumna(n, x_media, std_x, self.x[0], self.x[-1], 0, len(self.x) - 1),
+            'y': ResumenColumna(n, y_media, std_y, self.minimo_y.min(), self.maximo_y.max(),
+                                int(np.argmin(self.minimo_y)), int(np.argmax(self.maximo_y))),
+        }
+
+    def diagnosticos(self, m, b):
+        """Diagnósticos de residuos por grupo, en forma cerrada.
+
+        Todas las filas de un grupo comparten apalancamiento h_g = 1/n + (x_g - x̄)²/Sxx.
+        Var(ȳ_g - ŷ_g) = σ²·(1/n_g - h_g), y la distancia de Cook al eliminar
+        el grupo entero es n_g²·h_g·ē_g² / ((1 - n_g·h_g)²·p·s²).
+        """
+        n = self.n
+        p = 2
+        x_media, _ = self._medias()
+        s_xx = self._s_xx(x_media)
+        residuos_medios = self.medias_y - (m * self.x + b)
+        s2 = self.ss_res(m, b) / (n - p) if n > p else np.nan
+        with np.errstate(divide='ignore', invalid='ignore'):
+            apalancamiento = 1.0 / n + (self.x - x_media) ** 2 / s_xx
+            studentizados = residuos_medios / np.sqrt(s2 * (1.0 / self.conteo - apalancamiento))
+            cook = (self.conteo ** 2 * apalancamiento * residuos_medios ** 2
+                    / ((1 - self.conteo * apalancamiento) ** 2 * p * s2))
+        influyentes = np.nan_to_num(cook, nan=0.0, posinf=np.inf) > 4.0 / len(self.x)
+        return DiagnosticosGrupos(apalancamiento, residuos_medios, studentizados, cook, influyentes)
+
+    def dibujar(self, ax, color='blue', tamano_maximo=400, **kwargs):
+        """Dibuja la media de y de cada grupo con un marcador de área proporcional a su número de filas"""
+        tamanos = 20 + tamano_maximo * self.conteo / self.conteo.max()
+        return ax.scatter(self.x, self.medias_y, s=tamanos, color=color, alpha=0.6, **kwargs)
+
+    def guardar(self, nombre_archivo):
+        np.savez_compressed(nombre_archivo, x=self.x, conteo=self.conteo, suma_y=self.suma_y,
+                            suma_y2=self.suma_y2, minimo_y=self.minimo_y, maximo_y=self.maximo_y)
+
+    @classmethod
+    def cargar(cls, nombre_archivo):
+        with np.load(nombre_archivo) as datos:
+            return cls(datos['x'], datos['conteo'], datos['suma_y'], datos['suma_y2'],
+                       datos['minimo_y'], datos['maximo_y'])
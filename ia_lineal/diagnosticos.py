@@ -0,0 +1,69 @@
+from collections import namedtuple
+import numpy as np
+
+Diagnosticos = namedtuple('Diagnosticos', [
+    'apalancamiento',        # h_i, valores de la diagonal de la matriz sombrero
+    'residuos',              # e_i = y_i - ŷ_i
+    'residuos_loo',          # residuo si el punto se excluye del ajuste: e_i / (1 - h_i)
+    'studentizados',         # residuos studentizados internos r_i
+    'studentizados_ext',     # residuos studentizados externos t_i
+    'dffits',
+    'cook',                  # distancia de Cook
+    'influyentes',           # máscara booleana de puntos influyentes
+])
+
+def calcular_diagnosticos(x, y, m, b, umbral_cook=None):
+    """Calcula los diagnósticos de influencia de una recta y = m·x + b en O(n).
+
+    Todo sale de fórmulas cerradas sobre los estadísticos suficientes
+    (n, x̄, Sxx, SS_res), sin reajustar el modelo una vez por punto.
+    Por defecto un punto es influyente si su distancia de Cook supera 4/n.
+    """
+    x = np.asarray(x, dtype=float).ravel()
+    y = np.asarray(y, dtype=float).ravel()
+    n = len(x)
+    p = 2  # parámetros: pendiente e intercepto
+
+    dx = x - np.mean(x)
+    s_xx = np.dot(dx, dx)
+    residuos = y - (m * x + b)
+    ss_res = np.dot(residuos, residuos)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        if s_xx > 0:
+            apalancamiento = 1.0 / n + dx * dx / s_xx
+        else:
+            apalancamiento = np.full(n, 1.0 / n)
+        uno_menos_h = 1.0 - apalancamiento
+
+        residuos_loo = residuos / uno_menos_h
+
+        s2 = ss_res / (n - p) if n > p else np.nan
+        studentizados = residuos / np.sqrt(s2 * uno_menos_h)
+
+        # Varianza sin el punto i: (SS_res - e_i² / (1 - h_i)) / (n - p - 1)
+        if n > p + 1:
+            s2_sin_i = np.maximum(ss_res - residuos * residuos_loo, 0.0) / (n - p - 1)
+        else:
+            s2_sin_i = np.full(n, np.nan)
+        studentizados_ext = residuos / np.sqrt(s2_sin_i * uno_menos_h)
+
+        dffits = studentizados_ext * np.sqrt(apalancamiento / uno_menos_h)
+        cook = studentizados ** 2 * apalancamiento / (p * uno_menos_h)
+
+    if umbral_cook is None:
+        umbral_cook = 4.0 / n
+    influyentes = np.nan_to_num(cook, nan=0.0) > umbral_cook
+
+    return Diagnosticos(apalancamiento, residuos, residuos_loo, studentizados,
+                        studentizados_ext, dffits, cook, influyentes)
+
+def resaltar_influyentes(ax, x, y, diagnosticos, color='orange'):
+    """Rodea con un círculo los puntos influyentes en un eje de matplotlib"""
+    x = np.asarray(x, dtype=float).ravel()
+    y = np.asarray(y, dtype=float).ravel()
+    mascara = diagnosticos.influyentes
+    if not mascara.any():
+        return None
+    return ax.scatter(x[mascara], y[mascara], s=300, facecolors='none', edgecolors=color,
+                      linewidths=2, zorder=5, label=f'Influyentes (Cook > 4/n): {mascara.sum()}')
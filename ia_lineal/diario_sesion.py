@@ -0,0 +1,225 @@
+import os
+import queue
+import threading
+import time
+import numpy as np
+
+# Registro binario de tamaño fijo (21 bytes): operación, índice, x, y
+REGISTRO = np.dtype([('op', 'u1'), ('indice', '<u4'), ('x', '<f8'), ('y', '<f8')])
+AGREGAR, MOVER, VACIAR = 1, 2, 3
+CABECERA = np.dtype('<u8')  # generación de la instantánea a la que sigue el diario
+
+class DiarioSesion:
+    """Autoguardado de los puntos de una sesión interactiva.
+
+    La interfaz solo encola operaciones (añadir, mover, vaciar), que cuesta
+    O(1) y nunca toca el disco. Un hilo de fondo las escribe en un diario
+    binario de solo añadir, hace fsync como mucho cada `intervalo_fsync`
+    segundos y cada `instantanea_cada` operaciones guarda una instantánea
+    compacta de los puntos y empieza un diario nuevo, de modo que restaurar
+    nunca tiene que rehacer más de esas operaciones.
+
+    En el directorio hay dos archivos: instantanea.npz (puntos y generación)
+    y diario.bin (cabecera con la generación y registros). Si la generación
+    del diario no coincide con la de la instantánea, el diario ya está
+    incluido en ella y se ignora.
+    """
+    def __init__(self, directorio='sesion_interactiva', intervalo_fsync=1.0, instantanea_cada=10000):
+        self.directorio = directorio
+        self.intervalo_fsync = intervalo_fsync
+        self.instantanea_cada = instantanea_cada
+        self.ruta_instantanea = os.path.join(directorio, 'instantanea.npz')
+        self.ruta_diario = os.path.join(directorio, 'diario.bin')
+
+        self.cola = queue.SimpleQueue()
+        self.hilo = None
+        self.archivo = None
+        self.generacion = 0
+        self.puntos = np.empty((0, 2))  # copia propia del hilo de fondo
+        self.n = 0
+        self.operaciones_desde_instantanea = 0
+
+    # --- Restauración ---
+
+    def cargar(self):
+        """Devuelve los puntos guardados (array (n, 2)), vacío si no hay sesión"""
+        puntos = np.empty((0, 2))
+        generacion = 0
+        if os.path.exists(self.ruta_instantanea):
+            with np.load(self.ruta_instantanea) as datos:
+                puntos = datos['puntos']
+                generacion = int(datos['generacion'])
+        self.generacion = generacion
+        self._reservar(max(len(puntos), 16))
+        self.puntos[:len(puntos)] = puntos
+        self.n = len(puntos)
+
+        if os.path.exists(self.ruta_diario):
+            contenido = np.fromfile(self.ruta_diario, dtype=np.uint8)
+            if len(contenido) >= CABECERA.itemsize and \
+                    contenido[:CABECERA.itemsize].view(CABECERA)[0] == generacion:
+                cuerpo = contenido[CABECERA.itemsize:]
+                # Un registro a medio escribir al final (cierre brusco) se descarta
+                completos = len(cuerpo) // REGISTRO.itemsize * REGISTRO.itemsize
+                self._aplicar(cuerpo[:completos].view(REGISTRO))
+        return self.puntos[:self.n].copy()
+
+    # --- API para el hilo de la interfaz (no bloquea) ---
+
+    def iniciar(self, puntos):
+        """Arranca el hilo de escritura; si `puntos` no coincide con lo cargado, se guarda ese estado
+
+        El hilo empieza compactando lo cargado en una instantánea nueva.
+        """
+        puntos = np.asarray(puntos, dtype=float).reshape(-1, 2)
+        os.makedirs(self.directorio, exist_ok=True)
+        if not np.array_equal(puntos, self.puntos[:self.n]):
+            self.reemplazar(puntos)
+        self.hilo = threading.Thread(target=self._escribir, name="DiarioSesion", daemon=True)
+        self.hilo.start()
+
+    def agregar(self, x, y):
+        self.cola.put((AGREGAR, 0, x, y))
+
+    def mover(self, indice, x, y):
+        self.cola.put((MOVER, indice, x, y))
+
+    def reemplazar(self, puntos):
+        """Sustituye todos los puntos (reiniciar, datos aleatorios...) con una sola operación encolada"""
+        self.cola.put(np.array(puntos, dtype=float).reshape(-1, 2))
+
+    def cerrar(self):
+        """Escribe lo pendiente, hace fsync y detiene el hilo"""
+        if self.hilo is not None:
+            self.cola.put(None)
+            self.hilo.join()
+            self.hilo = None
+
+    # --- Hilo de fondo ---
+
+    def _escribir(self):
+        self._guardar_instantanea()
+        ultimo_fsync = time.monotonic()
+        sin_fsync = False
+        terminar = False
+        while not terminar:
+            try:
+                operaciones = [self.cola.get(timeout=self.intervalo_fsync)]
+            except queue.Empty:
+                operaciones = []
+            # Recoger todo lo que haya en la cola en un solo lote
+            while True:
+                try:
+                    operaciones.append(self.cola.get_nowait())
+                except queue.Empty:
+                    break
+            for i, operacion in enumerate(operaciones):
+                if operacion is None:
+                    operaciones = operaciones[:i]
+                    terminar = True
+                    break
+
+            if operaciones:
+                registros = self._registros(operaciones)
+                self.archivo.write(registros.tobytes())
+                self._aplicar(registros)
+                self.operaciones_desde_instantanea += len(registros)
+                sin_fsync = True
+
+            ahora = time.monotonic()
+            if sin_fsync and (terminar or ahora - ultimo_fsync >= self.intervalo_fsync):
+                self.archivo.flush()
+                os.fsync(self.archivo.fileno())
+                ultimo_fsync = ahora
+                sin_fsync = False
+            if self.operaciones_desde_instantanea >= self.instantanea_cada:
+                self._guardar_instantanea()
+        self.archivo.close()
+
+    @staticmethod
+    def _registros(operaciones):
+        """Convierte un lote de operaciones en registros binarios.
+
+        Los movimientos consecutivos del mismo punto (un arrastre) se unen en
+        el último, y un reemplazo se escribe como VACIAR seguido de un
+        AGREGAR por punto.
+        """
+        bloques = []
+        sueltas = []
+        for operacion in operaciones:
+            if isinstance(operacion, np.ndarray):
+                if sueltas:
+                    bloques.append(np.array(sueltas, dtype=REGISTRO))
+                    sueltas = []
+                bloque = np.zeros(len(operacion) + 1, dtype=REGISTRO)
+                bloque['op'] = AGREGAR
+                bloque['op'][0] = VACIAR
+                bloque['x'][1:] = operacion[:, 0]
+                bloque['y'][1:] = operacion[:, 1]
+                bloques.append(bloque)
+            elif (operacion[0] == MOVER and sueltas and sueltas[-1][0] == MOVER
+                    and sueltas[-1][1] == operacion[1]):
+                sueltas[-1] = operacion
+            else:
+                sueltas.append(operacion)
+        if sueltas:
+            bloques.append(np.array(sueltas, dtype=REGISTRO))
+        return np.concatenate(bloques)
+
+    def _reservar(self, capacidad):
+        if capacidad > len(self.puntos):
+            nuevos = np.empty((max(capacidad, 2 * len(self.puntos)), 2))
+            nuevos[:self.n] = self.puntos[:self.n]
+            self.puntos = nuevos
+
+    def _aplicar(self, registros):
+        """Aplica los registros a la copia de los puntos del hilo de fondo (vectorizado)"""
+        if len(registros) == 0:
+            return
+        op = registros['op']
+        # Lo anterior al último VACIAR ya no cuenta
+        vaciados = np.flatnonzero(op == VACIAR)
+        if len(vaciados):
+            self.n = 0
+            registros = registros[vaciados[-1] + 1:]
+            op = registros['op']
+            if len(registros) == 0:
+                return
+
+        # Cada AGREGAR escribe en la siguiente posición libre; un MOVER solo vale si el punto ya existe
+        agregar = op == AGREGAR
+        n_tras = self.n + np.cumsum(agregar)
+        destino = np.where(agregar, n_tras - 1, registros['indice'])
+        validos = agregar | ((op == MOVER) & (destino < n_tras))
+        destino = destino[validos]
+        valores = np.column_stack([registros['x'][validos], registros['y'][validos]])
+
+        self._reservar(int(n_tras[-1]))
+        # Si una posición se escribe varias veces, queda la última escritura
+        _, primeros_desde_el_final = np.unique(destino[::-1], return_index=True)
+        ultimos = len(destino) - 1 - primeros_desde_el_final
+        self.puntos[destino[ultimos]] = valores[ultimos]
+        self.n = int(n_tras[-1])
+
+    def _abrir_diario(self):
+        """Crea un diario vacío de la generación actual y lo deja abierto para añadir"""
+        temporal = self.ruta_diario + '.tmp'
+        with open(temporal, 'wb') as f:
+            f.write(np.array([self.generacion], dtype=CABECERA).tobytes())
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temporal, self.ruta_diario)
+        self.archivo = open(self.ruta_diario, 'ab')
+
+    def _guardar_instantanea(self):
+        """Guarda los puntos actuales y empieza un diario vacío de la nueva generación"""
+        if self.archivo is not None:
+            self.archivo.flush()
+            os.fsync(self.archivo.fileno())
+            self.archivo.close()
+        self.generacion += 1
+        temporal = self.ruta_instantanea + '.tmp.npz'
+        np.savez(temporal, puntos=self.puntos[:self.n], generacion=self.generacion)
+        os.replace(temporal, self.ruta_instantanea)
+        self._abrir_diario()
+        self.operaciones_desde_instantanea = 0
@@ -0,0 +1,91 @@
+import queue
+import threading
+import traceback
+
+class EjecutorFondo:
+    """Ejecuta cálculos pesados en un hilo de fondo y entrega los resultados al hilo de Tk.
+
+    Cada trabajo se envía por un canal (por ejemplo "ajuste"). Un envío nuevo en
+    un canal deja obsoletos los anteriores de ese canal: si aún no han empezado
+    se descartan, y si ya estaban en marcha su resultado se ignora. Los
+    resultados vuelven por una cola que se revisa con root.after, de modo que
+    los callbacks siempre se ejecutan en el hilo de la interfaz.
+    """
+    def __init__(self, root, intervalo_ms=20, al_cambiar_ocupado=None):
+        self.root = root
+        self.intervalo_ms = intervalo_ms
+        self.al_cambiar_ocupado = al_cambiar_ocupado
+
+        self.tareas = queue.Queue()
+        self.resultados = queue.Queue()
+        self.ultimas = {}  # canal -> identificador del último envío
+        self.pendientes = 0
+        self.contador = 0
+        self.sondeo_activo = False
+
+        self.hilo = threading.Thread(target=self._trabajar, name="EjecutorFondo", daemon=True)
+        self.hilo.start()
+
+    def enviar(self, canal, funcion, *args, al_terminar=None, al_fallar=None):
+        """Programa funcion(*args) en segundo plano; al_terminar recibe su resultado"""
+        self.contador += 1
+        identificador = self.contador
+        self.ultimas[canal] = identificador
+        self.pendientes += 1
+        if self.pendientes == 1 and self.al_cambiar_ocupado is not None:
+            self.al_cambiar_ocupado(True)
+
+        self.tareas.put((canal, identificador, funcion, args, al_terminar, al_fallar))
+        if not self.sondeo_activo:
+            self.sondeo_activo = True
+            self.root.after(self.intervalo_ms, self._sondear)
+        return identificador
+
+    def vigente(self, canal, identificador):
+        """Indica si el envío sigue siendo el más reciente de su canal"""
+        return self.ultimas.get(canal) == identificador
+
+    def _trabajar(self):
+        """Bucle del hilo de fondo"""
+        while True:
+            tarea = self.tareas.get()
+            if tarea is None:
+                break
+            canal, identificador, funcion, args, al_terminar, al_fallar = tarea
+            if not self.vigente(canal, identificador):
+                # Sustituida por un envío más reciente antes de empezar
+                self.resultados.put((canal, identificador, None, None, None, None))
+                continue
+            try:
+                resultado = funcion(*args)
+                self.resultados.put((canal, identificador, resultado, None, al_terminar, al_fallar))
+            except Exception as e:
+                traceback.print_exc()
+                self.resultados.put((canal, identificador, None, e, al_terminar, al_fallar))
+
+    def _sondear(self):
+        """Entrega en el hilo de Tk los resultados disponibles"""
+        while True:
+            try:
+                canal, identificador, resultado, error, al_terminar, al_fallar = self.resultados.get_nowait()
+            except queue.Empty:
+                break
+            self.pendientes -= 1
+            if not self.vigente(canal, identificador):
+                continue
+            if error is not None:
+                if al_fallar is not None:
+                    al_fallar(error)
+            elif al_terminar is not None:
+                al_terminar(resultado)
+
+        if self.pendientes > 0:
+            self.root.after(self.intervalo_ms, self._sondear)
+        else:
+            self.sondeo_activo = False
+            if self.al_cambiar_ocupado is not None:
+                self.al_cambiar_ocupado(False)
+
+    def cerrar(self):
+        """Detiene el hilo de fondo cuando termine el trabajo en curso"""
+        self.tareas.put(None)
@@ -2,7 +2,11 @@ import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
 from sklearn.linear_model import LinearRegression
-from sklearn.metrics import r2_score
+from reporte_ajuste import ReporteAjuste
+from diagnosticos import resaltar_influyentes
+from estadisticas import EstadisticasColumnas
+from regresion_polinomica import RegresionPolinomica
+import metricas
 
 def crear_datos_sueno_energia():
     """Crea datos de ejemplo para horas de sueño vs energía diaria"""
@@ -31,40 +35,74 @@ def generar_datos_sueno_aleatorios(n_muestras=30):
     }
     return pd.DataFrame(datos)
 
+@metricas.medido('entrenamiento_sueno')
 def entrenar_modelo_sueno(X, y):
     """Entrena el modelo de regresión lineal para sueño vs energía"""
     modelo = LinearRegression()
     modelo.fit(X, y)
     return modelo
 
-def mostrar_resultados_sueno(modelo, X, y):
+@metricas.medido('entrenamiento_sueno_polinomico')
+def entrenar_modelo_sueno_polinomico(X, y, grado_max=5):
+    """Ajusta un polinomio (base ortogonal) eligiendo el grado por validación cruzada"""
+    return RegresionPolinomica(grado_max, criterio='cv').fit(X, y)
+
+def mostrar_resultados_polinomio(polinomico, reporte):
+    """Compara el polinomio elegido con la recta"""
+    print(f"Polinomio de grado {polinomico.grado_} (elegido por validación cruzada entre 0 y {polinomico.grado_alcanzado_})")
+    print(f"R² polinomio: {polinomico.r2_[polinomico.grado_]:.4f} · R² recta: {reporte.r2:.4f}")
+    for grado, (r2, cv) in enumerate(zip(polinomico.r2_, polinomico.criterios_)):
+        marca = " ←" if grado == polinomico.grado_ else ""
+        print(f"   grado {grado}: R² = {r2:.4f}, ECM validación = {cv:.4f}{marca}")
+    print("=" * 60)
+
+def mostrar_resultados_sueno(reporte):
     """Muestra los resultados del modelo de sueño vs energía"""
-    m = modelo.coef_[0]
-    b = modelo.intercept_
-    
-    y_pred = modelo.predict(X)
-    r2 = r2_score(y, y_pred)
+    m = reporte.m
+    b = reporte.b
+    r2 = reporte.r2
     
     print("=" * 60)
     print("RESULTADOS: HORAS DE SUEÑO vs ENERGÍA DIARIA")
     print("=" * 60)
     print(f"Ecuación: Energía = {m:.3f} × Horas_Sueño + {b:.3f}")
     print(f"Coeficiente R²: {r2:.4f}")
+    
+    diagnosticos = reporte.diagnosticos
+    for i in np.flatnonzero(diagnosticos.influyentes):
+        print(f"🎯 Punto influyente #{i}: Cook = {diagnosticos.cook[i]:.3f}, "
+              f"apalancamiento = {diagnosticos.apalancamiento[i]:.3f}")
     print("=" * 60)
     
     return m, b, r2
 
-def graficar_sueno_energia(X, y, modelo, m, b):
-    """Crea gráfica para sueño vs energía"""
+def marcar_cuartiles(ejes, boceto):
+    """Líneas verticales en Q1, mediana y Q3 a partir del boceto de cuantiles"""
+    q1, mediana, q3 = boceto.cuantiles([0.25, 0.5, 0.75])
+    ejes.axvline(mediana, color='black', linewidth=2, label=f'Mediana = {mediana:.2f}')
+    for valor in (q1, q3):
+        ejes.axvline(valor, color='black', linestyle=':', linewidth=1.5)
+    ejes.legend(fontsize=8)
+
+@metricas.medido('grafica_sueno')
+def dibujar_sueno_energia(reporte, polinomico=None):
+    """Crea gráfica para sueño vs energía (con la curva polinómica si se da)"""
+    X, y = reporte.X, reporte.y
+    m, b = reporte.m, reporte.b
+    estadisticas = EstadisticasColumnas.desde_arrays(['X', 'y'], np.column_stack([np.ravel(X), y]))
+    boceto_x, boceto_y = estadisticas.bocetos
     plt.figure(figsize=(12, 8))
     
     # Gráfica principal
     plt.subplot(2, 2, 1)
     plt.scatter(X, y, color='purple', s=100, alpha=0.7, label='Datos originales')
+    resaltar_influyentes(plt.gca(), X, y, reporte.diagnosticos)
     
-    X_line = np.linspace(X.min() - 0.5, X.max() + 0.5, 100)
-    y_line = m * X_line + b
+    X_line, y_line = reporte.linea
     plt.plot(X_line, y_line, color='orange', linewidth=2, label=f'Energía = {m:.3f}×Sueño + {b:.3f}')
+    if polinomico is not None:
+        plt.plot(X_line, polinomico.predict(X_line), color='green', linewidth=2, linestyle='--',
+                 label=f'Polinomio de grado {polinomico.grado_}')
     
     plt.xlabel('Horas de Sueño', fontsize=12)
     plt.ylabel('Energía Diaria (0-10)', fontsize=12)
@@ -77,6 +115,7 @@ def graficar_sueno_energia(X, y, modelo, m, b):
     # Gráfica de distribución de horas de sueño
     plt.subplot(2, 2, 2)
     plt.hist(X, bins=10, color='lightblue', alpha=0.7, edgecolor='black')
+    marcar_cuartiles(plt.gca(), boceto_x)
     plt.xlabel('Horas de Sueño')
     plt.ylabel('Frecuencia')
     plt.title('Distribución de Horas de Sueño')
@@ -85,6 +124,7 @@ def graficar_sueno_energia(X, y, modelo, m, b):
     # Gráfica de distribución de energía
     plt.subplot(2, 2, 3)
     plt.hist(y, bins=10, color='lightgreen', alpha=0.7, edgecolor='black')
+    marcar_cuartiles(plt.gca(), boceto_y)
     plt.xlabel('Energía Diaria')
     plt.ylabel('Frecuencia')
     plt.title('Distribución de Energía Diaria')
@@ -92,9 +132,9 @@ def graficar_sueno_energia(X, y, modelo, m, b):
     
     # Gráfica de residuos
     plt.subplot(2, 2, 4)
-    y_pred = modelo.predict(X)
-    residuos = y - y_pred
-    plt.scatter(y_pred, residuos, color='red', alpha=0.7)
+    plt.scatter(reporte.y_pred, reporte.residuos, color='red', alpha=0.7)
+    if resaltar_influyentes(plt.gca(), reporte.y_pred, reporte.residuos, reporte.diagnosticos):
+        plt.legend()
     plt.axhline(y=0, color='black', linestyle='--', alpha=0.5)
     plt.xlabel('Energía Predicha')
     plt.ylabel('Residuos')
@@ -102,6 +142,10 @@ def graficar_sueno_energia(X, y, modelo, m, b):
     plt.grid(True, alpha=0.3)
     
     plt.tight_layout()
+
+def graficar_sueno_energia(reporte, polinomico=None):
+    """Dibuja y muestra la gráfica de sueño vs energía"""
+    dibujar_sueno_energia(reporte, polinomico)
     plt.show()
 
 def predecir_energia(modelo):
@@ -117,11 +161,17 @@ def predecir_energia(modelo):
                 print("❌ Error: Las horas de sueño deben estar entre 0 y 24.")
                 continue
                 
-            prediccion = modelo.predict([[horas_sueno]])[0]
+            with metricas.cronometro('prediccion_sueno'):
+                prediccion = modelo.predict([[horas_sueno]])[0]
+            metricas.contar('filas_predichas')
             prediccion = np.clip(prediccion, 0, 10)
             
             print(f"\n😴 Horas de sueño: {horas_sueno}")
             print(f"⚡ Energía predicha: {prediccion:.2f}/10")
+            if isinstance(modelo, RegresionPolinomica) and modelo.fuera_de_rango([horas_sueno])[0]:
+                minimo, maximo = modelo.rango_
+                print(f"⚠️  Fuera de los datos de entrenamiento ({minimo:.0f}-{maximo:.0f} h): "
+                      "se extiende la recta desde el borde, tómalo con cautela.")
             
             # Recomendaciones
             if horas_sueno < 6:
@@ -151,19 +201,29 @@ def analizar_patrones_sueno(df):
     print("\n📊 ANÁLISIS DE PATRONES DE SUEÑO")
     print("=" * 40)
     
-    print(f"Promedio de horas de sueño: {df['Horas_Sueno'].mean():.2f}")
-    print(f"Desviación estándar: {df['Horas_Sueno'].std():.2f}")
-    print(f"Horas mínimas: {df['Horas_Sueno'].min():.1f}")
-    print(f"Horas máximas: {df['Horas_Sueno'].max():.1f}")
+    estadisticas = EstadisticasColumnas.desde_df(df, ['Horas_Sueno', 'Energia_Diaria'])
+    resumen = estadisticas.resumen()
+    cuantiles = estadisticas.cuantiles([0.1, 0.25, 0.5, 0.75, 0.9])
+    sueno = resumen['Horas_Sueno']
+    energia = resumen['Energia_Diaria']
     
-    print(f"\nPromedio de energía: {df['Energia_Diaria'].mean():.2f}")
-    print(f"Energía máxima registrada: {df['Energia_Diaria'].max():.1f}")
-    print(f"Energía mínima registrada: {df['Energia_Diaria'].min():.1f}")
+    print(f"Promedio de horas de sueño: {sueno.media:.2f}")
+    print(f"Desviación estándar: {sueno.std:.2f}")
+    print(f"Horas mínimas: {sueno.minimo:.1f}")
+    print(f"Horas máximas: {sueno.maximo:.1f}")
+    p10, q1, mediana, q3, p90 = cuantiles['Horas_Sueno']
+    print(f"Mediana de horas: {mediana:.2f} (cuartiles {q1:.2f} – {q3:.2f}, P10–P90 {p10:.2f} – {p90:.2f})")
+    
+    print(f"\nPromedio de energía: {energia.media:.2f}")
+    print(f"Energía máxima registrada: {energia.maximo:.1f}")
+    print(f"Energía mínima registrada: {energia.minimo:.1f}")
+    p10, q1, mediana, q3, p90 = cuantiles['Energia_Diaria']
+    print(f"Mediana de energía: {mediana:.2f} (cuartiles {q1:.2f} – {q3:.2f}, P10–P90 {p10:.2f} – {p90:.2f})")
     
     # Encontrar mejor combinación
-    mejor_idx = df['Energia_Diaria'].idxmax()
-    mejor_sueno = df.loc[mejor_idx, 'Horas_Sueno']
-    mejor_energia = df.loc[mejor_idx, 'Energia_Diaria']
+    mejor_idx = energia.idx_max
+    mejor_sueno = df['Horas_Sueno'].iloc[mejor_idx]
+    mejor_energia = energia.maximo
     
     print(f"\n🏆 Mejor combinación:")
     print(f"   {mejor_sueno:.1f} horas de sueño → {mejor_energia:.1f} de energía")
@@ -189,14 +249,22 @@ def main():
     modelo = entrenar_modelo_sueno(X, y)
     
     # Mostrar resultados
-    m, b, r2 = mostrar_resultados_sueno(modelo, X, y)
+    reporte = ReporteAjuste(modelo, X, y)
+    mostrar_resultados_sueno(reporte)
+    
+    # La relación es curva: probar polinomios de grado creciente
+    polinomico = entrenar_modelo_sueno_polinomico(X, y)
+    mostrar_resultados_polinomio(polinomico, reporte)
+    if polinomico.grado_ > 1:
+        print(f"📐 Las predicciones usarán el polinomio de grado {polinomico.grado_}")
+        modelo = polinomico
     
     # Analizar patrones
     analizar_patrones_sueno(df)
     
     # Graficar
     print("\n📈 Generando gráficas...")
-    graficar_sueno_energia(X, y, modelo, m, b)
+    graficar_sueno_energia(reporte, polinomico)
     
     # Predicciones
     while True:
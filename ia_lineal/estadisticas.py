@@ -0,0 +1,208 @@
+from collections import namedtuple
+from multiprocessing import Pool
+import numpy as np
+import pandas as pd
+import nucleos
+from cuantiles import BocetoKLL
+
+ResumenColumna = namedtuple('ResumenColumna', ['n', 'media', 'std', 'minimo', 'maximo', 'idx_min', 'idx_max'])
+
+def calcular_resumen(datos):
+    """Calcula n, medias, co-momentos M2, mínimos, máximos y sus posiciones de un array (n, k).
+
+    Todas las columnas se reducen a la vez con los núcleos de nucleos.py, así
+    que no hay una pasada distinta por estadístico y columna.
+    """
+    datos = np.asarray(datos, dtype=float)
+    if datos.ndim == 1:
+        datos = datos.reshape(-1, 1)
+    n = datos.shape[0]
+    if n == 0:
+        k = datos.shape[1]
+        return 0, np.zeros(k), np.zeros(k), np.full(k, np.inf), np.full(k, -np.inf), np.zeros(k, int), np.zeros(k, int)
+
+    return (n,) + tuple(nucleos.resumen(datos))
+
+class EstadisticasColumnas:
+    """Resumen estadístico de varias columnas con actualización incremental.
+
+    Media y varianza se mantienen con las fórmulas de Welford, así que añadir,
+    mover o eliminar un punto cuesta O(1). Mínimo y máximo también se actualizan
+    en O(1) salvo cuando se mueve o elimina justo el punto extremo; en ese caso
+    se marcan como inválidos y se recalculan en la siguiente consulta.
+    Los cuantiles salen de un boceto KLL por columna (memoria acotada); como
+    el boceto no admite borrar, mover o eliminar un punto lo invalida y se
+    reconstruye solo si se piden cuantiles.
+    """
+    def __init__(self, columnas):
+        self.columnas = list(columnas)
+        k = len(self.columnas)
+        self.n = 0
+        self.media = np.zeros(k)
+        self.m2 = np.zeros(k)
+        self.minimo = np.full(k, np.inf)
+        self.maximo = np.full(k, -np.inf)
+        self.idx_min = np.zeros(k, dtype=int)
+        self.idx_max = np.zeros(k, dtype=int)
+        self.extremos_invalidos = np.zeros(k, dtype=bool)
+        self.bocetos = [BocetoKLL() for _ in range(k)]
+        self.bocetos_invalidos = False
+
+    @classmethod
+    def desde_arrays(cls, columnas, datos):
+        """Crea el resumen a partir de un array (n, k) con una columna por nombre"""
+        estadisticas = cls(columnas)
+        (estadisticas.n, estadisticas.media, estadisticas.m2, estadisticas.minimo,
+         estadisticas.maximo, estadisticas.idx_min, estadisticas.idx_max) = calcular_resumen(datos)
+        estadisticas._rellenar_bocetos(datos)
+        return estadisticas
+
+    @classmethod
+    def desde_df(cls, df, columnas):
+        """Crea el resumen a partir de las columnas indicadas de un DataFrame"""
+        return cls.desde_arrays(columnas, df[list(columnas)].to_numpy(dtype=float))
+
+    def combinar(self, otro):
+        """Devuelve el resumen de los datos de self seguidos de los de otro"""
+        combinado = EstadisticasColumnas(self.columnas)
+        n = self.n + otro.n
+        if n == 0:
+            return combinado
+        delta = otro.media - self.media
+        combinado.n = n
+        combinado.media = self.media + delta * otro.n / n
+        combinado.m2 = self.m2 + otro.m2 + delta * delta * self.n * otro.n / n
+
+        # Los índices del segundo bloque van desplazados por el tamaño del primero
+        usar_otro = otro.minimo < self.minimo
+        combinado.minimo = np.where(usar_otro, otro.minimo, self.minimo)
+        combinado.idx_min = np.where(usar_otro, otro.idx_min + self.n, self.idx_min)
+        usar_otro = otro.maximo > self.maximo
+        combinado.maximo = np.where(usar_otro, otro.maximo, self.maximo)
+        combinado.idx_max = np.where(usar_otro, otro.idx_max + self.n, self.idx_max)
+        combinado.extremos_invalidos = self.extremos_invalidos | otro.extremos_invalidos
+        combinado.bocetos = [a.combinar(b) for a, b in zip(self.bocetos, otro.bocetos)]
+        combinado.bocetos_invalidos = self.bocetos_invalidos or otro.bocetos_invalidos
+        return combinado
+
+    def agregar(self, fila):
+        """Añade un punto al final de los datos"""
+        fila = np.asarray(fila, dtype=float)
+        self.n += 1
+        delta = fila - self.media
+        self.media = self.media + delta / self.n
+        self.m2 = self.m2 + delta * (fila - self.media)
+
+        indice = self.n - 1
+        nuevo_min = fila < self.minimo
+        self.minimo = np.where(nuevo_min, fila, self.minimo)
+        self.idx_min = np.where(nuevo_min, indice, self.idx_min)
+        nuevo_max = fila > self.maximo
+        self.maximo = np.where(nuevo_max, fila, self.maximo)
+        self.idx_max = np.where(nuevo_max, indice, self.idx_max)
+        for boceto, valor in zip(self.bocetos, fila):
+            boceto.agregar(valor)
+
+    def actualizar(self, indice, fila_vieja, fila_nueva):
+        """Sustituye el punto en la posición indice por un nuevo valor"""
+        fila_vieja = np.asarray(fila_vieja, dtype=float)
+        fila_nueva = np.asarray(fila_nueva, dtype=float)
+        media_vieja = self.media
+        self.media = media_vieja + (fila_nueva - fila_vieja) / self.n
+        self.m2 = np.maximum(self.m2 + (fila_nueva - fila_vieja) * (fila_nueva - self.media + fila_vieja - media_vieja), 0.0)
+
+        nuevo_min = fila_nueva <= self.minimo
+        self.extremos_invalidos |= (self.idx_min == indice) & ~nuevo_min
+        self.minimo = np.where(nuevo_min, fila_nueva, self.minimo)
+        self.idx_min = np.where(nuevo_min, indice, self.idx_min)
+
+        nuevo_max = fila_nueva >= self.maximo
+        self.extremos_invalidos |= (self.idx_max == indice) & ~nuevo_max
+        self.maximo = np.where(nuevo_max, fila_nueva, self.maximo)
+        self.idx_max = np.where(nuevo_max, indice, self.idx_max)
+        self.bocetos_invalidos = True
+
+    def eliminar(self, indice, fila):
+        """Elimina el punto en la posición indice (los posteriores se desplazan una posición)"""
+        fila = np.asarray(fila, dtype=float)
+        if self.n <= 1:
+            self.__init__(self.columnas)
+            return
+        media_vieja = self.media
+        self.media = (self.n * media_vieja - fila) / (self.n - 1)
+        self.m2 = np.maximum(self.m2 - (fila - self.media) * (fila - media_vieja), 0.0)
+        self.n -= 1
+
+        self.extremos_invalidos |= (self.idx_min == indice) | (self.idx_max == indice)
+        self.idx_min = np.where(self.idx_min > indice, self.idx_min - 1, self.idx_min)
+        self.idx_max = np.where(self.idx_max > indice, self.idx_max - 1, self.idx_max)
+        self.bocetos_invalidos = True
+
+    def _rellenar_bocetos(self, datos):
+        datos = np.asarray(datos, dtype=float).reshape(-1, len(self.columnas))
+        self.bocetos = [BocetoKLL().agregar(datos[:, j]) for j in range(len(self.columnas))]
+        self.bocetos_invalidos = False
+
+    def revalidar(self, datos):
+        """Recalcula mínimo y máximo de las columnas marcadas como inválidas"""
+        datos = np.asarray(datos, dtype=float)
+        for j in np.flatnonzero(self.extremos_invalidos):
+            self.idx_min[j] = np.argmin(datos[:, j])
+            self.idx_max[j] = np.argmax(datos[:, j])
+            self.minimo[j] = datos[self.idx_min[j], j]
+            self.maximo[j] = datos[self.idx_max[j], j]
+        self.extremos_invalidos[:] = False
+
+    def resumen(self, obtener_datos=None):
+        """Devuelve un ResumenColumna por columna.
+
+        `obtener_datos` es una función que devuelve el array (n, k) actual; solo
+        se llama si algún mínimo o máximo tiene que recalcularse.
+        """
+        if self.extremos_invalidos.any():
+            if obtener_datos is None:
+                raise ValueError("Hace falta obtener_datos para recalcular mínimos y máximos")
+            self.revalidar(obtener_datos())
+
+        if self.n > 1:
+            std = np.sqrt(self.m2 / (self.n - 1))
+        else:
+            std = np.full(len(self.columnas), np.nan)
+
+        return {
+            columna: ResumenColumna(self.n, self.media[j], std[j], self.minimo[j], self.maximo[j],
+                                    int(self.idx_min[j]), int(self.idx_max[j]))
+            for j, columna in enumerate(self.columnas)
+        }
+
+    def cuantiles(self, qs=(0.25, 0.5, 0.75), obtener_datos=None):
+        """Cuantiles aproximados de cada columna: {columna: array con un valor por q}.
+
+        `obtener_datos` solo se llama si el boceto tiene que reconstruirse
+        (después de mover o eliminar puntos).
+        """
+        if self.bocetos_invalidos:
+            if obtener_datos is None:
+                raise ValueError("Hace falta obtener_datos para reconstruir los cuantiles")
+            self._rellenar_bocetos(obtener_datos())
+        return {columna: boceto.cuantiles(qs) for columna, boceto in zip(self.columnas, self.bocetos)}
+
+def resumir_por_bloques(nombre_archivo, columnas, tamano_bloque=100_000):
+    """Resume un CSV grande leyéndolo por bloques y combinando los resúmenes parciales"""
+    estadisticas = EstadisticasColumnas(columnas)
+    for bloque in pd.read_csv(nombre_archivo, usecols=list(columnas), chunksize=tamano_bloque):
+        estadisticas = estadisticas.combinar(EstadisticasColumnas.desde_df(bloque, columnas))
+    return estadisticas
+
+def _resumir_tarea(tarea):
+    return resumir_por_bloques(*tarea)
+
+def resumir_en_paralelo(archivos, columnas, procesos=None, tamano_bloque=100_000):
+    """Resume cada archivo en un proceso distinto y combina los resúmenes (con sus cuantiles)"""
+    tareas = [(archivo, columnas, tamano_bloque) for archivo in archivos]
+    with Pool(processes=procesos) as pool:
+        parciales = pool.map(_resumir_tarea, tareas)
+    estadisticas = EstadisticasColumnas(columnas)
+    for parcial in parciales:
+        estadisticas = estadisticas.combinar(parcial)
+    return estadisticas
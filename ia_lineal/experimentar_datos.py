@@ -1,11 +1,13 @@
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
-from sklearn.linear_model import LinearRegression
-from sklearn.metrics import r2_score
-from main import entrenar_modelo, mostrar_resultados, graficar_resultados
+from main import entrenar_modelo
+import memoria
+from reporte_ajuste import ReporteAjuste
+from experimentos_grid import GridExperimentos, generar_celdas
+from curva_aprendizaje import CurvaAprendizaje, generar_muestras, curva_aprendizaje, valores_en
 
-def experimentar_con_datos_aleatorios():
+def experimentar_con_datos_aleatorios(replicas=50):
     """Script para experimentar con diferentes tamaños de muestra"""
     print("🔬 EXPERIMENTO CON DATOS ALEATORIOS")
     print("=" * 50)
@@ -13,102 +15,117 @@ def experimentar_con_datos_aleatorios():
     # Diferentes tamaños de muestra para experimentar
     tamanos_muestra = [5, 10, 20, 50, 100]
     
-    resultados = []
-    
-    for n in tamanos_muestra:
-        print(f"\n📊 Generando {n} muestras aleatorias...")
-        
-        # Generar datos aleatorios
-        np.random.seed(42)  # Para reproducibilidad
-        horas = np.random.uniform(0.5, 8.0, n)
-        notas = 0.8 * horas + 1.5 + np.random.normal(0, 0.5, n)
-        notas = np.clip(notas, 0, 10)
-        
-        # Crear DataFrame
-        df = pd.DataFrame({'Horas': horas, 'Nota': notas})
-        
-        # Separar variables
-        X = df['Horas'].values.reshape(-1, 1)
-        y = df['Nota'].values
-        
-        # Entrenar modelo
-        modelo = entrenar_modelo(X, y)
-        
-        # Calcular métricas
-        m = modelo.coef_[0]
-        b = modelo.intercept_
-        y_pred = modelo.predict(X)
-        r2 = r2_score(y, y_pred)
-        
-        resultados.append({
-            'n_muestras': n,
-            'pendiente': m,
-            'intercepto': b,
-            'r2': r2
-        })
-        
-        print(f"   Pendiente: {m:.3f}")
-        print(f"   Intercepto: {b:.3f}")
+    # Se genera una sola vez la muestra más grande; cada tamaño es un prefijo de ella
+    with memoria.etapa('datos_muestras'):
+        horas, notas = generar_muestras(max(tamanos_muestra), ruido=0.5, replicas=replicas)
+    with memoria.etapa('curva_aprendizaje'):
+        curvas = curva_aprendizaje(horas, notas)
+    curva = CurvaAprendizaje(curvas.n, curvas.pendiente[0], curvas.intercepto[0], curvas.r2[0])
+    seleccion = valores_en(curva, tamanos_muestra)
+    
+    for n, pendiente, intercepto, r2 in zip(*seleccion):
+        print(f"\n📊 {n} muestras aleatorias")
+        print(f"   Pendiente: {pendiente:.3f}")
+        print(f"   Intercepto: {intercepto:.3f}")
         print(f"   R²: {r2:.4f}")
     
+    resultados = pd.DataFrame({
+        'n_muestras': seleccion.n,
+        'pendiente': seleccion.pendiente,
+        'intercepto': seleccion.intercepto,
+        'r2': seleccion.r2
+    })
+    
     # Mostrar resumen
     print("\n" + "=" * 50)
     print("RESUMEN DE RESULTADOS")
     print("=" * 50)
     
-    df_resultados = pd.DataFrame(resultados)
+    df_resultados = resultados
     print(df_resultados.to_string(index=False))
     
-    # Graficar evolución del R²
+    # Graficar evolución del R² (curva completa, y banda 10-90 % entre réplicas)
+    with memoria.etapa('grafica_curva'):
+        graficar_curva(curvas, curva, df_resultados, replicas)
+    plt.show()
+    
+    return df_resultados
+
+def graficar_curva(curvas, curva, df_resultados, replicas):
+    """Evolución del R² y de la pendiente con el tamaño de muestra"""
     plt.figure(figsize=(12, 5))
     
     plt.subplot(1, 2, 1)
-    plt.plot(df_resultados['n_muestras'], df_resultados['r2'], 'bo-', linewidth=2, markersize=8)
+    plt.fill_between(curvas.n, np.percentile(curvas.r2, 10, axis=0), np.percentile(curvas.r2, 90, axis=0),
+                     color='blue', alpha=0.15, label=f'10-90 % de {replicas} réplicas')
+    plt.plot(curva.n, curva.r2, 'b-', linewidth=1, alpha=0.6)
+    plt.plot(df_resultados['n_muestras'], df_resultados['r2'], 'bo', markersize=8)
     plt.xlabel('Tamaño de Muestra')
     plt.ylabel('Coeficiente R²')
     plt.title('Evolución del R² con el Tamaño de Muestra')
+    plt.legend()
     plt.grid(True, alpha=0.3)
     
     plt.subplot(1, 2, 2)
-    plt.plot(df_resultados['n_muestras'], df_resultados['pendiente'], 'ro-', linewidth=2, markersize=8)
+    plt.fill_between(curvas.n, np.percentile(curvas.pendiente, 10, axis=0), np.percentile(curvas.pendiente, 90, axis=0),
+                     color='red', alpha=0.15, label=f'10-90 % de {replicas} réplicas')
+    plt.plot(curva.n, curva.pendiente, 'r-', linewidth=1, alpha=0.6)
+    plt.plot(df_resultados['n_muestras'], df_resultados['pendiente'], 'ro', markersize=8)
     plt.xlabel('Tamaño de Muestra')
     plt.ylabel('Pendiente (m)')
     plt.title('Evolución de la Pendiente con el Tamaño de Muestra')
+    plt.legend()
     plt.grid(True, alpha=0.3)
     
     plt.tight_layout()
-    plt.show()
-    
-    return df_resultados
 
-def comparar_modelos():
+def generar_datos_comparacion(semilla, n=20):
+    """Genera datos aleatorios sin relación entre horas y nota"""
+    rng = np.random.RandomState(semilla)
+    return pd.DataFrame({
+        'Horas': rng.uniform(0.5, 8.0, n),
+        'Nota': rng.uniform(2.0, 8.0, n)
+    })
+
+def calcular_celda_comparacion(celda):
+    """Entrena el modelo de datos aleatorios de una celda de comparación"""
+    df = generar_datos_comparacion(celda['semilla'], celda['n'])
+    X = df['Horas'].values.reshape(-1, 1)
+    y = df['Nota'].values
+    reporte = ReporteAjuste(entrenar_modelo(X, y), X, y)
+    return {'pendiente': float(reporte.m), 'intercepto': float(reporte.b), 'r2': float(reporte.r2)}
+
+def comparar_modelos(semilla=42, directorio_cache='resultados_experimentos'):
     """Compara el modelo con datos de ejemplo vs datos aleatorios"""
     print("\n🔄 COMPARACIÓN DE MODELOS")
     print("=" * 50)
     
     # Modelo con datos de ejemplo
     from main import crear_datos_ejemplo
-    df_ejemplo = crear_datos_ejemplo()
-    X_ej = df_ejemplo['Horas'].values.reshape(-1, 1)
-    y_ej = df_ejemplo['Nota'].values
-    
-    modelo_ejemplo = entrenar_modelo(X_ej, y_ej)
-    m_ej = modelo_ejemplo.coef_[0]
-    b_ej = modelo_ejemplo.intercept_
-    r2_ej = r2_score(y_ej, modelo_ejemplo.predict(X_ej))
-    
-    # Modelo con datos aleatorios
-    df_aleatorio = pd.DataFrame({
-        'Horas': np.random.uniform(0.5, 8.0, 20),
-        'Nota': np.random.uniform(2.0, 8.0, 20)
-    })
-    X_al = df_aleatorio['Horas'].values.reshape(-1, 1)
-    y_al = df_aleatorio['Nota'].values
-    
-    modelo_aleatorio = entrenar_modelo(X_al, y_al)
-    m_al = modelo_aleatorio.coef_[0]
-    b_al = modelo_aleatorio.intercept_
-    r2_al = r2_score(y_al, modelo_aleatorio.predict(X_al))
+    with memoria.etapa('datos_comparacion'):
+        df_ejemplo = crear_datos_ejemplo()
+        X_ej = df_ejemplo['Horas'].values.reshape(-1, 1)
+        y_ej = df_ejemplo['Nota'].values
+    
+    with memoria.etapa('entrenamiento_comparacion'):
+        reporte_ej = ReporteAjuste(entrenar_modelo(X_ej, y_ej), X_ej, y_ej)
+        m_ej = reporte_ej.m
+        b_ej = reporte_ej.b
+        r2_ej = reporte_ej.r2
+    
+    # Modelo con datos aleatorios (resultado guardado en disco por semilla)
+    with memoria.etapa('datos_comparacion'):
+        df_aleatorio = generar_datos_comparacion(semilla)
+        X_al = df_aleatorio['Horas'].values.reshape(-1, 1)
+        y_al = df_aleatorio['Nota'].values
+    
+    with memoria.etapa('grid_comparacion'):
+        grid = GridExperimentos(directorio_cache, calcular=calcular_celda_comparacion)
+        celda = {'tipo': 'comparacion_aleatoria', 'n': len(df_aleatorio), 'semilla': semilla}
+        resultado_al = grid.ejecutar([celda]).iloc[0]
+    m_al = resultado_al['pendiente']
+    b_al = resultado_al['intercepto']
+    r2_al = resultado_al['r2']
     
     # Mostrar comparación
     print("Datos de Ejemplo:")
@@ -127,8 +144,7 @@ def comparar_modelos():
     # Datos de ejemplo
     plt.subplot(1, 2, 1)
     plt.scatter(X_ej, y_ej, color='blue', s=100, alpha=0.7, label='Datos originales')
-    X_line_ej = np.linspace(X_ej.min() - 0.5, X_ej.max() + 0.5, 100)
-    y_line_ej = m_ej * X_line_ej + b_ej
+    X_line_ej, y_line_ej = reporte_ej.linea
     plt.plot(X_line_ej, y_line_ej, color='red', linewidth=2, label=f'y = {m_ej:.3f}x + {b_ej:.3f}')
     plt.xlabel('Horas de Estudio')
     plt.ylabel('Nota Obtenida')
@@ -151,6 +167,54 @@ def comparar_modelos():
     plt.tight_layout()
     plt.show()
 
+def estudiar_varianza(tamanos=(10, 20, 50, 100, 200, 500), ruidos=(0.25, 0.5, 1.0), repeticiones=50,
+                      backends=('manual', 'sklearn'), directorio_cache='resultados_experimentos',
+                      solo_graficar=False):
+    """Estudia la variabilidad de la pendiente según el tamaño de muestra y el ruido"""
+    print("\n📐 ESTUDIO DE VARIANZA DE LA PENDIENTE")
+    print("=" * 50)
+    
+    celdas = generar_celdas(tamanos, ruidos, repeticiones, backends)
+    grid = GridExperimentos(directorio_cache)
+    if solo_graficar:
+        # Volver a graficar con lo que haya en disco, sin entrenar
+        df = grid.cargar(celdas)
+        print(f"📂 {len(df)} de {len(celdas)} celdas disponibles en caché")
+    else:
+        print(f"🧮 {len(celdas)} celdas en el grid")
+        with memoria.etapa('grid_varianza'):
+            df = grid.ejecutar(celdas)
+    
+    if df.empty:
+        print("❌ No hay resultados que graficar.")
+        return df
+    
+    resumen = (df.groupby(['backend', 'ruido', 'n'])
+                 .agg(pendiente_media=('pendiente', 'mean'),
+                      pendiente_std=('pendiente', 'std'),
+                      r2_medio=('r2', 'mean'),
+                      segundos=('segundos', 'sum'))
+                 .reset_index())
+    print(resumen.to_string(index=False))
+    
+    plt.figure(figsize=(12, 5))
+    for i, backend in enumerate(resumen['backend'].unique()):
+        plt.subplot(1, 2, 1 + i % 2)
+        for ruido, grupo in resumen[resumen['backend'] == backend].groupby('ruido'):
+            plt.plot(grupo['n'], grupo['pendiente_std'], 'o-', linewidth=2, label=f'ruido = {ruido}')
+        plt.xscale('log')
+        plt.yscale('log')
+        plt.xlabel('Tamaño de Muestra')
+        plt.ylabel('Desv. estándar de la pendiente')
+        plt.title(f'Variabilidad de la Pendiente ({backend})')
+        plt.legend()
+        plt.grid(True, alpha=0.3)
+    
+    plt.tight_layout()
+    plt.show()
+    
+    return resumen
+
 def main():
     """Función principal para experimentos"""
     print("🧪 EXPERIMENTOS CON DATOS ALEATORIOS")
@@ -160,20 +224,23 @@ def main():
         print("\nOpciones disponibles:")
         print("1. Experimentar con diferentes tamaños de muestra")
         print("2. Comparar modelo de ejemplo vs datos aleatorios")
-        print("3. Salir")
+        print("3. Estudio de varianza (grid con resultados guardados en disco)")
+        print("4. Salir")
         
         try:
-            opcion = input("\nSelecciona una opción (1-3): ").strip()
+            opcion = input("\nSelecciona una opción (1-4): ").strip()
             
             if opcion == "1":
                 experimentar_con_datos_aleatorios()
             elif opcion == "2":
                 comparar_modelos()
             elif opcion == "3":
+                estudiar_varianza()
+            elif opcion == "4":
                 print("👋 ¡Hasta luego!")
                 break
             else:
-                print("❌ Opción no válida. Por favor selecciona 1, 2 o 3.")
+                print("❌ Opción no válida. Por favor selecciona 1, 2, 3 o 4.")
                 
         except KeyboardInterrupt:
             print("\n\n👋 ¡Hasta luego!")
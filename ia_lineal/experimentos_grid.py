@@ -0,0 +1,122 @@
+import hashlib
+import itertools
+import json
+import os
+import time
+import numpy as np
+import pandas as pd
+from main import entrenar_modelo
+from modelo_manual import entrenar_modelo_manual
+from reporte_ajuste import ReporteAjuste
+
+BACKENDS = {
+    'sklearn': entrenar_modelo,
+    'manual': entrenar_modelo_manual,
+}
+
+def generar_celdas(tamanos, ruidos=(0.5,), repeticiones=1, backends=('sklearn',), semilla_base=42):
+    """Genera las celdas del grid: tamaño × ruido × repetición × backend"""
+    celdas = []
+    for n, ruido, repeticion, backend in itertools.product(tamanos, ruidos, range(repeticiones), backends):
+        celdas.append({
+            'n': int(n),
+            'ruido': float(ruido),
+            'repeticion': repeticion,
+            'backend': backend,
+            'semilla': semilla_base + repeticion,
+        })
+    return celdas
+
+def generar_datos_celda(celda):
+    """Genera los datos de una celda (misma secuencia aleatoria que np.random.seed)"""
+    rng = np.random.RandomState(celda['semilla'])
+    n = celda['n']
+    horas = rng.uniform(0.5, 8.0, n)
+    notas = 0.8 * horas + 1.5 + rng.normal(0, celda['ruido'], n)
+    notas = np.clip(notas, 0, 10)
+    return horas.reshape(-1, 1), notas
+
+def calcular_celda(celda):
+    """Entrena el modelo de una celda y devuelve sus métricas"""
+    X, y = generar_datos_celda(celda)
+    inicio = time.perf_counter()
+    modelo = BACKENDS[celda['backend']](X, y)
+    segundos = time.perf_counter() - inicio
+    reporte = ReporteAjuste(modelo, X, y)
+    return {
+        'pendiente': float(reporte.m),
+        'intercepto': float(reporte.b),
+        'r2': float(reporte.r2),
+        'rmse': reporte.rmse,
+        'segundos': segundos,
+    }
+
+class GridExperimentos:
+    """Ejecuta grids de experimentos guardando el resultado de cada celda en disco.
+
+    Cada celda se guarda en un JSON cuyo nombre es el hash de sus parámetros
+    (incluida la semilla) y de la función que la calcula, para que grids con
+    distintas funciones puedan compartir directorio. Si la ejecución se interrumpe, al repetirla solo se
+    calculan las celdas que faltan; ampliar el grid solo calcula las nuevas, y
+    volver a graficar lee los resultados sin reentrenar.
+    """
+    def __init__(self, directorio='resultados_experimentos', calcular=calcular_celda, version=1):
+        self.directorio = directorio
+        self.calcular = calcular
+        self.version = version  # cambiarla invalida los resultados guardados
+
+    def clave(self, celda):
+        funcion = f"{self.calcular.__module__}.{self.calcular.__qualname__}"
+        texto = json.dumps({'celda': celda, 'funcion': funcion, 'version': self.version}, sort_keys=True)
+        return hashlib.sha1(texto.encode('utf-8')).hexdigest()
+
+    def _ruta(self, celda):
+        return os.path.join(self.directorio, f"{self.clave(celda)}.json")
+
+    def resultado(self, celda):
+        """Devuelve el resultado guardado de una celda o None"""
+        try:
+            with open(self._ruta(celda), 'r', encoding='utf-8') as f:
+                return json.load(f)['resultado']
+        except (FileNotFoundError, KeyError, ValueError):
+            return None
+
+    def _guardar(self, celda, resultado):
+        os.makedirs(self.directorio, exist_ok=True)
+        ruta = self._ruta(celda)
+        temporal = ruta + '.tmp'
+        with open(temporal, 'w', encoding='utf-8') as f:
+            json.dump({'celda': celda, 'resultado': resultado}, f)
+        # El reemplazo atómico garantiza que una interrupción no deja celdas a medias
+        os.replace(temporal, ruta)
+
+    def ejecutar(self, celdas, al_avanzar=None):
+        """Calcula las celdas que faltan y devuelve un DataFrame con todas"""
+        filas = []
+        calculadas = 0
+        try:
+            for celda in celdas:
+                resultado = self.resultado(celda)
+                en_cache = resultado is not None
+                if not en_cache:
+                    resultado = self.calcular(celda)
+                    self._guardar(celda, resultado)
+                    calculadas += 1
+                filas.append({**celda, **resultado})
+                if al_avanzar is not None:
+                    al_avanzar(celda, resultado, en_cache)
+        except KeyboardInterrupt:
+            print(f"\n⏸️  Interrumpido: {len(filas)} de {len(celdas)} celdas guardadas. "
+                  "La próxima ejecución continuará desde aquí.")
+            raise
+        print(f"💾 Celdas calculadas: {calculadas} · leídas de caché: {len(celdas) - calculadas}")
+        return pd.DataFrame(filas)
+
+    def cargar(self, celdas):
+        """Devuelve un DataFrame solo con las celdas ya calculadas, sin entrenar nada"""
+        filas = []
+        for celda in celdas:
+            resultado = self.resultado(celda)
+            if resultado is not None:
+                filas.append({**celda, **resultado})
+        return pd.DataFrame(filas)
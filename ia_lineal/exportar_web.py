@@ -0,0 +1,133 @@
+import argparse
+import json
+import os
+import numpy as np
+from acumuladores import AcumuladorRegresion
+from intervalos import calcular_intervalos
+from muestreo_reservorio import ReservorioRegresion, bloques_csv
+
+RUTA_PAGINA_WEB = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'pagina web', 'modelo.json')
+
+def _lista(valores, decimales):
+    """Array → lista JSON redondeada (NaN pasa a null)"""
+    valores = np.round(np.asarray(valores, dtype=float), decimales)
+    return [None if np.isnan(v) else v for v in valores.tolist()]
+
+class EscritorPaquete:
+    """Genera el paquete JSON que carga la página web (pagina web/main.js).
+
+    Los datos se reciben por bloques con agregar(), así que el tamaño del
+    conjunto no importa: se acumulan los estadísticos suficientes de la
+    regresión, mínimos y máximos, y una muestra estratificada por x de como
+    mucho `max_puntos` puntos para dibujar. Al cerrar se escribe un único
+    archivo pequeño con coeficientes, estadísticas, la tabla de predicción e
+    intervalos sobre el rango del slider (x_min..x_max cada `paso`) y la muestra.
+    """
+    def __init__(self, ruta=RUTA_PAGINA_WEB, max_puntos=500, x_min=0.0, x_max=10.0, paso=0.1,
+                 nivel=0.95, semilla=42):
+        self.ruta = ruta
+        self.x_min = x_min
+        self.x_max = x_max
+        self.paso = paso
+        self.nivel = nivel
+        self.acumulador = AcumuladorRegresion()
+        self.muestra = ReservorioRegresion(max_puntos, estratos=10, rango_x=(x_min, x_max), semilla=semilla)
+        self.minimos = np.full(2, np.inf)
+        self.maximos = np.full(2, -np.inf)
+        self.paquete = None
+
+    def agregar(self, x, y):
+        """Incorpora un bloque de puntos"""
+        x = np.asarray(x, dtype=float).ravel()
+        y = np.asarray(y, dtype=float).ravel()
+        if len(x) == 0:
+            return self
+        self.acumulador.agregar(x, y)
+        self.muestra.agregar(x, y)
+        self.minimos = np.minimum(self.minimos, [x.min(), y.min()])
+        self.maximos = np.maximum(self.maximos, [x.max(), y.max()])
+        return self
+
+    def cerrar(self, modelo=None, metodo='manual'):
+        """Escribe el paquete con el modelo dado o, si no se da, con el ajuste de mínimos cuadrados"""
+        a = self.acumulador
+        if a.n == 0:
+            raise ValueError("No hay datos que exportar")
+        if modelo is None:
+            modelo = a.modelo()
+        m, b = float(modelo.coef_[0]), float(modelo.intercept_)
+        # SS_res de una recta cualquiera a partir de los co-momentos
+        desajuste = a.media_y - m * a.media_x - b
+        ss_res = max(a.m2_y - 2 * m * a.c_xy + m * m * a.m2_x, 0.0) + a.n * desajuste * desajuste
+        r2 = 1.0 if a.m2_y == 0 else 1 - ss_res / a.m2_y
+        varianza = ss_res / (a.n - 2) if a.n > 2 else float('nan')
+
+        x = np.arange(round((self.x_max - self.x_min) / self.paso) + 1) * self.paso + self.x_min
+        intervalos = calcular_intervalos(x, m, b, a.n, a.media_x, a.m2_x, varianza, self.nivel)
+
+        def estadisticas(j, media, m2):
+            std = float(np.sqrt(m2 / (a.n - 1))) if a.n > 1 else None
+            return {'media': media, 'std': std, 'minimo': float(self.minimos[j]), 'maximo': float(self.maximos[j])}
+
+        horas, notas, _ = self.muestra.muestra()
+        self.paquete = {
+            'version': 1,
+            'modelo': {'metodo': metodo, 'm': m, 'b': b, 'r2': r2, 'n': a.n},
+            'estadisticas': {'horas': estadisticas(0, a.media_x, a.m2_x),
+                             'nota': estadisticas(1, a.media_y, a.m2_y)},
+            'tabla': {
+                'x_min': self.x_min, 'paso': self.paso, 'nivel': self.nivel,
+                'prediccion': _lista(intervalos.prediccion, 4),
+                'ic_inf': _lista(intervalos.confianza_inf, 4), 'ic_sup': _lista(intervalos.confianza_sup, 4),
+                'ip_inf': _lista(intervalos.prediccion_inf, 4), 'ip_sup': _lista(intervalos.prediccion_sup, 4),
+            },
+            'puntos': {'horas': _lista(horas, 2), 'nota': _lista(notas, 2)},
+        }
+
+        directorio = os.path.dirname(self.ruta)
+        if directorio:
+            os.makedirs(directorio, exist_ok=True)
+        temporal = self.ruta + '.tmp'
+        with open(temporal, 'w', encoding='utf-8') as f:
+            json.dump(self.paquete, f, ensure_ascii=False, separators=(',', ':'))
+        os.replace(temporal, self.ruta)
+        return self.paquete
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, tipo, valor, traza):
+        if tipo is None and self.paquete is None:
+            self.cerrar()
+
+def exportar_paquete(X, y, modelo=None, metodo='manual', ruta=RUTA_PAGINA_WEB, tamano_bloque=100_000, **kwargs):
+    """Exporta arrays ya cargados (por bloques, sin copias grandes)"""
+    x = np.asarray(X, dtype=float).ravel()
+    y = np.asarray(y, dtype=float).ravel()
+    escritor = EscritorPaquete(ruta, **kwargs)
+    for inicio in range(0, len(x), tamano_bloque):
+        escritor.agregar(x[inicio:inicio + tamano_bloque], y[inicio:inicio + tamano_bloque])
+    return escritor.cerrar(modelo, metodo)
+
+def exportar_csv(nombre_archivo, columna_x='Horas', columna_y='Nota', ruta=RUTA_PAGINA_WEB, **kwargs):
+    """Exporta un CSV de cualquier tamaño leyéndolo por bloques"""
+    escritor = EscritorPaquete(ruta, **kwargs)
+    for x, y in bloques_csv(nombre_archivo, columna_x, columna_y):
+        escritor.agregar(x, y)
+    return escritor.cerrar()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Exporta el modelo de un CSV para la página web")
+    parser.add_argument('csv', help="CSV con los datos de entrenamiento")
+    parser.add_argument('--columnas', nargs=2, metavar=('X', 'Y'), default=['Horas', 'Nota'])
+    parser.add_argument('--salida', default=RUTA_PAGINA_WEB, help="ruta del paquete JSON")
+    parser.add_argument('--max-puntos', type=int, default=500, help="puntos de la muestra que se dibuja")
+    args = parser.parse_args(argv)
+
+    paquete = exportar_csv(args.csv, *args.columnas, ruta=args.salida, max_puntos=args.max_puntos)
+    modelo = paquete['modelo']
+    print(f"🌐 Paquete web guardado en '{args.salida}' ({os.path.getsize(args.salida) / 1024:.1f} KB)")
+    print(f"   y = {modelo['m']:.3f}·x + {modelo['b']:.3f}, R² = {modelo['r2']:.4f}, n = {modelo['n']}")
+
+if __name__ == "__main__":
+    main()
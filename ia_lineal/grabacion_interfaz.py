@@ -0,0 +1,299 @@
+import argparse
+import json
+import time
+import tkinter
+import numpy as np
+import pandas as pd
+import matplotlib.pyplot as plt
+from matplotlib.backend_bases import MouseEvent
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+VERSION = 1
+EVENTOS_RATON = {
+    'on_click': 'button_press_event',
+    'on_motion': 'motion_notify_event',
+    'on_release': 'button_release_event',
+}
+MANEJADORES = tuple(EVENTOS_RATON) + ('on_slider_change', 'on_entrada_change', 'cambiar_metodo')
+
+class GrabadorEventos:
+    """Graba en un archivo JSON Lines los eventos que recibe la interfaz interactiva.
+
+    Se instala antes de crear los widgets (InterfazInteractiva(root, grabador=...)),
+    así que los callbacks de matplotlib y Tk apuntan ya a los manejadores
+    envueltos. Los eventos del ratón se guardan en coordenadas de datos para
+    poder reproducirlos con cualquier tamaño de ventana.
+    """
+    def __init__(self, ruta):
+        self.ruta = ruta
+        self.archivo = None
+        self.inicio = None
+
+    def instalar(self, app):
+        self.archivo = open(self.ruta, 'w', encoding='utf-8')
+        self.inicio = time.perf_counter()
+        self._escribir({
+            'tipo': 'cabecera',
+            'version': VERSION,
+            'datos': {columna: app.df[columna].astype(float).tolist() for columna in ['Horas', 'Nota']},
+        })
+        for nombre in MANEJADORES:
+            setattr(app, nombre, self._envolver(app, nombre, getattr(app, nombre)))
+
+    def _envolver(self, app, nombre, manejador):
+        def envoltura(*args):
+            self._escribir(self._describir(app, nombre, args))
+            return manejador(*args)
+        return envoltura
+
+    def _describir(self, app, nombre, args):
+        registro = {'tipo': 'evento', 't': time.perf_counter() - self.inicio, 'evento': nombre}
+        if nombre in EVENTOS_RATON:
+            evento = args[0]
+            registro.update(x=evento.xdata, y=evento.ydata, dentro=evento.inaxes is app.ax,
+                            boton=int(evento.button) if evento.button is not None else None)
+        elif nombre == 'on_slider_change':
+            registro['valor'] = args[0]
+        elif nombre == 'on_entrada_change':
+            registro['texto'] = app.entrada_horas.get()
+        elif nombre == 'cambiar_metodo':
+            registro['metodo'] = app.metodo_var.get()
+        return registro
+
+    def _escribir(self, registro):
+        self.archivo.write(json.dumps(registro) + "\n")
+
+    def cerrar(self):
+        if self.archivo is not None:
+            self.archivo.close()
+            self.archivo = None
+
+def cargar_grabacion(ruta):
+    """Devuelve (cabecera, lista de eventos) de un archivo grabado"""
+    with open(ruta, encoding='utf-8') as f:
+        registros = [json.loads(linea) for linea in f if linea.strip()]
+    if not registros or registros[0].get('tipo') != 'cabecera':
+        raise ValueError(f"'{ruta}' no es una grabación de la interfaz")
+    if registros[0]['version'] != VERSION:
+        raise ValueError(f"Versión de grabación no soportada: {registros[0]['version']}")
+    return registros[0], registros[1:]
+
+# --- Sustitutos de Tk para ejecutar la interfaz sin pantalla ---
+
+class _Widget:
+    """Widget que acepta cualquier llamada y guarda lo mínimo (texto y valor)"""
+    def __init__(self, *args, **kwargs):
+        self.opciones = dict(kwargs)
+        self.valor = kwargs.get('value', '')
+
+    def __getattr__(self, nombre):
+        return lambda *args, **kwargs: None
+
+    def config(self, **kwargs):
+        self.opciones.update(kwargs)
+
+    configure = config
+
+    def cget(self, opcion):
+        return self.opciones.get(opcion, '')
+
+    def get(self, *args):
+        return self.valor
+
+    def set(self, valor):
+        self.valor = valor
+
+    def delete(self, *args):
+        self.valor = ''
+
+    def insert(self, indice, texto):
+        self.valor = str(texto)
+
+class _RaizSinPantalla(_Widget):
+    """Sustituye a tk.Tk: root.after encola los callbacks y procesar() los ejecuta"""
+    def __init__(self):
+        super().__init__()
+        self.programados = []
+
+    def after(self, ms, funcion=None, *args):
+        if funcion is not None:
+            self.programados.append((funcion, args))
+        return len(self.programados)
+
+    def procesar(self):
+        programados, self.programados = self.programados, []
+        for funcion, args in programados:
+            funcion(*args)
+
+class _LienzoSinPantalla(FigureCanvasAgg):
+    def __init__(self, figura, master=None):
+        super().__init__(figura)
+
+    def get_tk_widget(self):
+        return _Widget()
+
+class _Modulo:
+    """Módulo con algunos nombres sustituidos; el resto se busca en el original"""
+    def __init__(self, original, **sustitutos):
+        self._original = original
+        self.__dict__.update(sustitutos)
+
+    def __getattr__(self, nombre):
+        return getattr(self._original, nombre)
+
+class _SinPantalla:
+    """Context manager que cambia Tk por sustitutos y el backend de matplotlib por Agg"""
+    def __enter__(self):
+        import interfaz_interactiva
+        self.modulo = interfaz_interactiva
+        self.anteriores = {nombre: getattr(interfaz_interactiva, nombre) for nombre in
+                           ('tk', 'ttk', 'messagebox', 'FigureCanvasTkAgg', 'NavigationToolbar2Tk')}
+        self.backend = plt.get_backend()
+        plt.switch_backend('Agg')
+        interfaz_interactiva.tk = _Modulo(tkinter, Tk=_RaizSinPantalla, Toplevel=_Widget, Text=_Widget,
+                                          StringVar=_Widget, BooleanVar=_Widget)
+        interfaz_interactiva.ttk = _Modulo(tkinter, **{nombre: _Widget for nombre in (
+            'Frame', 'LabelFrame', 'Label', 'Button', 'Radiobutton', 'Checkbutton',
+            'Scale', 'Entry', 'Progressbar')})
+        interfaz_interactiva.messagebox = _Widget()
+        interfaz_interactiva.FigureCanvasTkAgg = _LienzoSinPantalla
+        interfaz_interactiva.NavigationToolbar2Tk = _Widget
+        return interfaz_interactiva
+
+    def __exit__(self, *exc):
+        for nombre, valor in self.anteriores.items():
+            setattr(self.modulo, nombre, valor)
+        plt.switch_backend(self.backend)
+        return False
+
+# --- Reproducción ---
+
+class InformeReproduccion:
+    """Latencias de una reproducción.
+
+    latencia: tiempo dentro del manejador del evento.
+    fotograma: desde el evento hasta que la gráfica refleja su resultado
+    (manejador + ajuste en segundo plano + callbacks y dibujado).
+    """
+    def __init__(self):
+        self.eventos = []      # nombre de cada evento reproducido
+        self.latencias = []    # segundos
+        self.fotogramas = []   # segundos
+        self.duracion = 0.0
+
+    def agregar(self, evento, latencia, fotograma):
+        self.eventos.append(evento)
+        self.latencias.append(latencia)
+        self.fotogramas.append(fotograma)
+
+    def resumen(self):
+        """Por tipo de evento (y 'total'): n, media, p50, p95 y máximo en milisegundos"""
+        eventos = np.array(self.eventos)
+        latencias = np.array(self.latencias) * 1000
+        fotogramas = np.array(self.fotogramas) * 1000
+        resultado = {}
+        for nombre in list(dict.fromkeys(self.eventos)) + ['total']:
+            mascara = eventos == nombre if nombre != 'total' else np.ones(len(eventos), dtype=bool)
+            if not mascara.any():
+                continue
+            resultado[nombre] = {'n': int(mascara.sum())}
+            for clave, valores in (('latencia', latencias[mascara]), ('fotograma', fotogramas[mascara])):
+                resultado[nombre].update({
+                    f'{clave}_media_ms': float(valores.mean()),
+                    f'{clave}_p50_ms': float(np.percentile(valores, 50)),
+                    f'{clave}_p95_ms': float(np.percentile(valores, 95)),
+                    f'{clave}_max_ms': float(valores.max()),
+                })
+        return resultado
+
+    def a_dict(self):
+        return {'duracion_segundos': self.duracion, 'eventos': self.resumen()}
+
+    def mostrar(self):
+        print(f"⏱️  {len(self.eventos)} eventos reproducidos en {self.duracion:.2f} s")
+        print(f"{'Evento':20s} {'n':>6s} {'lat p50':>9s} {'lat p95':>9s} {'fot p50':>9s} {'fot p95':>9s} {'fot máx':>9s}")
+        for nombre, r in self.resumen().items():
+            print(f"{nombre:20s} {r['n']:6d} {r['latencia_p50_ms']:9.2f} {r['latencia_p95_ms']:9.2f} "
+                  f"{r['fotograma_p50_ms']:9.2f} {r['fotograma_p95_ms']:9.2f} {r['fotograma_max_ms']:9.2f}")
+        print("(milisegundos; lat = manejador, fot = hasta que la gráfica queda actualizada)")
+
+def _esperar_ajuste(app, root):
+    """Procesa los callbacks pendientes hasta que el ejecutor de fondo termina"""
+    root.procesar()
+    while app.ejecutor.pendientes > 0:
+        time.sleep(0.0002)
+        root.procesar()
+
+def _evento_raton(app, registro):
+    if registro['dentro']:
+        x, y = app.ax.transData.transform((registro['x'], registro['y']))
+    else:
+        x, y = -1.0, -1.0  # fuera de los ejes
+    return MouseEvent(EVENTOS_RATON[registro['evento']], app.canvas, x, y, registro['boton'])
+
+def _despachar(app, registro):
+    evento = registro['evento']
+    if evento in EVENTOS_RATON:
+        getattr(app, evento)(_evento_raton(app, registro))
+    elif evento == 'on_slider_change':
+        app.on_slider_change(registro['valor'])
+    elif evento == 'on_entrada_change':
+        app.entrada_horas.delete(0, tkinter.END)
+        app.entrada_horas.insert(0, registro['texto'])
+        app.on_entrada_change()
+    elif evento == 'cambiar_metodo':
+        app.metodo_var.set(registro['metodo'])
+        app.cambiar_metodo()
+
+def reproducir(ruta, tiempo_real=False):
+    """Reproduce una grabación sin pantalla y devuelve un InformeReproduccion.
+
+    Por defecto los eventos se envían uno tras otro sin pausas; con
+    tiempo_real=True se respetan los instantes grabados.
+    """
+    cabecera, registros = cargar_grabacion(ruta)
+    informe = InformeReproduccion()
+    with _SinPantalla() as interfaz_interactiva:
+        root = _RaizSinPantalla()
+        app = interfaz_interactiva.InterfazInteractiva(root)
+        try:
+            # Partir de los mismos datos que la sesión grabada
+            app.df = pd.DataFrame(cabecera['datos'])
+            app.reconstruir_estadisticas()
+            app.dibujar_puntos()
+            app.actualizar_modelo()
+            _esperar_ajuste(app, root)
+
+            inicio = time.perf_counter()
+            for registro in registros:
+                if tiempo_real:
+                    espera = registro['t'] - (time.perf_counter() - inicio)
+                    if espera > 0:
+                        time.sleep(espera)
+                t0 = time.perf_counter()
+                _despachar(app, registro)
+                t1 = time.perf_counter()
+                _esperar_ajuste(app, root)
+                informe.agregar(registro['evento'], t1 - t0, time.perf_counter() - t0)
+            informe.duracion = time.perf_counter() - inicio
+        finally:
+            app.ejecutor.cerrar()
+            plt.close(app.fig)
+    return informe
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Reproduce sin pantalla una sesión grabada de la interfaz interactiva")
+    parser.add_argument('grabacion', help="archivo creado con interfaz_interactiva.py --grabar")
+    parser.add_argument('--tiempo-real', action='store_true', help="respetar los tiempos grabados")
+    parser.add_argument('--informe', metavar='RUTA', help="guardar el resumen en JSON")
+    args = parser.parse_args(argv)
+
+    informe = reproducir(args.grabacion, tiempo_real=args.tiempo_real)
+    informe.mostrar()
+    if args.informe:
+        with open(args.informe, 'w', encoding='utf-8') as f:
+            json.dump(informe.a_dict(), f, indent=2)
+        print(f"💾 Informe guardado en '{args.informe}'")
+
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,4 @@
+import argparse
 import tkinter as tk
 from tkinter import ttk, messagebox
 import matplotlib.pyplot as plt
@@ -6,11 +7,23 @@ from matplotlib.patches import Circle
 import numpy as np
 import pandas as pd
 from sklearn.linear_model import LinearRegression
-from sklearn.metrics import r2_score
 import matplotlib.patches as mpatches
+from modelo_manual import entrenar_modelo_manual, calcular_r2_manual
+from estadisticas import EstadisticasColumnas
+from reporte_ajuste import ReporteAjuste
+from ejecutor_fondo import EjecutorFondo
+from registro_modelos import RegistroModelos
+from diario_sesion import DiarioSesion
+from muestreo_reservorio import estimar_en_memoria
+from exportar_web import exportar_paquete, RUTA_PAGINA_WEB
+import metricas
+from clasificador_logistico import RegresionLogistica, recomendacion_por_probabilidad
+
+# A partir de este número de puntos se muestra primero un ajuste aproximado por muestreo
+UMBRAL_ESTIMACION = 50_000
 
 class InterfazInteractiva:
-    def __init__(self, root):
+    def __init__(self, root, grabador=None, diario=None):
         self.root = root
         self.root.title("🎓 IA Interactiva - Predicción de Notas")
         self.root.geometry("1200x800")
@@ -22,16 +35,37 @@ class InterfazInteractiva:
         }
         self.df = pd.DataFrame(self.datos_iniciales)
         
+        # Autoguardado: ofrecer restaurar la sesión anterior y seguir guardando en segundo plano
+        self.diario = diario
+        if diario is not None:
+            puntos = diario.cargar()
+            if len(puntos) > 0 and messagebox.askyesno(
+                    "Restaurar sesión", f"Se encontró una sesión guardada con {len(puntos)} puntos. ¿Restaurarla?"):
+                self.df = pd.DataFrame(puntos, columns=['Horas', 'Nota'])
+            diario.iniciar(self.df[['Horas', 'Nota']].to_numpy(dtype=float))
+        self.reconstruir_estadisticas()
+        
         # Variables de control
         self.modo_arrastre = False
         self.punto_seleccionado = None
+        self.cuantiles_mostrados = None
         self.puntos_artistas = []
         self.prediccion_actual = None
         self.marcador_prediccion = None
+        self.banda_artistas = []
+        self.reporte = None
+        self.registro = RegistroModelos()
         self.usar_sklearn = False  # Por defecto usar método manual
+        self.metodo = "manual"
+        self.clasificador = None
+        
+        # El grabador envuelve los manejadores antes de conectarlos a los widgets
+        if grabador is not None:
+            grabador.instalar(self)
         
         # Configurar la interfaz
         self.configurar_interfaz()
+        self.ejecutor = EjecutorFondo(self.root, al_cambiar_ocupado=self.mostrar_ocupado)
         self.crear_grafica()
         self.conectar_eventos()
         self.actualizar_modelo()
@@ -56,15 +90,22 @@ class InterfazInteractiva:
         titulo = ttk.Label(control_frame, text="🎓 IA de Predicción", font=("Arial", 14, "bold"))
         titulo.grid(row=0, column=0, pady=(0, 20))
         
-        # Información del modelo
-        self.info_modelo = ttk.Label(control_frame, text="", font=("Arial", 10))
-        self.info_modelo.grid(row=1, column=0, pady=(0, 20))
+        # Información del modelo (con el indicador debajo, en su propia fila)
+        info_frame = ttk.Frame(control_frame)
+        info_frame.grid(row=1, column=0, pady=(0, 5))
+        self.info_modelo = ttk.Label(info_frame, text="", font=("Arial", 10))
+        self.info_modelo.grid(row=0, column=0)
+        
+        # Indicador de cálculo en segundo plano
+        self.indicador_ocupado = ttk.Progressbar(info_frame, mode="indeterminate", length=150)
+        self.indicador_ocupado.grid(row=1, column=0, pady=(5, 0))
+        self.indicador_ocupado.grid_remove()
         
         # Estadísticas
         stats_frame = ttk.LabelFrame(control_frame, text="Estadísticas", padding="5")
         stats_frame.grid(row=2, column=0, sticky="ew", pady=(0, 20))
         
-        self.stats_text = tk.Text(stats_frame, height=8, width=30, font=("Consolas", 9))
+        self.stats_text = tk.Text(stats_frame, height=11, width=30, font=("Consolas", 9))
         self.stats_text.grid(row=0, column=0, sticky=(tk.W, tk.E))
         
         # Selector de método de entrenamiento
@@ -78,6 +119,14 @@ class InterfazInteractiva:
         ttk.Radiobutton(metodo_frame, text="🤖 Scikit-learn", 
                        variable=self.metodo_var, value="sklearn",
                        command=self.cambiar_metodo).grid(row=1, column=0, sticky="w", pady=2)
+        ttk.Radiobutton(metodo_frame, text="📈 Logística (P. aprobar)", 
+                       variable=self.metodo_var, value="logistica",
+                       command=self.cambiar_metodo).grid(row=2, column=0, sticky="w", pady=2)
+        
+        self.resaltar_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(metodo_frame, text="🎯 Resaltar puntos influyentes",
+                        variable=self.resaltar_var,
+                        command=self.actualizar_modelo).grid(row=3, column=0, sticky="w", pady=(6, 2))
         
         # Botones de control
         btn_frame = ttk.Frame(control_frame)
@@ -87,6 +136,7 @@ class InterfazInteractiva:
         ttk.Button(btn_frame, text="📊 Generar Aleatorios", command=self.generar_datos_aleatorios).grid(row=1, column=0, pady=5)
         ttk.Button(btn_frame, text="💾 Guardar Modelo", command=self.guardar_modelo).grid(row=2, column=0, pady=5)
         ttk.Button(btn_frame, text="📈 Predicción", command=self.mostrar_prediccion).grid(row=3, column=0, pady=5)
+        ttk.Button(btn_frame, text="🌐 Exportar Web", command=self.exportar_web).grid(row=4, column=0, pady=5)
         
         # Panel de predicción con slider
         pred_frame = ttk.LabelFrame(control_frame, text="Predicción Interactiva", padding="5")
@@ -175,57 +225,17 @@ class InterfazInteractiva:
         
     def cambiar_metodo(self):
         """Cambia entre método manual y sklearn"""
-        self.usar_sklearn = (self.metodo_var.get() == "sklearn")
+        self.metodo = self.metodo_var.get()
+        self.usar_sklearn = (self.metodo == "sklearn")
         self.actualizar_modelo()
         
     def entrenar_modelo_manual(self, X, y):
         """Entrena el modelo de regresión lineal manualmente usando solo numpy"""
-        # Convertir a arrays numpy
-        X = np.array(X).flatten()
-        y = np.array(y)
-        
-        # Calcular medias
-        x_mean = np.mean(X)
-        y_mean = np.mean(y)
-        
-        # Calcular pendiente (m) usando la fórmula: m = Σ((x-x_mean)(y-y_mean)) / Σ((x-x_mean)²)
-        numerador = np.sum((X - x_mean) * (y - y_mean))
-        denominador = np.sum((X - x_mean) ** 2)
-        
-        # Evitar división por cero
-        if denominador == 0:
-            m = 0
-        else:
-            m = numerador / denominador
-        
-        # Calcular intercepto (b) usando la fórmula: b = y_mean - m * x_mean
-        b = y_mean - m * x_mean
-        
-        # Crear objeto similar a sklearn para compatibilidad
-        class ModeloManual:
-            def __init__(self, coef, intercept):
-                self.coef_ = np.array([coef])
-                self.intercept_ = intercept
-                
-            def predict(self, X):
-                return self.coef_[0] * X + self.intercept_
-                
-        return ModeloManual(m, b)
+        return entrenar_modelo_manual(X, y)
         
     def calcular_r2_manual(self, y_true, y_pred):
         """Calcula R² manualmente"""
-        # R² = 1 - (SS_res / SS_tot)
-        # SS_res = Σ(y_true - y_pred)²
-        # SS_tot = Σ(y_true - y_mean)²
-        
-        y_mean = np.mean(y_true)
-        ss_res = np.sum((y_true - y_pred) ** 2)
-        ss_tot = np.sum((y_true - y_mean) ** 2)
-        
-        if ss_tot == 0:
-            return 1.0  # Si no hay variación, R² = 1
-            
-        return 1 - (ss_res / ss_tot)
+        return calcular_r2_manual(y_true, y_pred)
         
     def on_click(self, event):
         """Maneja el evento de clic del mouse"""
@@ -251,6 +261,9 @@ class InterfazInteractiva:
             # Añadir nuevo punto al DataFrame
             nuevo_punto = pd.DataFrame({'Horas': [hora], 'Nota': [nota]})
             self.df = pd.concat([self.df, nuevo_punto], ignore_index=True)
+            self.estadisticas.agregar((hora, nota))
+            if self.diario is not None:
+                self.diario.agregar(hora, nota)
             
             # Redibujar y actualizar modelo
             self.dibujar_puntos()
@@ -274,9 +287,13 @@ class InterfazInteractiva:
             hora = max(0, min(10, hora))
             nota = max(0, min(10, nota))
             
-            # Actualizar DataFrame
+            # Actualizar estadísticas incrementales y DataFrame
+            fila_vieja = (self.df.at[self.punto_seleccionado, 'Horas'], self.df.at[self.punto_seleccionado, 'Nota'])
+            self.estadisticas.actualizar(self.punto_seleccionado, fila_vieja, (hora, nota))
             self.df.loc[self.punto_seleccionado, 'Horas'] = hora
             self.df.loc[self.punto_seleccionado, 'Nota'] = nota
+            if self.diario is not None:
+                self.diario.mover(self.punto_seleccionado, hora, nota)
             
             # Actualizar posición del punto
             self.puntos_artistas[self.punto_seleccionado].center = (hora, nota)
@@ -290,42 +307,75 @@ class InterfazInteractiva:
         if self.modo_arrastre:
             self.modo_arrastre = False
             self.punto_seleccionado = None
+            self.actualizar_estadisticas()
             
     def actualizar_modelo(self):
         """Actualiza el modelo de regresión lineal"""
         if len(self.df) < 2:
             return
             
-        # Preparar datos
-        X = self.df['Horas'].values.reshape(-1, 1)
-        y = self.df['Nota'].values
+        # Preparar datos (copias: el DataFrame puede cambiar mientras el hilo calcula)
+        X = self.df['Horas'].to_numpy(dtype=float).reshape(-1, 1)
+        y = self.df['Nota'].to_numpy(dtype=float)
+        
+        # Actualizar estadísticas (incrementales, no bloquean)
+        self.actualizar_estadisticas()
         
+        # Con muchos puntos, una estimación por muestreo llega antes que el ajuste completo
+        if len(X) > UMBRAL_ESTIMACION:
+            self.ejecutor.enviar("estimacion", estimar_en_memoria, X, y, al_terminar=self.aplicar_estimacion)
+        
+        # El ajuste se hace en segundo plano; un envío nuevo sustituye al anterior
+        self.ejecutor.enviar("ajuste", self.calcular_ajuste, X, y, self.metodo,
+                             bool(self.resaltar_var.get()), al_terminar=self.aplicar_ajuste)
+        
+    @metricas.medido('ajuste_interfaz')
+    def calcular_ajuste(self, X, y, metodo, con_diagnosticos=False):
+        """Entrena el modelo y calcula sus métricas (se ejecuta en el hilo de fondo)"""
         # Entrenar modelo según el método seleccionado
-        if self.usar_sklearn:
+        if metodo == "sklearn":
             # Usar scikit-learn
             modelo = LinearRegression()
             modelo.fit(X, y)
-            m = modelo.coef_[0]
-            b = modelo.intercept_
-            y_pred = modelo.predict(X)
-            r2 = r2_score(y, y_pred)
         else:
             # Usar método manual
             modelo = self.entrenar_modelo_manual(X, y)
-            m = modelo.coef_[0]
-            b = modelo.intercept_
-            y_pred = modelo.predict(X.flatten())
-            r2 = self.calcular_r2_manual(y, y_pred)
         
-        # Actualizar línea de regresión
+        reporte = ReporteAjuste(modelo, X, y)
+        # Forzar aquí los cálculos O(n) para que no ocurran en el hilo de Tk
+        reporte.r2
+        reporte.banda
+        if con_diagnosticos:
+            reporte.diagnosticos
+        
+        # Con el método logístico se añade el clasificador de aprobado (nota ≥ 5)
+        clasificador = None
+        if metodo == "logistica":
+            clasificador = RegresionLogistica().fit(X, y)
+        return reporte, metodo, clasificador
+        
+    def aplicar_ajuste(self, resultado):
+        """Muestra en la interfaz un ajuste terminado (hilo de Tk)"""
+        # El reporte guarda el ajuste para reutilizarlo en las predicciones
+        self.reporte, metodo, self.clasificador = resultado
+        m = self.reporte.m
+        b = self.reporte.b
+        r2 = self.reporte.r2
+        
+        # Actualizar línea de regresión y bandas de intervalos
         self.actualizar_linea_regresion(m, b)
+        self.dibujar_banda()
         
         # Actualizar información en la interfaz
-        metodo_texto = "🤖 sklearn" if self.usar_sklearn else "🧮 Manual"
-        self.info_modelo.config(text=f"{metodo_texto}\ny = {m:.3f}x + {b:.3f}\nR² = {r2:.4f}")
+        metodo_texto = {"manual": "🧮 Manual", "sklearn": "🤖 sklearn", "logistica": "📈 Logística"}[metodo]
+        texto = f"{metodo_texto}\ny = {m:.3f}x + {b:.3f}\nR² = {r2:.4f}"
+        if self.clasificador is not None:
+            texto += f"\nP(aprobar) = σ({self.clasificador.coef_[0]:.2f}x + {self.clasificador.intercept_:.2f})"
+            self.dibujar_curva_probabilidad()
+        self.info_modelo.config(text=texto)
         
-        # Actualizar estadísticas
-        self.actualizar_estadisticas()
+        # Colorear los puntos según su influencia en el ajuste
+        self.colorear_influyentes()
         
         # Actualizar predicción si hay un valor en el slider
         try:
@@ -334,6 +384,62 @@ class InterfazInteractiva:
         except:
             pass
         
+        self.canvas.draw_idle()
+        
+    def aplicar_estimacion(self, estimacion):
+        """Muestra la recta aproximada (discontinua) mientras llega el ajuste completo"""
+        self.actualizar_linea_regresion(estimacion.pendiente, estimacion.intercepto)
+        self.ax.lines[-1].set_linestyle('--')
+        self.info_modelo.config(
+            text=f"≈ Estimación ({estimacion.n_muestra} de {estimacion.n_visto} puntos)\n"
+                 f"y ≈ {estimacion.pendiente:.3f}x + {estimacion.intercepto:.3f}\n"
+                 f"m ∈ [{estimacion.ic_pendiente[0]:.3f}, {estimacion.ic_pendiente[1]:.3f}]\n"
+                 f"R² ∈ [{estimacion.ic_r2[0]:.3f}, {estimacion.ic_r2[1]:.3f}]")
+        self.canvas.draw_idle()
+        
+    def dibujar_banda(self):
+        """Sombrea las bandas de confianza y predicción del ajuste actual"""
+        for artista in self.banda_artistas:
+            artista.remove()
+        self.banda_artistas = self.reporte.banda.dibujar(self.ax)
+        if self.ax.get_legend():
+            self.ax.get_legend().remove()
+        self.ax.legend()
+        
+    def colorear_influyentes(self):
+        """Pinta en naranja los puntos con distancia de Cook alta (si está activado)"""
+        influyentes = None
+        if self.resaltar_var.get() and self.reporte is not None:
+            influyentes = self.reporte.diagnosticos.influyentes
+            # El ajuste puede corresponder a unos datos que ya han cambiado
+            if len(influyentes) != len(self.puntos_artistas):
+                influyentes = None
+        
+        for i, punto in enumerate(self.puntos_artistas):
+            color = 'orange' if influyentes is not None and influyentes[i] else 'blue'
+            punto.set_color(color)
+        
+    def dibujar_curva_probabilidad(self):
+        """Dibuja la probabilidad de aprobar (escalada a 0-10) sobre la gráfica"""
+        x_min, x_max = self.ax.get_xlim()
+        x_curva = np.linspace(x_min, x_max, 200)
+        # Predicción por lotes: toda la curva en una sola llamada
+        p_curva = self.clasificador.probabilidad_aprobar(x_curva)
+        self.ax.plot(x_curva, 10 * p_curva, color='green', linestyle='--', linewidth=1.5,
+                     label='P(aprobar) × 10')
+        if self.ax.get_legend():
+            self.ax.get_legend().remove()
+        self.ax.legend()
+        
+    def mostrar_ocupado(self, ocupado):
+        """Muestra u oculta el indicador de cálculo en segundo plano"""
+        if ocupado:
+            self.indicador_ocupado.grid()
+            self.indicador_ocupado.start(10)
+        else:
+            self.indicador_ocupado.stop()
+            self.indicador_ocupado.grid_remove()
+        
     def actualizar_linea_regresion(self, m, b):
         """Actualiza la línea de regresión en la gráfica"""
         # Limpiar línea anterior
@@ -353,19 +459,38 @@ class InterfazInteractiva:
             self.ax.get_legend().remove()
         self.ax.legend()
         
+    def reconstruir_estadisticas(self):
+        """Recalcula desde cero el resumen estadístico de los datos actuales"""
+        self.estadisticas = EstadisticasColumnas.desde_df(self.df, ['Horas', 'Nota'])
+        
     def actualizar_estadisticas(self):
         """Actualiza las estadísticas mostradas"""
+        obtener_datos = lambda: self.df[['Horas', 'Nota']].to_numpy(dtype=float)
+        resumen = self.estadisticas.resumen(obtener_datos)
+        if self.modo_arrastre and self.estadisticas.bocetos_invalidos and self.cuantiles_mostrados is not None:
+            # Reconstruir los bocetos recorre todos los puntos: durante el arrastre
+            # se muestran los últimos cuantiles y se recalculan al soltar
+            cuantiles = self.cuantiles_mostrados
+        else:
+            cuantiles = self.cuantiles_mostrados = self.estadisticas.cuantiles((0.25, 0.5, 0.75), obtener_datos)
+        horas = resumen['Horas']
+        notas = resumen['Nota']
+        q_horas = cuantiles['Horas']
+        q_notas = cuantiles['Nota']
         stats_text = f"""📊 ESTADÍSTICAS
 
-Puntos de datos: {len(self.df)}
-Horas promedio: {self.df['Horas'].mean():.2f}
-Nota promedio: {self.df['Nota'].mean():.2f}
+Puntos de datos: {horas.n}
+Horas promedio: {horas.media:.2f}
+Nota promedio: {notas.media:.2f}
+
+Horas (min/max): {horas.minimo:.1f} / {horas.maximo:.1f}
+Nota (min/max): {notas.minimo:.1f} / {notas.maximo:.1f}
 
-Horas (min/max): {self.df['Horas'].min():.1f} / {self.df['Horas'].max():.1f}
-Nota (min/max): {self.df['Nota'].min():.1f} / {self.df['Nota'].max():.1f}
+Mediana horas: {q_horas[1]:.2f} [Q1 {q_horas[0]:.1f}, Q3 {q_horas[2]:.1f}]
+Mediana notas: {q_notas[1]:.2f} [Q1 {q_notas[0]:.1f}, Q3 {q_notas[2]:.1f}]
 
-Desv. estándar horas: {self.df['Horas'].std():.2f}
-Desv. estándar notas: {self.df['Nota'].std():.2f}"""
+Desv. estándar horas: {horas.std:.2f}
+Desv. estándar notas: {notas.std:.2f}"""
         
         self.stats_text.delete(1.0, tk.END)
         self.stats_text.insert(1.0, stats_text)
@@ -373,6 +498,8 @@ Desv. estándar notas: {self.df['Nota'].std():.2f}"""
     def reiniciar_datos(self):
         """Reinicia los datos a los valores iniciales"""
         self.df = pd.DataFrame(self.datos_iniciales)
+        self.guardar_en_diario()
+        self.reconstruir_estadisticas()
         self.crear_grafica()
         self.actualizar_modelo()
         
@@ -389,19 +516,26 @@ Desv. estándar notas: {self.df['Nota'].std():.2f}"""
             'Horas': horas,
             'Nota': notas
         })
+        self.guardar_en_diario()
+        self.reconstruir_estadisticas()
         
         self.crear_grafica()
         self.actualizar_modelo()
         
+    def guardar_en_diario(self):
+        """Registra en el autoguardado que los puntos se han sustituido por completo"""
+        if self.diario is not None:
+            self.diario.reemplazar(self.df[['Horas', 'Nota']].to_numpy(dtype=float))
+            
     def guardar_modelo(self):
         """Guarda el modelo actual"""
         try:
             import pickle
-            X = self.df['Horas'].values.reshape(-1, 1)
-            y = self.df['Nota'].values
+            X = self.df['Horas'].to_numpy(dtype=float).reshape(-1, 1)
+            y = self.df['Nota'].to_numpy(dtype=float)
             
-            modelo = LinearRegression()
-            modelo.fit(X, y)
+            # Solo se entrena si estos datos no están ya en el registro
+            modelo, _ = self.registro.obtener_o_entrenar(X, y, 'sklearn', self.entrenar_para_guardar)
             
             with open('modelo_interactivo.pkl', 'wb') as f:
                 pickle.dump(modelo, f)
@@ -410,6 +544,26 @@ Desv. estándar notas: {self.df['Nota'].std():.2f}"""
         except Exception as e:
             messagebox.showerror("Error", f"Error al guardar: {e}")
             
+    def exportar_web(self):
+        """Exporta la recta actual y sus intervalos como paquete para la página web"""
+        if self.reporte is None:
+            return
+        try:
+            exportar_paquete(self.reporte.x, self.reporte.y, self.reporte.modelo, self.metodo, RUTA_PAGINA_WEB)
+            messagebox.showinfo("Éxito", f"Paquete web guardado en '{RUTA_PAGINA_WEB}'")
+        except Exception as e:
+            messagebox.showerror("Error", f"Error al exportar: {e}")
+            
+    def entrenar_para_guardar(self, X, y):
+        """Devuelve el modelo sklearn de los datos, reutilizando el último ajuste si coincide"""
+        reporte = self.reporte
+        if (reporte is not None and isinstance(reporte.modelo, LinearRegression)
+                and np.array_equal(reporte.X, X) and np.array_equal(reporte.y, y)):
+            return reporte.modelo
+        modelo = LinearRegression()
+        modelo.fit(X, y)
+        return modelo
+            
     def mostrar_prediccion(self):
         """Muestra una ventana de predicción"""
         ventana_pred = tk.Toplevel(self.root)
@@ -473,23 +627,20 @@ Desv. estándar notas: {self.df['Nota'].std():.2f}"""
         except ValueError:
             pass
             
+    @metricas.medido('prediccion_interfaz')
     def actualizar_prediccion_en_grafica(self, horas):
         """Actualiza la predicción mostrada en la gráfica"""
-        if len(self.df) < 2:
+        if len(self.df) < 2 or self.reporte is None:
             return
             
         try:
-            # Entrenar modelo según el método seleccionado
-            X = self.df['Horas'].values.reshape(-1, 1)
-            y = self.df['Nota'].values
-            
-            if self.usar_sklearn:
-                modelo = LinearRegression()
-                modelo.fit(X, y)
-                prediccion = modelo.predict([[horas]])[0]
+            # Reutilizar el ajuste de actualizar_modelo; los intervalos se leen de la banda precalculada
+            prediccion = self.reporte.m * horas + self.reporte.b
+            banda = self.reporte.banda
+            if horas <= banda.x[-1]:
+                intervalo = banda.en(horas)
             else:
-                modelo = self.entrenar_modelo_manual(X, y)
-                prediccion = modelo.predict(horas)
+                intervalo = self.reporte.intervalos(horas)
                 
             prediccion = np.clip(prediccion, 0, 10)
             
@@ -497,7 +648,7 @@ Desv. estándar notas: {self.df['Nota'].std():.2f}"""
             self.mostrar_marcador_prediccion(horas, prediccion)
             
             # Actualizar resultado
-            self.actualizar_resultado_prediccion(horas, prediccion)
+            self.actualizar_resultado_prediccion(horas, prediccion, intervalo)
             
         except Exception as e:
             print(f"Error en predicción: {e}")
@@ -522,10 +673,20 @@ Desv. estándar notas: {self.df['Nota'].std():.2f}"""
         
         self.canvas.draw()
         
-    def actualizar_resultado_prediccion(self, horas, prediccion):
+    def actualizar_resultado_prediccion(self, horas, prediccion, intervalo=None):
         """Actualiza el resultado de la predicción en la interfaz"""
+        intervalo_texto = ""
+        if intervalo is not None and np.isfinite(intervalo.prediccion_inf):
+            intervalo_texto = (f"\n📏 IP 95%: [{max(intervalo.prediccion_inf, 0):.2f}, "
+                               f"{min(intervalo.prediccion_sup, 10):.2f}]")
+        
         # Dar recomendación
-        if prediccion >= 7:
+        probabilidad_texto = ""
+        if self.clasificador is not None:
+            probabilidad = self.clasificador.probabilidad_aprobar(horas)[0]
+            probabilidad_texto = f"\n🎯 P(aprobar) = {probabilidad:.0%}"
+            recomendacion = recomendacion_por_probabilidad(probabilidad)
+        elif prediccion >= 7:
             recomendacion = "✅ ¡Excelente! Con esas horas deberías obtener una buena nota."
         elif prediccion >= 5:
             recomendacion = "⚠️ Con esas horas podrías aprobar, pero considera estudiar más."
@@ -533,7 +694,7 @@ Desv. estándar notas: {self.df['Nota'].std():.2f}"""
             recomendacion = "❌ Con esas horas podrías tener dificultades. Te recomiendo estudiar más."
             
         self.resultado_prediccion.config(
-            text=f"📚 {horas:.1f} horas → {prediccion:.2f}/10\n{recomendacion}"
+            text=f"📚 {horas:.1f} horas → {prediccion:.2f}/10{intervalo_texto}{probabilidad_texto}\n{recomendacion}"
         )
         
     def hacer_prediccion(self):
@@ -549,11 +710,32 @@ Desv. estándar notas: {self.df['Nota'].std():.2f}"""
         except ValueError:
             self.resultado_prediccion.config(text="❌ Introduce un número válido")
 
-def main():
+def main(argv=None):
     """Función principal"""
+    parser = argparse.ArgumentParser(description="IA interactiva de predicción de notas")
+    parser.add_argument('--sin-autoguardado', action='store_true',
+                        help="no guardar ni ofrecer restaurar los puntos de la sesión")
+    parser.add_argument('--grabar', metavar='RUTA',
+                        help="grabar los eventos de la sesión para reproducirlos con grabacion_interfaz.py")
+    args = parser.parse_args(argv)
+    
+    grabador = None
+    if args.grabar:
+        from grabacion_interfaz import GrabadorEventos
+        grabador = GrabadorEventos(args.grabar)
+    
+    diario = None if args.sin_autoguardado else DiarioSesion()
+    
     root = tk.Tk()
-    app = InterfazInteractiva(root)
-    root.mainloop()
+    app = InterfazInteractiva(root, grabador, diario)
+    try:
+        root.mainloop()
+    finally:
+        if diario is not None:
+            diario.cerrar()
+        if grabador is not None:
+            grabador.cerrar()
+            print(f"💾 Sesión grabada en '{args.grabar}'")
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
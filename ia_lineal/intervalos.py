@@ -0,0 +1,72 @@
+from collections import namedtuple
+import numpy as np
+from scipy import stats
+
+Intervalo = namedtuple('Intervalo', [
+    'prediccion',
+    'confianza_inf', 'confianza_sup',    # intervalo de confianza de la recta media
+    'prediccion_inf', 'prediccion_sup',  # intervalo de predicción de una observación nueva
+])
+
+def calcular_intervalos(x, m, b, n, x_media, s_xx, varianza_residual, nivel=0.95):
+    """Intervalos analíticos de una recta y = m·x + b para todos los x a la vez.
+
+    Solo usa estadísticos suficientes (n, x̄, Sxx) y la varianza residual s²:
+        confianza:  ŷ ± t · s · √(1/n + (x - x̄)² / Sxx)
+        predicción: ŷ ± t · s · √(1 + 1/n + (x - x̄)² / Sxx)
+    con t el cuantil de una t de Student con n - 2 grados de libertad.
+    """
+    x = np.asarray(x, dtype=float)
+    prediccion = m * x + b
+    if n <= 2 or s_xx <= 0 or not np.isfinite(varianza_residual):
+        nan = np.full_like(prediccion, np.nan)
+        return Intervalo(prediccion, nan, nan, nan, nan)
+
+    t = stats.t.ppf(0.5 + nivel / 2, n - 2)
+    termino = 1.0 / n + (x - x_media) ** 2 / s_xx
+    mitad_confianza = t * np.sqrt(varianza_residual * termino)
+    mitad_prediccion = t * np.sqrt(varianza_residual * (1.0 + termino))
+    return Intervalo(prediccion,
+                     prediccion - mitad_confianza, prediccion + mitad_confianza,
+                     prediccion - mitad_prediccion, prediccion + mitad_prediccion)
+
+class BandaIntervalos:
+    """Intervalos precalculados sobre una rejilla uniforme de x.
+
+    Se calculan una sola vez por ajuste; después, consultar un valor (por
+    ejemplo en cada movimiento del slider) es solo buscar el índice más
+    cercano de la rejilla, y dibujar la banda es pasar los arrays tal cual.
+    """
+    def __init__(self, m, b, n, x_media, s_xx, varianza_residual,
+                 x_min=0.0, x_max=10.0, puntos=1001, nivel=0.95):
+        self.nivel = nivel
+        self.x_min = float(x_min)
+        self.x = np.linspace(x_min, x_max, puntos)
+        self.paso = self.x[1] - self.x[0] if puntos > 1 else 1.0
+        self.intervalos = calcular_intervalos(self.x, m, b, n, x_media, s_xx,
+                                              varianza_residual, nivel)
+
+    @classmethod
+    def desde_reporte(cls, reporte, **kwargs):
+        return cls(reporte.m, reporte.b, reporte.n, float(np.mean(reporte.x)),
+                   reporte.s_xx, reporte.varianza_residual, **kwargs)
+
+    def indice(self, x):
+        """Índice de la rejilla más cercano a x (acepta escalares y arrays)"""
+        indice = np.rint((np.asarray(x, dtype=float) - self.x_min) / self.paso).astype(int)
+        return np.clip(indice, 0, len(self.x) - 1)
+
+    def en(self, x):
+        """Intervalo en x leído de la rejilla (sin recalcular)"""
+        i = self.indice(x)
+        return Intervalo(*(campo[i] for campo in self.intervalos))
+
+    def dibujar(self, ax, color='red'):
+        """Sombrea las bandas de confianza y de predicción; devuelve los artistas"""
+        porcentaje = f"{self.nivel:.0%}"
+        return [
+            ax.fill_between(self.x, self.intervalos.prediccion_inf, self.intervalos.prediccion_sup,
+                            color=color, alpha=0.08, label=f'Intervalo de predicción {porcentaje}'),
+            ax.fill_between(self.x, self.intervalos.confianza_inf, self.intervalos.confianza_sup,
+                            color=color, alpha=0.2, label=f'Intervalo de confianza {porcentaje}'),
+        ]
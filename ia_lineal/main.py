@@ -2,9 +2,21 @@ import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
 from sklearn.linear_model import LinearRegression
-from sklearn.metrics import r2_score
+import argparse
 import pickle
 import os
+from reporte_ajuste import ReporteAjuste
+from registro_modelos import RegistroModelos
+import metricas
+import memoria
+import nucleos
+from muestreo_reservorio import ReservorioRegresion, bloques_csv
+from modelo_manual import ModeloManual
+from datos_comprimidos import DatosComprimidos
+from regresion_grupos import entrenar_por_grupos
+from regresion_multisalida import ajustar_csv
+from exportar_web import exportar_paquete, RUTA_PAGINA_WEB
+from clasificador_logistico import RegresionLogistica, recomendacion_por_probabilidad
 
 def crear_datos_ejemplo():
     """Crea el conjunto de datos de ejemplo"""
@@ -29,21 +41,18 @@ def generar_datos_aleatorios(n_muestras=20):
     }
     return pd.DataFrame(datos)
 
+@metricas.medido('entrenamiento')
 def entrenar_modelo(X, y):
     """Entrena el modelo de regresión lineal"""
     modelo = LinearRegression()
     modelo.fit(X, y)
     return modelo
 
-def mostrar_resultados(modelo, X, y):
+def mostrar_resultados(reporte):
     """Muestra los resultados del modelo en consola"""
-    # Obtener coeficientes
-    m = modelo.coef_[0]
-    b = modelo.intercept_
-    
-    # Calcular R²
-    y_pred = modelo.predict(X)
-    r2 = r2_score(y, y_pred)
+    m = reporte.m
+    b = reporte.b
+    r2 = reporte.r2
     
     print("=" * 50)
     print("RESULTADOS DEL MODELO DE REGRESIÓN LINEAL")
@@ -54,17 +63,35 @@ def mostrar_resultados(modelo, X, y):
     
     return m, b, r2
 
-def graficar_resultados(X, y, modelo, m, b):
-    """Crea la gráfica con puntos originales y línea de regresión"""
+@metricas.medido('grafica')
+@memoria.perfilado('grafica')
+def dibujar_resultados(reporte, estimacion=None):
+    """Crea la gráfica con puntos originales y línea de regresión
+
+    Con `estimacion` (ajuste aproximado por muestreo) los puntos son la muestra
+    y se indican los intervalos respecto al ajuste con todos los datos.
+    """
+    X, y = reporte.X, reporte.y
+    m, b = reporte.m, reporte.b
     plt.figure(figsize=(10, 6))
     
     # Graficar puntos originales
-    plt.scatter(X, y, color='blue', s=100, alpha=0.7, label='Datos originales')
+    if estimacion is None:
+        plt.scatter(X, y, color='blue', s=100, alpha=0.7, label='Datos originales')
+    else:
+        plt.scatter(X, y, color='blue', s=10, alpha=0.3,
+                    label=f'Muestra ({estimacion.n_muestra} de {estimacion.n_visto} puntos)')
     
-    # Crear línea de regresión
-    X_line = np.linspace(X.min() - 0.5, X.max() + 0.5, 100)
-    y_line = m * X_line + b
-    plt.plot(X_line, y_line, color='red', linewidth=2, label=f'y = {m:.3f}x + {b:.3f}')
+    # Línea de regresión
+    X_line, y_line = reporte.linea
+    etiqueta = f'y = {m:.3f}x + {b:.3f}'
+    if estimacion is not None:
+        etiqueta = (f'y ≈ {m:.3f}x + {b:.3f}  (m ∈ [{estimacion.ic_pendiente[0]:.3f}, '
+                    f'{estimacion.ic_pendiente[1]:.3f}], R² ∈ [{estimacion.ic_r2[0]:.3f}, {estimacion.ic_r2[1]:.3f}])')
+    plt.plot(X_line, y_line, color='red', linewidth=2, linestyle='-' if estimacion is None else '--', label=etiqueta)
+    
+    # Bandas de confianza y predicción (precalculadas en el reporte)
+    reporte.banda.dibujar(plt.gca())
     
     # Configurar gráfica
     plt.xlabel('Horas de Estudio', fontsize=12)
@@ -74,14 +101,18 @@ def graficar_resultados(X, y, modelo, m, b):
     plt.legend()
     
     # Ajustar límites
-    plt.xlim(0, max(X.max() + 1, 6))
+    plt.xlim(0, max(np.max(X) + 1, 6))
     plt.ylim(0, 10)
     
     plt.tight_layout()
+
+def graficar_resultados(reporte, estimacion=None):
+    """Dibuja y muestra la gráfica de resultados"""
+    dibujar_resultados(reporte, estimacion)
     plt.show()
 
-def predecir_nota(modelo):
-    """Solicita horas de estudio al usuario y predice la nota"""
+def predecir_nota(modelo, clasificador=None, reporte=None):
+    """Solicita horas de estudio al usuario y predice la nota (con su intervalo y la probabilidad de aprobar)"""
     while True:
         try:
             print("\n" + "=" * 50)
@@ -94,14 +125,25 @@ def predecir_nota(modelo):
                 continue
                 
             # Realizar predicción
-            prediccion = modelo.predict([[horas]])[0]
+            with metricas.cronometro('prediccion'):
+                prediccion = modelo.predict([[horas]])[0]
+            metricas.contar('filas_predichas')
             prediccion = np.clip(prediccion, 0, 10)  # Limitar entre 0 y 10
             
             print(f"\n📚 Horas de estudio: {horas}")
             print(f"📊 Nota predicha: {prediccion:.2f}/10")
+            if reporte is not None:
+                intervalo = reporte.intervalos(horas)
+                if np.isfinite(intervalo.prediccion_inf):
+                    print(f"📏 Intervalo de predicción 95%: [{max(intervalo.prediccion_inf, 0):.2f}, "
+                          f"{min(intervalo.prediccion_sup, 10):.2f}]")
             
             # Dar recomendación
-            if prediccion >= 7:
+            if clasificador is not None:
+                probabilidad = clasificador.probabilidad_aprobar(horas)[0]
+                print(f"🎯 Probabilidad de aprobar: {probabilidad:.0%}")
+                print(recomendacion_por_probabilidad(probabilidad))
+            elif prediccion >= 7:
                 print("✅ ¡Excelente! Con esas horas deberías obtener una buena nota.")
             elif prediccion >= 5:
                 print("⚠️  Con esas horas podrías aprobar, pero considera estudiar más.")
@@ -116,6 +158,29 @@ def predecir_nota(modelo):
             print("\n\n👋 ¡Hasta luego!")
             exit()
 
+@metricas.medido('prediccion_lote')
+def predecir_lote(reporte, horas, clasificador=None):
+    """Predice la nota de varios valores de horas a la vez, con sus intervalos al 95%"""
+    horas = np.asarray(horas, dtype=float)
+    intervalo = reporte.intervalos(horas)
+    metricas.contar('filas_predichas', len(horas))
+    tabla = pd.DataFrame({
+        'Horas': horas,
+        'Nota': nucleos.predecir_recortado(horas, reporte.m, reporte.b),
+        'IC_inf': np.clip(intervalo.confianza_inf, 0, 10),
+        'IC_sup': np.clip(intervalo.confianza_sup, 0, 10),
+        'IP_inf': np.clip(intervalo.prediccion_inf, 0, 10),
+        'IP_sup': np.clip(intervalo.prediccion_sup, 0, 10),
+    })
+    if clasificador is not None:
+        tabla['P_aprobar'] = clasificador.probabilidad_aprobar(horas)
+    return tabla
+
+def entrenar_clasificador(X, y):
+    """Entrena el clasificador logístico de aprobado (nota ≥ 5)"""
+    return RegresionLogistica().fit(X, y)
+
+@metricas.medido('guardado_modelo')
 def guardar_modelo(modelo, nombre_archivo='modelo_notas.pkl'):
     """Guarda el modelo entrenado en un archivo pickle"""
     try:
@@ -125,6 +190,7 @@ def guardar_modelo(modelo, nombre_archivo='modelo_notas.pkl'):
     except Exception as e:
         print(f"❌ Error al guardar el modelo: {e}")
 
+@metricas.medido('carga_modelo')
 def cargar_modelo(nombre_archivo='modelo_notas.pkl'):
     """Carga un modelo previamente guardado"""
     try:
@@ -139,43 +205,252 @@ def cargar_modelo(nombre_archivo='modelo_notas.pkl'):
         print(f"❌ Error al cargar el modelo: {e}")
         return None
 
-def main():
+def main(argv=None):
     """Función principal del programa"""
+    parser = argparse.ArgumentParser(description="IA de predicción de nota a partir de horas de estudio")
+    parser.add_argument('--logistica', action='store_true',
+                        help="estimar también la probabilidad de aprobar con regresión logística")
+    parser.add_argument('--predecir', type=float, nargs='+', metavar='HORAS',
+                        help="predecir por lotes estas horas (con intervalos) y salir")
+    parser.add_argument('--aproximado', metavar='CSV',
+                        help="ajuste aproximado de un CSV grande (columnas Horas y Nota) por muestreo de reservorio")
+    parser.add_argument('--estratos', type=int, default=1,
+                        help="con --aproximado, número de tramos de x para el muestreo estratificado")
+    parser.add_argument('--comprimido', metavar='CSV',
+                        help="ajuste exacto de un CSV con x muy repetida, agrupando las filas por valor de x")
+    parser.add_argument('--por-grupos', nargs=2, metavar=('CSV', 'GRUPO'),
+                        help="una recta por cada valor de la columna GRUPO del CSV (clase, profesor, trimestre...)")
+    parser.add_argument('--multisalida', nargs='+', metavar=('CSV', 'OBJETIVO'),
+                        help="una recta por cada columna OBJETIVO del CSV (p. ej. la nota de cada asignatura), "
+                             "todas con una sola factorización de X")
+    parser.add_argument('--tabla', metavar='RUTA',
+                        help="con --por-grupos o --multisalida, guarda la tabla de rectas en un CSV")
+    parser.add_argument('--columnas', nargs=2, metavar=('X', 'Y'), default=['Horas', 'Nota'],
+                        help="columnas del CSV para --aproximado y --comprimido (por defecto Horas Nota); "
+                             "con --multisalida solo se usa X")
+    parser.add_argument('--exportar-web', nargs='?', const=RUTA_PAGINA_WEB, metavar='RUTA',
+                        help="exporta el modelo como paquete JSON para la página web (por defecto pagina web/modelo.json)")
+    parser.add_argument('--metricas', metavar='RUTA',
+                        help="medir latencias y exportarlas a RUTA (.json o texto de Prometheus)")
+    parser.add_argument('--memoria', metavar='RUTA',
+                        help="perfilar la memoria de cada etapa con tracemalloc y guardar el informe JSON en RUTA")
+    args = parser.parse_args(argv)
+    if args.metricas:
+        metricas.activar()
+    if args.memoria:
+        memoria.activar()
+    try:
+        ejecutar(args)
+    finally:
+        if args.metricas:
+            metricas.exportar(args.metricas)
+            print(f"📈 Métricas exportadas a '{args.metricas}'")
+        if args.memoria:
+            memoria.exportar(args.memoria)
+            memoria.imprimir_resumen()
+            print(f"🧠 Perfil de memoria exportado a '{args.memoria}'")
+
+def ajustar_comprimido(nombre_archivo, columna_x='Horas', columna_y='Nota'):
+    """Ajusta un CSV agrupando las filas con la misma x; la compresión se guarda junto al CSV y se reutiliza"""
+    ruta_comprimido = f"{nombre_archivo}.{columna_x}.{columna_y}.npz"
+    if os.path.exists(ruta_comprimido) and os.path.getmtime(ruta_comprimido) >= os.path.getmtime(nombre_archivo):
+        datos = DatosComprimidos.cargar(ruta_comprimido)
+        print(f"♻️  Usando la compresión guardada en '{ruta_comprimido}'")
+    else:
+        print(f"📥 Comprimiendo '{nombre_archivo}' por valores de {columna_x}...")
+        datos = DatosComprimidos.desde_csv(nombre_archivo, columna_x, columna_y)
+        datos.guardar(ruta_comprimido)
+    
+    modelo = datos.ajustar()
+    m, b = modelo.coef_[0], modelo.intercept_
+    diagnosticos = datos.diagnosticos(m, b)
+    print("=" * 50)
+    print(f"{datos.n} filas agrupadas en {len(datos.x)} valores distintos de {columna_x}")
+    print(f"Ecuación: y = {m:.4f}·x + {b:.4f}")
+    print(f"Coeficiente de determinación R²: {datos.r2(m, b):.4f}")
+    for g in np.flatnonzero(diagnosticos.influyentes):
+        print(f"🎯 Grupo influyente {columna_x} = {datos.x[g]:g} ({datos.conteo[g]} filas): "
+              f"Cook = {diagnosticos.cook[g]:.3f}")
+    print("=" * 50)
+    
+    # Un marcador por grupo, con área proporcional al número de filas
+    plt.figure(figsize=(10, 6))
+    datos.dibujar(plt.gca(), label=f'Media de {columna_y} por grupo (tamaño ∝ filas)')
+    X_line = np.linspace(datos.x.min() - 0.5, datos.x.max() + 0.5, 100)
+    plt.plot(X_line, m * X_line + b, color='red', linewidth=2, label=f'y = {m:.3f}x + {b:.3f}')
+    plt.xlabel(columna_x, fontsize=12)
+    plt.ylabel(columna_y, fontsize=12)
+    plt.title(f'{columna_y} vs {columna_x} ({datos.n} filas)', fontsize=14, fontweight='bold')
+    plt.grid(True, alpha=0.3)
+    plt.legend()
+    plt.tight_layout()
+    plt.show()
+    return modelo
+
+def ajustar_por_grupos(nombre_archivo, columna_grupo, columna_x='Horas', columna_y='Nota', ruta_tabla=None):
+    """Ajusta una recta por grupo y muestra (o guarda) la tabla de resultados"""
+    df = pd.read_csv(nombre_archivo, usecols=[columna_grupo, columna_x, columna_y])
+    filas_leidas = len(df)
+    df = df.dropna()
+    if len(df) < filas_leidas:
+        print(f"⚠️  Se descartan {filas_leidas - len(df)} filas con celdas vacías")
+    modelo, reutilizado = entrenar_por_grupos(df[columna_grupo].values, df[columna_x].values,
+                                              df[columna_y].values, RegistroModelos())
+    if reutilizado:
+        print("♻️  Modelos por grupo recuperados del registro (mismos datos de entrenamiento)")
+    
+    tabla = modelo.tabla().rename(columns={'Grupo': columna_grupo})
+    m, b = modelo.modelo_global_.coef_[0], modelo.modelo_global_.intercept_
+    print("=" * 50)
+    print(f"{len(tabla)} grupos de '{columna_grupo}' ({len(df)} filas)")
+    print(f"Ajuste global: y = {m:.3f}·x + {b:.3f}")
+    print("=" * 50)
+    print(tabla.head(20).to_string(index=False, float_format='%.3f'))
+    if len(tabla) > 20:
+        print(f"... ({len(tabla) - 20} grupos más)")
+    if ruta_tabla:
+        tabla.to_csv(ruta_tabla, index=False)
+        print(f"💾 Tabla guardada en '{ruta_tabla}'")
+    return modelo
+
+def ajustar_multisalida(nombre_archivo, objetivos, columna_x='Horas', horas=None, ruta_tabla=None):
+    """Ajusta una recta por columna objetivo leyendo el CSV por bloques, y predice todas a la vez"""
+    print(f"📥 Leyendo '{nombre_archivo}' ({len(objetivos)} objetivos con las mismas {columna_x})...")
+    modelo = ajustar_csv(nombre_archivo, [columna_x], objetivos)
+    tabla = pd.DataFrame({
+        'Objetivo': objetivos,
+        'Pendiente': modelo.coef_[:, 0],
+        'Intercepto': modelo.intercept_,
+        'R2': modelo.r2_,
+    })
+    print("=" * 50)
+    print(f"{len(objetivos)} objetivos ({modelo.n_} filas)")
+    print("=" * 50)
+    print(tabla.head(20).to_string(index=False, float_format='%.3f'))
+    if len(tabla) > 20:
+        print(f"... ({len(tabla) - 20} objetivos más)")
+    if horas:
+        predicciones = np.clip(modelo.predict(np.asarray(horas, dtype=float)), 0, 10)
+        print(f"\n📈 Predicciones ({columna_x} → cada objetivo):")
+        print(pd.DataFrame(predicciones, index=pd.Index(horas, name=columna_x), columns=objetivos)
+              .to_string(float_format='%.2f'))
+    if ruta_tabla:
+        tabla.to_csv(ruta_tabla, index=False)
+        print(f"💾 Tabla guardada en '{ruta_tabla}'")
+    return modelo
+
+def ajustar_aproximado(nombre_archivo, estratos=1, columna_x='Horas', columna_y='Nota'):
+    """Ajusta un CSV grande con una muestra de reservorio, mostrando la estimación según avanza"""
+    print(f"📥 Leyendo '{nombre_archivo}' (ajuste aproximado con muestreo de reservorio)...")
+    
+    def al_refinar(e):
+        print(f"   ⏳ {e.n_visto:>10d} filas: y ≈ {e.pendiente:.4f}x + {e.intercepto:.4f} "
+              f"(m ∈ [{e.ic_pendiente[0]:.4f}, {e.ic_pendiente[1]:.4f}]), R² ≈ {e.r2:.4f}")
+    
+    reservorio = ReservorioRegresion(estratos=estratos)
+    estimacion = reservorio.procesar(bloques_csv(nombre_archivo, columna_x, columna_y),
+                                     al_refinar=al_refinar, cada_segundos=0.5)
+    
+    print("=" * 50)
+    print(f"Ecuación aproximada: y = {estimacion.pendiente:.4f}·x + {estimacion.intercepto:.4f}")
+    print(f"Pendiente 95%: [{estimacion.ic_pendiente[0]:.4f}, {estimacion.ic_pendiente[1]:.4f}]")
+    print(f"Intercepto 95%: [{estimacion.ic_intercepto[0]:.4f}, {estimacion.ic_intercepto[1]:.4f}]")
+    print(f"R² 95%: [{estimacion.ic_r2[0]:.4f}, {estimacion.ic_r2[1]:.4f}]")
+    print("=" * 50)
+    
+    x, y, _ = reservorio.muestra()
+    modelo = ModeloManual(estimacion.pendiente, estimacion.intercepto)
+    graficar_resultados(ReporteAjuste(modelo, x.reshape(-1, 1), y), estimacion)
+    return estimacion
+
+def ejecutar(args):
+    """Entrena (o carga) el modelo y atiende las predicciones"""
+    if args.aproximado:
+        with memoria.etapa('ajuste_aproximado'):
+            ajustar_aproximado(args.aproximado, args.estratos, *args.columnas)
+        return
+    if args.comprimido:
+        with memoria.etapa('ajuste_comprimido'):
+            ajustar_comprimido(args.comprimido, *args.columnas)
+        return
+    if args.por_grupos:
+        with memoria.etapa('ajuste_por_grupos'):
+            ajustar_por_grupos(*args.por_grupos, *args.columnas, ruta_tabla=args.tabla)
+        return
+    if args.multisalida:
+        if len(args.multisalida) < 2:
+            print("❌ --multisalida necesita el CSV y al menos una columna objetivo")
+            return
+        with memoria.etapa('ajuste_multisalida'):
+            ajustar_multisalida(args.multisalida[0], args.multisalida[1:], args.columnas[0],
+                                args.predecir, ruta_tabla=args.tabla)
+        return
+    
     print("🎓 IA DE PREDICCIÓN DE NOTA A PARTIR DE HORAS DE ESTUDIO")
     print("=" * 60)
     
-    # Intentar cargar modelo existente
+    # Crear datos de ejemplo
+    with memoria.etapa('datos'):
+        df = crear_datos_ejemplo()
+        X = df['Horas'].values.reshape(-1, 1)
+        y = df['Nota'].values
+    
+    # Intentar cargar modelo existente y comprobar que corresponde a estos datos
+    registro = RegistroModelos()
+    clave = registro.clave(X, y, 'sklearn')
     modelo = cargar_modelo()
+    if modelo is not None and not registro.es_vigente(modelo, clave):
+        print("⚠️  El modelo guardado se entrenó con otros datos. Se descarta.")
+        modelo = None
     
     if modelo is None:
-        # Crear datos de ejemplo
         print("\n📊 Creando conjunto de datos de ejemplo...")
-        df = crear_datos_ejemplo()
-        
         print("Datos de entrenamiento:")
         print(df.to_string(index=False))
         
-        # Separar variables
-        X = df['Horas'].values.reshape(-1, 1)
-        y = df['Nota'].values
-        
-        # Entrenar modelo
-        print("\n🤖 Entrenando modelo de regresión lineal...")
-        modelo = entrenar_modelo(X, y)
+        # Entrenar modelo (o reutilizar el del registro si los datos no han cambiado)
+        with memoria.etapa('entrenamiento'):
+            modelo, reutilizado = registro.obtener_o_entrenar(X, y, 'sklearn', entrenar_modelo)
+        if reutilizado:
+            print("\n♻️  Modelo recuperado del registro (mismos datos de entrenamiento)")
+        else:
+            print("\n🤖 Entrenando modelo de regresión lineal...")
         
         # Mostrar resultados
-        m, b, r2 = mostrar_resultados(modelo, X, y)
+        with memoria.etapa('reporte'):
+            reporte = ReporteAjuste(modelo, X, y)
+            mostrar_resultados(reporte)
         
         # Graficar resultados
         print("\n📈 Generando gráfica...")
-        graficar_resultados(X, y, modelo, m, b)
+        graficar_resultados(reporte)
         
         # Guardar modelo
         guardar_modelo(modelo)
+    else:
+        reporte = ReporteAjuste(modelo, X, y)
+    
+    if args.exportar_web:
+        exportar_paquete(X, y, modelo, 'sklearn', args.exportar_web)
+        print(f"\n🌐 Paquete para la página web guardado en '{args.exportar_web}'")
+    
+    # Clasificador aprobado/suspenso (opcional)
+    clasificador = None
+    if args.logistica:
+        clasificador, _ = registro.obtener_o_entrenar(X, y, 'logistica', entrenar_clasificador)
+        print(f"\n🎯 Clasificador logístico: P(aprobar) = σ({clasificador.coef_[0]:.3f}·x + {clasificador.intercept_:.3f})")
+    
+    # Predicción por lotes desde la línea de comandos
+    if args.predecir:
+        print("\n📋 Predicciones (IC: intervalo de confianza, IP: intervalo de predicción, 95%)")
+        with memoria.etapa('prediccion_lote'):
+            tabla = predecir_lote(reporte, args.predecir, clasificador)
+        print(tabla.to_string(index=False, float_format='%.2f'))
+        return
     
     # Realizar predicciones
     while True:
-        predecir_nota(modelo)
+        predecir_nota(modelo, clasificador, reporte)
         
         continuar = input("\n¿Deseas hacer otra predicción? (s/n): ").lower()
         if continuar not in ['s', 'si', 'sí', 'y', 'yes']:
@@ -0,0 +1,233 @@
+import atexit
+import functools
+import json
+import os
+import platform
+import sys
+import tracemalloc
+from contextlib import nullcontext
+
+import numpy as np
+
+# Dominio de tracemalloc en el que NumPy registra los buffers de datos de sus arrays
+DOMINIO_NUMPY = 389047
+
+_activo = False
+_max_sitios = 10
+_pila = []
+_etapas = {}
+_pico_global = 0
+_NULO = nullcontext()
+_RAIZ = os.path.dirname(os.path.abspath(__file__))
+_STDLIB = os.path.dirname(os.__file__)
+_FILTROS = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, __file__),
+    tracemalloc.Filter(False, '<frozen importlib._bootstrap*>'),
+    tracemalloc.Filter(False, '<unknown>'),
+)
+
+def activar(max_sitios=10):
+    """Empieza a perfilar la memoria de las etapas (desde cero).
+
+    Desactivado, cada etapa solo comprueba un booleano y tracemalloc no se arranca.
+    """
+    global _activo, _max_sitios, _pico_global
+    _max_sitios = max_sitios
+    _etapas.clear()
+    _pico_global = 0
+    if not tracemalloc.is_tracing():
+        tracemalloc.start()
+    _activo = True
+
+def desactivar():
+    global _activo
+    _activo = False
+    _pila.clear()
+    tracemalloc.stop()
+
+def activo():
+    return _activo
+
+def _sitio(traza):
+    """'archivo:línea' relativo al proyecto, a site-packages o a la biblioteca estándar, para comparar informes de distintas máquinas"""
+    marco = traza.traceback[0]
+    nombre = marco.filename
+    if nombre.startswith(_RAIZ + os.sep):
+        nombre = os.path.relpath(nombre, _RAIZ)
+    elif 'site-packages' in nombre:
+        nombre = nombre.split('site-packages' + os.sep, 1)[1]
+    elif nombre.startswith(_STDLIB + os.sep):
+        nombre = os.path.join('<stdlib>', os.path.relpath(nombre, _STDLIB))
+    return f"{nombre}:{marco.lineno}"
+
+def _sitios(diferencias):
+    """Sitios con más memoria nueva al final de la etapa"""
+    crecientes = [d for d in diferencias if d.size_diff > 0][:_max_sitios]
+    return [{'sitio': _sitio(d), 'bytes': d.size_diff, 'bloques': d.count_diff} for d in crecientes]
+
+def _propagar(pico):
+    """Lleva el pico observado a todas las etapas abiertas.
+
+    Las instantáneas de las etapas interiores siguen vivas durante ellas; su
+    tamaño se descuenta del pico de las exteriores.
+    """
+    global _pico_global
+    coste_interior = 0
+    for etapa in reversed(_pila):
+        etapa.pico = max(etapa.pico, pico - coste_interior)
+        coste_interior += etapa.coste
+    _pico_global = max(_pico_global, pico - coste_interior)
+
+class _Etapa:
+    __slots__ = ('nombre', 'inicial', 'coste', 'inicio', 'pico')
+
+    def __init__(self, nombre):
+        self.nombre = nombre
+
+    def __enter__(self):
+        _propagar(tracemalloc.get_traced_memory()[1])
+        antes = tracemalloc.get_traced_memory()[0]
+        self.inicial = tracemalloc.take_snapshot().filter_traces(_FILTROS)
+        self.coste = tracemalloc.get_traced_memory()[0] - antes
+        _pila.append(self)
+        tracemalloc.reset_peak()
+        self.inicio = self.pico = tracemalloc.get_traced_memory()[0]
+        return self
+
+    def __exit__(self, *exc):
+        actual, pico = tracemalloc.get_traced_memory()
+        _propagar(pico)
+        _pila.pop()
+        final = tracemalloc.take_snapshot().filter_traces(_FILTROS)
+        filtro_numpy = (tracemalloc.DomainFilter(True, DOMINIO_NUMPY),)
+        diferencias_numpy = final.filter_traces(filtro_numpy).compare_to(
+            self.inicial.filter_traces(filtro_numpy), 'lineno')
+        llamada = {
+            'pico_bytes': self.pico - self.inicio,
+            'neto_bytes': actual - self.inicio,
+            'arrays_numpy': sum(d.count_diff for d in diferencias_numpy),
+            'bytes_numpy': sum(d.size_diff for d in diferencias_numpy),
+        }
+        resumen = _etapas.get(self.nombre)
+        if resumen is None or llamada['pico_bytes'] > resumen['pico_bytes']:
+            # Los sitios se guardan de la llamada con mayor pico
+            llamada['sitios'] = _sitios(final.compare_to(self.inicial, 'lineno'))
+            llamada['copias_numpy'] = _sitios(diferencias_numpy)
+        del final, diferencias_numpy, self.inicial
+        _registrar(self.nombre, llamada)
+        tracemalloc.reset_peak()
+        return False
+
+def _registrar(nombre, llamada):
+    resumen = _etapas.get(nombre)
+    if resumen is None:
+        _etapas[nombre] = dict(llamada, llamadas=1)
+        return
+    resumen['llamadas'] += 1
+    for clave in ('neto_bytes', 'arrays_numpy', 'bytes_numpy'):
+        resumen[clave] += llamada[clave]
+    if 'sitios' in llamada:
+        resumen.update(pico_bytes=llamada['pico_bytes'], sitios=llamada['sitios'],
+                       copias_numpy=llamada['copias_numpy'])
+
+def etapa(nombre):
+    """Context manager que perfila la memoria de un bloque; si el modo está desactivado no hace nada
+
+    Por etapa se acumulan: pico (sobre la memoria al entrar), memoria neta que
+    queda al salir, arrays de NumPy nuevos que siguen vivos y los sitios
+    (archivo:línea) que más memoria nueva dejan. Las etapas se pueden anidar.
+    """
+    if not _activo:
+        return _NULO
+    return _Etapa(nombre)
+
+def perfilado(nombre):
+    """Decorador que perfila cada llamada a la función como la etapa `nombre`"""
+    def decorador(funcion):
+        @functools.wraps(funcion)
+        def envoltura(*args, **kwargs):
+            with etapa(nombre):
+                return funcion(*args, **kwargs)
+        return envoltura
+    return decorador
+
+def informe():
+    """Diccionario con el perfil de todas las etapas, con claves estables para comparar ejecuciones"""
+    pico_actual = tracemalloc.get_traced_memory()[1] if tracemalloc.is_tracing() else 0
+    return {
+        'version': 1,
+        'entorno': {'python': platform.python_version(), 'numpy': np.__version__,
+                    'argv': [os.path.basename(sys.argv[0])] + sys.argv[1:]},
+        'pico_total_bytes': max(_pico_global, pico_actual),
+        'etapas': {nombre: {clave: e[clave] for clave in ('llamadas', 'pico_bytes', 'neto_bytes', 'arrays_numpy',
+                                                         'bytes_numpy', 'sitios', 'copias_numpy')}
+                   for nombre, e in sorted(_etapas.items())},
+    }
+
+def exportar(ruta):
+    """Escribe el informe en JSON en `ruta`"""
+    contenido = json.dumps(informe(), indent=2, ensure_ascii=False)
+    temporal = ruta + '.tmp'
+    with open(temporal, 'w', encoding='utf-8') as f:
+        f.write(contenido)
+    os.replace(temporal, ruta)
+    return ruta
+
+def _mb(bytes_):
+    return f"{bytes_ / 2 ** 20:9.2f} MB"
+
+def imprimir_resumen(datos=None):
+    """Tabla por etapa ordenada por pico, con el sitio que más memoria deja en cada una"""
+    datos = datos or informe()
+    print(f"🧠 Pico de memoria total: {_mb(datos['pico_total_bytes']).strip()}")
+    print(f"{'Etapa':<24}{'Llamadas':>9}{'Pico':>13}{'Neto':>13}{'Arrays':>8}  Sitio principal")
+    etapas = sorted(datos['etapas'].items(), key=lambda e: -e[1]['pico_bytes'])
+    for nombre, e in etapas:
+        sitio = e['sitios'][0]['sitio'] if e['sitios'] else '-'
+        print(f"{nombre:<24}{e['llamadas']:>9}{_mb(e['pico_bytes']):>13}{_mb(e['neto_bytes']):>13}"
+              f"{e['arrays_numpy']:>8}  {sitio}")
+
+def comparar(anterior, actual):
+    """Filas (etapa, pico anterior, pico actual, diferencia) de dos informes cargados con json"""
+    nombres = sorted(set(anterior['etapas']) | set(actual['etapas']))
+    filas = []
+    for nombre in nombres:
+        a = anterior['etapas'].get(nombre, {}).get('pico_bytes')
+        b = actual['etapas'].get(nombre, {}).get('pico_bytes')
+        filas.append((nombre, a, b, None if a is None or b is None else b - a))
+    return filas
+
+def _exportar_al_salir(ruta):
+    try:
+        exportar(ruta)
+        imprimir_resumen()
+    except OSError as e:
+        print(f"❌ Error al exportar el perfil de memoria: {e}")
+
+def main(argv=None):
+    """Compara dos informes de memoria: python memoria.py anterior.json actual.json"""
+    import argparse
+    parser = argparse.ArgumentParser(description="Compara el pico de memoria por etapa de dos informes")
+    parser.add_argument('anterior')
+    parser.add_argument('actual')
+    args = parser.parse_args(argv)
+    with open(args.anterior, encoding='utf-8') as f:
+        anterior = json.load(f)
+    with open(args.actual, encoding='utf-8') as f:
+        actual = json.load(f)
+
+    def formato(valor):
+        return f"{'-':>13}" if valor is None else _mb(valor).rjust(13)
+
+    print(f"{'Etapa':<24}{'Anterior':>13}{'Actual':>13}{'Diferencia':>13}")
+    for nombre, a, b, diferencia in comparar(anterior, actual):
+        print(f"{nombre:<24}{formato(a)}{formato(b)}{formato(diferencia)}")
+
+# IA_LINEAL_MEMORIA=<ruta> activa el perfil de memoria y lo exporta a esa ruta al terminar el programa
+if os.environ.get('IA_LINEAL_MEMORIA'):
+    activar()
+    atexit.register(_exportar_al_salir, os.environ['IA_LINEAL_MEMORIA'])
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,186 @@
+import atexit
+import bisect
+import functools
+import json
+import os
+import threading
+import time
+from contextlib import nullcontext
+
+# Límites superiores (segundos) de los buckets fijos de los histogramas
+LIMITES = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025,
+           0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, float('inf'))
+
+_activo = False
+_inicio = None
+_histogramas = {}
+_contadores = {}
+_cerrojo = threading.Lock()
+_NULO = nullcontext()
+
+class Histograma:
+    """Histograma de latencias con buckets fijos: observar es O(log buckets) y no guarda muestras"""
+    def __init__(self, limites=LIMITES):
+        self.limites = limites
+        self.conteos = [0] * len(limites)
+        self.suma = 0.0
+        self.total = 0
+
+    def observar(self, segundos):
+        self.conteos[bisect.bisect_left(self.limites, segundos)] += 1
+        self.suma += segundos
+        self.total += 1
+
+    def cuantil(self, q):
+        """Cuantil aproximado interpolando dentro del bucket, como histogram_quantile de Prometheus"""
+        if self.total == 0:
+            return float('nan')
+        objetivo = q * self.total
+        acumulado = 0
+        for i, conteo in enumerate(self.conteos):
+            if acumulado + conteo >= objetivo and conteo > 0:
+                inferior = self.limites[i - 1] if i > 0 else 0.0
+                superior = self.limites[i]
+                if superior == float('inf'):
+                    return inferior
+                return inferior + (superior - inferior) * (objetivo - acumulado) / conteo
+            acumulado += conteo
+        return self.limites[-2]
+
+def activar():
+    """Empieza a registrar métricas (desde cero).
+
+    Desactivadas, cada punto instrumentado solo comprueba un booleano.
+    """
+    global _activo
+    reiniciar()
+    _activo = True
+
+def desactivar():
+    global _activo
+    _activo = False
+
+def activo():
+    return _activo
+
+def reiniciar():
+    global _inicio
+    with _cerrojo:
+        _histogramas.clear()
+        _contadores.clear()
+    _inicio = time.perf_counter()
+
+def observar(nombre, segundos):
+    """Añade una latencia al histograma `nombre`"""
+    if not _activo:
+        return
+    with _cerrojo:
+        histograma = _histogramas.get(nombre)
+        if histograma is None:
+            histograma = _histogramas[nombre] = Histograma()
+        histograma.observar(segundos)
+
+def contar(nombre, cantidad=1):
+    """Suma `cantidad` al contador `nombre` (p. ej. filas predichas)"""
+    if not _activo:
+        return
+    with _cerrojo:
+        _contadores[nombre] = _contadores.get(nombre, 0) + cantidad
+
+class _Cronometro:
+    __slots__ = ('nombre', 'inicio')
+
+    def __init__(self, nombre):
+        self.nombre = nombre
+
+    def __enter__(self):
+        self.inicio = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        observar(self.nombre, time.perf_counter() - self.inicio)
+        return False
+
+def cronometro(nombre):
+    """Context manager que mide un bloque; si las métricas están desactivadas no hace nada"""
+    if not _activo:
+        return _NULO
+    return _Cronometro(nombre)
+
+def medido(nombre):
+    """Decorador que mide cada llamada a la función con el histograma `nombre`"""
+    def decorador(funcion):
+        @functools.wraps(funcion)
+        def envoltura(*args, **kwargs):
+            if not _activo:
+                return funcion(*args, **kwargs)
+            inicio = time.perf_counter()
+            try:
+                return funcion(*args, **kwargs)
+            finally:
+                observar(nombre, time.perf_counter() - inicio)
+        return envoltura
+    return decorador
+
+def instantanea():
+    """Diccionario con recuentos, latencias p50/p90/p99, media y ritmo por segundo"""
+    with _cerrojo:
+        duracion = time.perf_counter() - _inicio if _inicio is not None else 0.0
+        resultado = {'duracion_segundos': duracion, 'histogramas': {}, 'contadores': dict(_contadores)}
+        for nombre, h in sorted(_histogramas.items()):
+            resultado['histogramas'][nombre] = {
+                'total': h.total,
+                'suma_segundos': h.suma,
+                'media_segundos': h.suma / h.total if h.total else float('nan'),
+                'p50_segundos': h.cuantil(0.50),
+                'p90_segundos': h.cuantil(0.90),
+                'p99_segundos': h.cuantil(0.99),
+                'por_segundo': h.total / duracion if duracion > 0 else float('nan'),
+                'buckets': {_formatear_limite(limite): conteo for limite, conteo in zip(h.limites, h.conteos)},
+            }
+    return resultado
+
+def _formatear_limite(limite):
+    return '+Inf' if limite == float('inf') else repr(limite)
+
+def texto_prometheus(prefijo='ia_lineal'):
+    """Métricas en el formato de texto de Prometheus (buckets acumulados)"""
+    lineas = []
+    with _cerrojo:
+        for nombre, h in sorted(_histogramas.items()):
+            metrica = f"{prefijo}_{nombre}_segundos"
+            lineas.append(f"# TYPE {metrica} histogram")
+            acumulado = 0
+            for limite, conteo in zip(h.limites, h.conteos):
+                acumulado += conteo
+                lineas.append(f'{metrica}_bucket{{le="{_formatear_limite(limite)}"}} {acumulado}')
+            lineas.append(f"{metrica}_sum {h.suma!r}")
+            lineas.append(f"{metrica}_count {h.total}")
+        for nombre, valor in sorted(_contadores.items()):
+            metrica = f"{prefijo}_{nombre}_total"
+            lineas.append(f"# TYPE {metrica} counter")
+            lineas.append(f"{metrica} {valor}")
+    return "\n".join(lineas) + "\n"
+
+def exportar(ruta):
+    """Escribe las métricas en `ruta`: JSON si termina en .json, Prometheus en otro caso"""
+    if ruta.endswith('.json'):
+        contenido = json.dumps(instantanea(), indent=2, ensure_ascii=False)
+    else:
+        contenido = texto_prometheus()
+    temporal = ruta + '.tmp'
+    with open(temporal, 'w', encoding='utf-8') as f:
+        f.write(contenido)
+    os.replace(temporal, ruta)
+    return ruta
+
+def _exportar_al_salir(ruta):
+    try:
+        exportar(ruta)
+    except OSError as e:
+        print(f"❌ Error al exportar métricas: {e}")
+
+# IA_LINEAL_METRICAS=<ruta> activa las métricas y las exporta a esa ruta al terminar el programa
+if os.environ.get('IA_LINEAL_METRICAS'):
+    activar()
+    atexit.register(_exportar_al_salir, os.environ['IA_LINEAL_METRICAS'])
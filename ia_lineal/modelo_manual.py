@@ -0,0 +1,25 @@
+import numpy as np
+import metricas
+import nucleos
+
+class ModeloManual:
+    """Modelo lineal con la misma interfaz que sklearn (coef_, intercept_, predict)"""
+    def __init__(self, coef, intercept):
+        self.coef_ = np.array([coef])
+        self.intercept_ = intercept
+
+    @metricas.medido('prediccion_manual')
+    def predict(self, X):
+        return self.coef_[0] * X + self.intercept_
+
+@metricas.medido('entrenamiento_manual')
+def entrenar_modelo_manual(X, y):
+    """Entrena el modelo de regresión lineal manualmente (núcleo fusionado, ver nucleos.py)"""
+    # m = Σ((x-x_mean)(y-y_mean)) / Σ((x-x_mean)²), b = y_mean - m * x_mean
+    # (m = 0 si todas las x son iguales)
+    m, b = nucleos.ajustar_recta(X, y)
+    return ModeloManual(m, b)
+
+def calcular_r2_manual(y_true, y_pred):
+    """Calcula R² = 1 - SS_res / SS_tot en una sola pasada (1.0 si no hay variación)"""
+    return nucleos.r2(y_true, y_pred)
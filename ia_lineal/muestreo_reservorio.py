@@ -0,0 +1,168 @@
+from collections import namedtuple
+import time
+import numpy as np
+import pandas as pd
+from scipy import stats
+
+EstimacionAproximada = namedtuple('EstimacionAproximada', [
+    'n_visto', 'n_muestra',
+    'pendiente', 'intercepto', 'r2',
+    'ic_pendiente', 'ic_intercepto', 'ic_r2',   # (inferior, superior) respecto al ajuste con todos los datos
+])
+
+def _estimar(x, y, estratos, vistos, n_visto, nivel=0.95):
+    """Ajuste ponderado sobre la muestra e intervalos por linealización (funciones de influencia).
+
+    Cada punto del estrato h pesa N_h / n_h. La varianza de cada estimador es
+    Σ_h (N_h/N)² · (1 - n_h/N_h) · Var_h(influencia) / n_h, que incluye la
+    corrección por población finita: con toda la población muestreada el
+    intervalo se reduce a un punto.
+    """
+    muestreados = np.bincount(estratos, minlength=len(vistos))
+    pesos = (vistos / np.maximum(muestreados, 1))[estratos]
+    total = pesos.sum()
+    x_media = np.dot(pesos, x) / total
+    y_media = np.dot(pesos, y) / total
+    dx = x - x_media
+    dy = y - y_media
+    s_xx = np.dot(pesos, dx * dx) / total
+    s_xy = np.dot(pesos, dx * dy) / total
+    s_yy = np.dot(pesos, dy * dy) / total
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        pendiente = s_xy / s_xx if s_xx > 0 else 0.0
+        intercepto = y_media - pendiente * x_media
+        r2 = s_xy * s_xy / (s_xx * s_yy) if s_yy > 0 else 1.0
+
+        residuos = dy - pendiente * dx
+        influencia_m = dx * residuos / s_xx
+        influencia_b = residuos - x_media * influencia_m
+        influencia_r2 = r2 * (2 * (dx * dy - s_xy) / s_xy - (dx * dx - s_xx) / s_xx - (dy * dy - s_yy) / s_yy)
+    influencias = np.nan_to_num(np.vstack([influencia_m, influencia_b, influencia_r2]))
+
+    varianzas = np.zeros(3)
+    for h in np.flatnonzero(muestreados > 1):
+        en_h = estratos == h
+        fraccion = vistos[h] / n_visto
+        correccion = 1.0 - muestreados[h] / vistos[h]
+        varianzas += fraccion ** 2 * correccion * influencias[:, en_h].var(axis=1, ddof=1) / muestreados[h]
+
+    z = stats.norm.ppf(0.5 + nivel / 2)
+    mitad = z * np.sqrt(varianzas)
+    pendiente, intercepto, r2 = float(pendiente), float(intercepto), float(r2)
+    return EstimacionAproximada(
+        int(n_visto), len(x), pendiente, intercepto, r2,
+        (pendiente - mitad[0], pendiente + mitad[0]),
+        (intercepto - mitad[1], intercepto + mitad[1]),
+        (max(r2 - mitad[2], 0.0), min(r2 + mitad[2], 1.0)),
+    )
+
+class ReservorioRegresion:
+    """Ajuste aproximado a partir de una muestra de tamaño fijo tomada en una sola pasada.
+
+    Con estratos=1 es un muestreo de reservorio uniforme (algoritmo R,
+    vectorizado por bloques). Con estratos=k el rango de x se divide en k
+    tramos iguales y cada uno guarda su propio reservorio de capacidad/k,
+    así los valores extremos de x, que son los que más informan sobre la
+    pendiente, no se pierden. Si no se da rango_x se toma el del primer bloque;
+    los valores fuera de él van al tramo más cercano.
+    """
+    def __init__(self, capacidad=10_000, estratos=1, rango_x=None, semilla=42):
+        self.estratos = estratos
+        self.capacidad_estrato = max(capacidad // estratos, 2)
+        self.rango_x = rango_x
+        self.rng = np.random.RandomState(semilla)
+        self.x = np.empty((estratos, self.capacidad_estrato))
+        self.y = np.empty((estratos, self.capacidad_estrato))
+        self.vistos = np.zeros(estratos, dtype=np.int64)
+        self.n_visto = 0
+
+    def _estrato(self, x):
+        if self.estratos == 1:
+            return np.zeros(len(x), dtype=int)
+        if self.rango_x is None:
+            self.rango_x = (float(np.min(x)), float(np.max(x)))
+        minimo, maximo = self.rango_x
+        ancho = (maximo - minimo) / self.estratos or 1.0
+        return np.clip(((x - minimo) / ancho).astype(int), 0, self.estratos - 1)
+
+    def agregar(self, x, y):
+        """Procesa un bloque de datos (arrays)"""
+        x = np.asarray(x, dtype=float).ravel()
+        y = np.asarray(y, dtype=float).ravel()
+        if len(x) == 0:
+            return self
+        estratos = self._estrato(x)
+        for h in range(self.estratos):
+            en_h = estratos == h if self.estratos > 1 else slice(None)
+            self._agregar_estrato(h, x[en_h], y[en_h])
+        self.n_visto += len(x)
+        return self
+
+    def _agregar_estrato(self, h, x, y):
+        """Algoritmo R: el elemento número g (desde 0) entra con probabilidad capacidad / (g + 1)"""
+        capacidad = self.capacidad_estrato
+        visto = self.vistos[h]
+        # Mientras el reservorio no está lleno, todo entra
+        directos = int(min(max(capacidad - visto, 0), len(x)))
+        self.x[h, visto:visto + directos] = x[:directos]
+        self.y[h, visto:visto + directos] = y[:directos]
+
+        resto = len(x) - directos
+        if resto > 0:
+            posiciones = visto + directos + np.arange(resto)
+            huecos = (self.rng.random_sample(resto) * (posiciones + 1)).astype(np.int64)
+            entran = np.flatnonzero(huecos < capacidad)
+            if len(entran):
+                # Si un hueco se reemplaza varias veces en el bloque, queda el último
+                huecos_entran = huecos[entran]
+                _, primeros_desde_el_final = np.unique(huecos_entran[::-1], return_index=True)
+                ultimos = entran[len(entran) - 1 - primeros_desde_el_final]
+                self.x[h, huecos[ultimos]] = x[directos + ultimos]
+                self.y[h, huecos[ultimos]] = y[directos + ultimos]
+        self.vistos[h] = visto + len(x)
+
+    def muestra(self):
+        """(x, y, estrato de cada punto) de la muestra actual"""
+        llenos = np.minimum(self.vistos, self.capacidad_estrato)
+        x = np.concatenate([self.x[h, :llenos[h]] for h in range(self.estratos)])
+        y = np.concatenate([self.y[h, :llenos[h]] for h in range(self.estratos)])
+        estratos = np.repeat(np.arange(self.estratos), llenos)
+        return x, y, estratos
+
+    def estimacion(self, nivel=0.95):
+        """Ajuste sobre la muestra con intervalos respecto al ajuste exacto con todo lo visto"""
+        x, y, estratos = self.muestra()
+        return _estimar(x, y, estratos, self.vistos, self.n_visto, nivel)
+
+    def procesar(self, bloques, al_refinar=None, cada_segundos=0.05):
+        """Consume un iterable de bloques (x, y) llamando a al_refinar(estimacion) cada cierto tiempo"""
+        ultimo = time.perf_counter()
+        for x, y in bloques:
+            self.agregar(x, y)
+            if al_refinar is not None and time.perf_counter() - ultimo >= cada_segundos:
+                al_refinar(self.estimacion())
+                ultimo = time.perf_counter()
+        estimacion = self.estimacion()
+        if al_refinar is not None:
+            al_refinar(estimacion)
+        return estimacion
+
+def bloques_csv(nombre_archivo, columna_x='Horas', columna_y='Nota', tamano_bloque=100_000):
+    """Lee un CSV por bloques y devuelve pares (x, y)"""
+    for bloque in pd.read_csv(nombre_archivo, usecols=[columna_x, columna_y], chunksize=tamano_bloque):
+        yield bloque[columna_x].to_numpy(dtype=float), bloque[columna_y].to_numpy(dtype=float)
+
+def estimar_en_memoria(x, y, tamano=10_000, semilla=42, nivel=0.95):
+    """Estimación rápida sobre arrays ya cargados: muestra aleatoria simple sin reemplazo de `tamano` puntos"""
+    x = np.asarray(x, dtype=float).ravel()
+    y = np.asarray(y, dtype=float).ravel()
+    n = len(x)
+    if n <= tamano:
+        indices = np.arange(n)
+    else:
+        # Sin reemplazo, como supone la corrección por población finita de _estimar
+        # (Generator.choice lo hace en O(tamano) cuando la muestra es pequeña frente a n)
+        indices = np.random.default_rng(semilla).choice(n, tamano, replace=False)
+    return _estimar(x[indices], y[indices], np.zeros(len(indices), dtype=int),
+                    np.array([n]), n, nivel)
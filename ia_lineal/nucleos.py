@@ -0,0 +1,182 @@
+import os
+import warnings
+import numpy as np
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
+# --- Implementación NumPy (siempre disponible) ---
+# Cada núcleo crea como mucho un array temporal del tamaño de los datos y
+# reduce con productos escalares en lugar de elevar al cuadrado y sumar.
+
+def _ajustar_recta_numpy(x, y):
+    x_media = x.mean()
+    y_media = y.mean()
+    dx = x - x_media
+    denominador = np.dot(dx, dx)
+    # Σ dx·(y - ȳ) = Σ dx·y porque Σ dx = 0
+    m = np.dot(dx, y) / denominador if denominador != 0 else 0.0
+    return m, y_media - m * x_media
+
+def _r2_numpy(y_true, y_pred):
+    temporal = np.subtract(y_true, y_pred)
+    ss_res = np.dot(temporal, temporal)
+    np.subtract(y_true, y_true.mean(), out=temporal)
+    ss_tot = np.dot(temporal, temporal)
+    if ss_tot == 0:
+        return 1.0
+    return 1.0 - ss_res / ss_tot
+
+def _predecir_recortado_numpy(x, m, b, minimo, maximo):
+    resultado = np.multiply(x, m)
+    resultado += b
+    return np.clip(resultado, minimo, maximo, out=resultado)
+
+def _resumen_numpy(datos):
+    columnas = np.arange(datos.shape[1])
+    idx_min = np.argmin(datos, axis=0)
+    idx_max = np.argmax(datos, axis=0)
+    media = np.mean(datos, axis=0)
+    centrados = datos - media
+    m2 = np.einsum('ij,ij->j', centrados, centrados)
+    return media, m2, datos[idx_min, columnas], datos[idx_max, columnas], idx_min, idx_max
+
+# --- Implementación compilada con numba (una sola pasada, sin temporales) ---
+
+if numba is not None:
+    @numba.njit(cache=True)
+    def _ajustar_recta_numba(x, y):
+        x_media = 0.0
+        y_media = 0.0
+        s_xx = 0.0
+        s_xy = 0.0
+        for i in range(x.shape[0]):
+            dx = x[i] - x_media
+            x_media += dx / (i + 1)
+            y_media += (y[i] - y_media) / (i + 1)
+            s_xx += dx * (x[i] - x_media)
+            s_xy += dx * (y[i] - y_media)
+        m = s_xy / s_xx if s_xx != 0 else 0.0
+        return m, y_media - m * x_media
+
+    @numba.njit(cache=True)
+    def _r2_numba(y_true, y_pred):
+        media = 0.0
+        ss_tot = 0.0
+        ss_res = 0.0
+        for i in range(y_true.shape[0]):
+            delta = y_true[i] - media
+            media += delta / (i + 1)
+            ss_tot += delta * (y_true[i] - media)
+            residuo = y_true[i] - y_pred[i]
+            ss_res += residuo * residuo
+        if ss_tot == 0:
+            return 1.0
+        return 1.0 - ss_res / ss_tot
+
+    @numba.njit(cache=True)
+    def _predecir_recortado_numba(x, m, b, minimo, maximo):
+        resultado = np.empty_like(x)
+        for i in range(x.shape[0]):
+            valor = m * x[i] + b
+            resultado[i] = min(max(valor, minimo), maximo)
+        return resultado
+
+    @numba.njit(cache=True)
+    def _resumen_numba(datos):
+        n, k = datos.shape
+        media = np.zeros(k)
+        m2 = np.zeros(k)
+        minimo = datos[0].copy()
+        maximo = datos[0].copy()
+        idx_min = np.zeros(k, dtype=np.int64)
+        idx_max = np.zeros(k, dtype=np.int64)
+        for i in range(n):
+            for j in range(k):
+                valor = datos[i, j]
+                delta = valor - media[j]
+                media[j] += delta / (i + 1)
+                m2[j] += delta * (valor - media[j])
+                if valor < minimo[j]:
+                    minimo[j] = valor
+                    idx_min[j] = i
+                if valor > maximo[j]:
+                    maximo[j] = valor
+                    idx_max[j] = i
+        return media, m2, minimo, maximo, idx_min, idx_max
+
+_NUCLEOS = {
+    'numpy': (_ajustar_recta_numpy, _r2_numpy, _predecir_recortado_numpy, _resumen_numpy),
+}
+if numba is not None:
+    _NUCLEOS['numba'] = (_ajustar_recta_numba, _r2_numba, _predecir_recortado_numba, _resumen_numba)
+
+def _plano(valores):
+    return np.ascontiguousarray(valores, dtype=float).ravel()
+
+def comprobar_equivalencia(backend, n=2000, semilla=0, rtol=1e-9):
+    """Compara los núcleos de `backend` con los de NumPy sobre datos aleatorios.
+
+    Devuelve la mayor diferencia relativa encontrada; lanza ValueError si supera rtol.
+    """
+    rng = np.random.RandomState(semilla)
+    x = rng.uniform(0.5, 8.0, n)
+    y = 0.8 * x + 1.5 + rng.normal(0, 0.5, n)
+    datos = np.column_stack([x, y])
+    ajustar, r2, predecir, resumen = _NUCLEOS[backend]
+    a_ajustar, a_r2, a_predecir, a_resumen = _NUCLEOS['numpy']
+
+    pares = [(ajustar(x, y), a_ajustar(x, y)), (r2(y, x), a_r2(y, x)),
+             (predecir(x, 1.3, -1.0, 0.0, 10.0), a_predecir(x, 1.3, -1.0, 0.0, 10.0))]
+    pares += list(zip(resumen(datos), a_resumen(datos)))
+    diferencia = 0.0
+    for valor, referencia in pares:
+        valor = np.asarray(valor, dtype=float)
+        referencia = np.asarray(referencia, dtype=float)
+        escala = np.maximum(np.abs(referencia), 1.0)
+        diferencia = max(diferencia, float(np.max(np.abs(valor - referencia) / escala)))
+    # Excepción explícita y no assert: con python -O la comprobación debe seguir haciéndose
+    if not diferencia <= rtol:
+        raise ValueError(f"Los núcleos '{backend}' difieren de NumPy en {diferencia:.2e}")
+    return diferencia
+
+def elegir_backend(nombre=None):
+    """Elige los núcleos a usar: 'numba' si está instalado (y coincide con NumPy), si no 'numpy'.
+
+    La variable de entorno IA_LINEAL_NUCLEOS=numpy fuerza la versión NumPy.
+    """
+    global backend, _ajustar, _r2, _predecir, _resumen
+    nombre = nombre or os.environ.get('IA_LINEAL_NUCLEOS') or ('numba' if 'numba' in _NUCLEOS else 'numpy')
+    if nombre not in _NUCLEOS:
+        raise ValueError(f"Núcleos no disponibles: {nombre}")
+    if nombre != 'numpy':
+        try:
+            comprobar_equivalencia(nombre)
+        except ValueError as e:
+            warnings.warn(f"{e}; se usa NumPy")
+            nombre = 'numpy'
+    backend = nombre
+    _ajustar, _r2, _predecir, _resumen = _NUCLEOS[nombre]
+    return backend
+
+def ajustar_recta(x, y):
+    """(pendiente, intercepto) por mínimos cuadrados; pendiente 0 si x no varía"""
+    m, b = _ajustar(_plano(x), _plano(y))
+    return float(m), float(b)
+
+def r2(y_true, y_pred):
+    """Coeficiente R² (1.0 si y_true no varía)"""
+    return float(_r2(_plano(y_true), _plano(y_pred)))
+
+def predecir_recortado(x, m, b, minimo=0.0, maximo=10.0):
+    """m·x + b limitado a [minimo, maximo], sin arrays intermedios"""
+    return _predecir(_plano(x), float(m), float(b), float(minimo), float(maximo))
+
+def resumen(datos):
+    """(medias, M2, mínimos, máximos, idx_min, idx_max) por columna de un array (n, k) con n > 0"""
+    datos = np.ascontiguousarray(datos, dtype=float)
+    return _resumen(datos)
+
+elegir_backend()
@@ -10,6 +10,7 @@ let metodo = 'manual'; // 'manual' o 'sklearn' (simulado)
 let puntoArrastrando = null;
 let chart = null;
 let prediccionActual = null;
+let paquete = null; // modelo exportado desde Python (modelo.json); se descarta al editar los puntos
 
 // --- Utilidades de regresión lineal ---
 function regresionLinealManual(puntos) {
@@ -37,6 +38,29 @@ function regresionLinealManual(puntos) {
     return { m, b, r2 };
 }
 
+// --- Paquete precalculado (exportar_web.py) ---
+async function cargarPaquete() {
+    try {
+        const respuesta = await fetch('modelo.json');
+        if (!respuesta.ok) return;
+        paquete = await respuesta.json();
+        datos = paquete.puntos.horas.map((h, i) => ({ horas: h, nota: paquete.puntos.nota[i] }));
+    } catch (e) {
+        paquete = null; // sin paquete (o abierta como archivo local): todo se calcula aquí
+    }
+}
+
+function soltarPaquete() {
+    paquete = null;
+}
+
+// Predicción e intervalos leídos de la tabla del paquete (índice más cercano del slider)
+function prediccionPaquete(horas) {
+    const t = paquete.tabla;
+    const i = Math.min(Math.max(Math.round((horas - t.x_min) / t.paso), 0), t.prediccion.length - 1);
+    return { pred: t.prediccion[i], ipInf: t.ip_inf[i], ipSup: t.ip_sup[i], nivel: t.nivel };
+}
+
 // --- Gráfica con Chart.js ---
 function crearGrafica() {
     const ctx = document.getElementById('grafica-canvas').getContext('2d');
@@ -108,6 +132,7 @@ function crearGrafica() {
                     },
                     onDrag: function(e, datasetIndex, index, value) {
                         if (datasetIndex === 0 && puntoArrastrando !== null) {
+                            soltarPaquete();
                             datos[puntoArrastrando] = { horas: value.x, nota: value.y };
                             actualizarTodo();
                         }
@@ -122,6 +147,7 @@ function crearGrafica() {
                     // Clic derecho: eliminar punto si se hace sobre uno
                     if (elements.length && elements[0].datasetIndex === 0) {
                         const index = elements[0].index;
+                        soltarPaquete();
                         datos.splice(index, 1);
                         actualizarTodo();
                     }
@@ -134,6 +160,7 @@ function crearGrafica() {
                     const x = chart.scales.x.getValueForPixel(xPixel - rect.left);
                     const y = chart.scales.y.getValueForPixel(yPixel - rect.top);
                     if (x >= 0 && y >= 0 && x <= 10 && y <= 10) {
+                        soltarPaquete();
                         datos.push({ horas: x, nota: y });
                         actualizarTodo();
                     }
@@ -148,7 +175,7 @@ function actualizarTodo() {
     // Actualizar puntos
     chart.data.datasets[0].data = datos.map(p => ({ x: p.horas, y: p.nota }));
     // Calcular regresión
-    const { m, b, r2 } = regresionLinealManual(datos);
+    const { m, b, r2 } = paquete ? paquete.modelo : regresionLinealManual(datos);
     // Línea de regresión
     const xLine = [0, 10];
     const yLine = xLine.map(x => m * x + b);
@@ -162,12 +189,28 @@ function actualizarTodo() {
     }
     chart.update();
     // Actualizar info modelo
-    document.getElementById('info-modelo').innerText = `${metodo === 'manual' ? '🧮 Manual' : '🤖 Simulado'}\ny = ${m.toFixed(3)}x + ${b.toFixed(3)}\nR² = ${r2.toFixed(4)}`;
+    const etiqueta = paquete ? `📦 Exportado (${paquete.modelo.metodo})` : (metodo === 'manual' ? '🧮 Manual' : '🤖 Simulado');
+    document.getElementById('info-modelo').innerText = `${etiqueta}\ny = ${m.toFixed(3)}x + ${b.toFixed(3)}\nR² = ${r2.toFixed(4)}`;
     // Estadísticas
     actualizarEstadisticas();
 }
 
 function actualizarEstadisticas() {
+    if (paquete) {
+        // Estadísticas de todos los datos exportados, no solo de la muestra dibujada
+        const { horas, nota } = paquete.estadisticas;
+        const fmt = (v, d) => v === null ? '-' : v.toFixed(d);
+        document.getElementById('stats-text').innerText = `Puntos de datos: ${paquete.modelo.n} (se dibujan ${datos.length})
+Horas promedio: ${horas.media.toFixed(2)}
+Nota promedio: ${nota.media.toFixed(2)}
+
+Horas (min/max): ${horas.minimo.toFixed(1)} / ${horas.maximo.toFixed(1)}
+Nota (min/max): ${nota.minimo.toFixed(1)} / ${nota.maximo.toFixed(1)}
+
+Desv. estándar horas: ${fmt(horas.std, 2)}
+Desv. estándar notas: ${fmt(nota.std, 2)}`;
+        return;
+    }
     const n = datos.length;
     const horas = datos.map(p => p.horas);
     const notas = datos.map(p => p.nota);
@@ -189,7 +232,8 @@ Desv. estándar notas: ${std(notas).toFixed(2)}`;
 }
 
 // --- Controles ---
-document.addEventListener('DOMContentLoaded', () => {
+document.addEventListener('DOMContentLoaded', async () => {
+    await cargarPaquete();
     crearGrafica();
     actualizarTodo();
 
@@ -203,6 +247,7 @@ document.addEventListener('DOMContentLoaded', () => {
 
     // Reiniciar datos
     document.getElementById('reiniciar-btn').onclick = () => {
+        soltarPaquete();
         datos = [
             { horas: 1, nota: 2.0 },
             { horas: 2, nota: 4.0 },
@@ -220,6 +265,7 @@ document.addEventListener('DOMContentLoaded', () => {
 
     // Generar aleatorios
     document.getElementById('aleatorios-btn').onclick = () => {
+        soltarPaquete();
         const n = Math.floor(Math.random() * 7) + 8;
         datos = Array.from({ length: n }, () => {
             const horas = +(Math.random() * 7 + 1).toFixed(2);
@@ -287,6 +333,7 @@ document.addEventListener('DOMContentLoaded', () => {
                 const elements = chart.getElementsAtEventForMode(e, 'nearest', { intersect: true }, true);
                 if (elements.length && elements[0].datasetIndex === 0) {
                     const index = elements[0].index;
+                    soltarPaquete();
                     datos.splice(index, 1);
                     actualizarTodo();
                 }
@@ -297,14 +344,23 @@ document.addEventListener('DOMContentLoaded', () => {
 
 function actualizarPrediccion(horas) {
     prediccionActual = parseFloat(horas);
-    if (isNaN(prediccionActual) || datos.length < 2) {
+    if (isNaN(prediccionActual) || (!paquete && datos.length < 2)) {
         document.getElementById('resultado-prediccion').innerText = '';
         chart.data.datasets[2].data = [];
         chart.update();
         return;
     }
-    const { m, b } = regresionLinealManual(datos);
-    let pred = m * prediccionActual + b;
+    let pred, intervalo = '';
+    if (paquete) {
+        const p = prediccionPaquete(prediccionActual);
+        pred = p.pred;
+        if (p.ipInf !== null) {
+            intervalo = `\n📏 IP ${Math.round(p.nivel * 100)}%: [${Math.max(0, p.ipInf).toFixed(2)}, ${Math.min(10, p.ipSup).toFixed(2)}]`;
+        }
+    } else {
+        const { m, b } = regresionLinealManual(datos);
+        pred = m * prediccionActual + b;
+    }
     pred = Math.max(0, Math.min(10, pred));
     chart.data.datasets[2].data = [ { x: prediccionActual, y: pred } ];
     chart.update();
@@ -313,12 +369,12 @@ function actualizarPrediccion(horas) {
     if (pred >= 7) recomendacion = '✅ ¡Excelente! Con esas horas deberías obtener una buena nota.';
     else if (pred >= 5) recomendacion = '⚠️ Con esas horas podrías aprobar, pero considera estudiar más.';
     else recomendacion = '❌ Con esas horas podrías tener dificultades. Te recomiendo estudiar más.';
-    document.getElementById('resultado-prediccion').innerText = `📚 ${prediccionActual.toFixed(1)} horas → ${pred.toFixed(2)}/10\n${recomendacion}`;
+    document.getElementById('resultado-prediccion').innerText = `📚 ${prediccionActual.toFixed(1)} horas → ${pred.toFixed(2)}/10${intervalo}\n${recomendacion}`;
 }
 
 function mostrarPrediccionModal(horas) {
-    if (datos.length < 2) return;
-    const { m, b } = regresionLinealManual(datos);
+    if (!paquete && datos.length < 2) return;
+    const { m, b } = paquete ? paquete.modelo : regresionLinealManual(datos);
     let pred = m * horas + b;
     pred = Math.max(0, Math.min(10, pred));
     alert(`📚 ${horas} horas → ${pred.toFixed(2)}/10`);
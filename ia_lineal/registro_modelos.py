@@ -0,0 +1,104 @@
+import hashlib
+import json
+import os
+import pickle
+from collections import OrderedDict
+import numpy as np
+
+# Junto al código, para que ejecutar desde otro directorio use el mismo registro
+DIRECTORIO_MODELOS = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'modelos')
+
+class RegistroModelos:
+    """Registro de modelos entrenados indexado por el contenido de los datos.
+
+    La clave combina un hash de los arrays de entrenamiento (forma, tipo y
+    bytes) con el nombre del backend y sus parámetros. Entrenar dos veces con
+    los mismos datos devuelve el modelo guardado; si los datos cambian, la
+    clave cambia y el modelo antiguo deja de usarse. Se mantiene una caché LRU
+    en memoria y otra en disco (un pickle por clave, ordenados por último uso).
+    """
+    def __init__(self, directorio=DIRECTORIO_MODELOS, max_memoria=32, max_disco=500):
+        self.directorio = directorio
+        self.max_memoria = max_memoria
+        self.max_disco = max_disco
+        self.memoria = OrderedDict()
+
+    @staticmethod
+    def clave(X, y, backend, parametros=None):
+        """Calcula la clave de un entrenamiento a partir de datos, backend y parámetros"""
+        h = hashlib.blake2b(digest_size=16)
+        for array in (X, y):
+            array = np.ascontiguousarray(array)
+            h.update(f"{array.dtype.str}{array.shape}".encode('utf-8'))
+            h.update(array.tobytes())
+        h.update(backend.encode('utf-8'))
+        h.update(json.dumps(parametros or {}, sort_keys=True, default=str).encode('utf-8'))
+        return h.hexdigest()
+
+    @staticmethod
+    def es_vigente(modelo, clave):
+        """Indica si un modelo se entrenó con los datos que corresponden a la clave"""
+        return getattr(modelo, 'clave_registro_', None) == clave
+
+    def _ruta(self, clave):
+        return os.path.join(self.directorio, f"{clave}.pkl")
+
+    def _recordar(self, clave, modelo):
+        self.memoria[clave] = modelo
+        self.memoria.move_to_end(clave)
+        while len(self.memoria) > self.max_memoria:
+            self.memoria.popitem(last=False)
+
+    def obtener(self, clave):
+        """Devuelve el modelo de la clave o None si no está registrado"""
+        if clave in self.memoria:
+            self.memoria.move_to_end(clave)
+            return self.memoria[clave]
+
+        ruta = self._ruta(clave)
+        try:
+            with open(ruta, 'rb') as f:
+                modelo = pickle.load(f)
+        except (FileNotFoundError, pickle.UnpicklingError, EOFError, AttributeError, ModuleNotFoundError):
+            # Un pickle de una clase renombrada o movida se trata como si no estuviera
+            return None
+        # Marcar como usado recientemente para la LRU en disco
+        os.utime(ruta)
+        self._recordar(clave, modelo)
+        return modelo
+
+    def guardar(self, clave, modelo):
+        """Registra un modelo en memoria y en disco"""
+        modelo.clave_registro_ = clave
+        self._recordar(clave, modelo)
+
+        os.makedirs(self.directorio, exist_ok=True)
+        ruta = self._ruta(clave)
+        temporal = ruta + '.tmp'
+        with open(temporal, 'wb') as f:
+            pickle.dump(modelo, f)
+        os.replace(temporal, ruta)
+        self._limpiar_disco()
+
+    def _limpiar_disco(self):
+        """Elimina los modelos menos usados si se supera max_disco"""
+        archivos = [os.path.join(self.directorio, nombre)
+                    for nombre in os.listdir(self.directorio) if nombre.endswith('.pkl')]
+        if len(archivos) <= self.max_disco:
+            return
+        archivos.sort(key=os.path.getmtime)
+        for ruta in archivos[:len(archivos) - self.max_disco]:
+            try:
+                os.remove(ruta)
+            except FileNotFoundError:
+                pass
+
+    def obtener_o_entrenar(self, X, y, backend, entrenar, parametros=None):
+        """Devuelve (modelo, reutilizado): el modelo registrado o uno nuevo entrenado con entrenar(X, y)"""
+        clave = self.clave(X, y, backend, parametros)
+        modelo = self.obtener(clave)
+        if modelo is not None:
+            return modelo, True
+        modelo = entrenar(X, y)
+        self.guardar(clave, modelo)
+        return modelo, False
@@ -0,0 +1,111 @@
+import numpy as np
+import pandas as pd
+from modelo_manual import ModeloManual
+
+class RegresionGrupos:
+    """Una recta horas → nota por grupo (clase, profesor, trimestre...), todas a la vez.
+
+    Los estadísticos suficientes de cada grupo (n, medias y co-momentos
+    centrados) se acumulan con np.bincount sobre el código de grupo, sin
+    bucles de Python, así que miles de grupos cuestan lo mismo que un único
+    ajuste sobre todas las filas. Los resultados quedan en arrays alineados
+    con `grupos_`; predecir es buscar el índice del grupo y aplicar su recta.
+    Un grupo con menos de dos valores distintos de x tiene pendiente 0, y los
+    grupos que no se vieron al entrenar usan el ajuste global. Las filas sin
+    grupo (NaN o None) no se usan al entrenar y se predicen con el ajuste global.
+    """
+    def fit(self, grupos, X, y):
+        """Entrena con una etiqueta de grupo por fila"""
+        x = np.asarray(X, dtype=float).ravel()
+        y = np.asarray(y, dtype=float).ravel()
+        if not len(grupos) == len(x) == len(y):
+            raise ValueError("grupos, X e y deben tener la misma longitud")
+        codigos, self.grupos_ = _codificar(grupos)
+        con_grupo = codigos >= 0
+        codigos, x, y = codigos[con_grupo], x[con_grupo], y[con_grupo]
+        k = len(self.grupos_)
+
+        def sumar(pesos):
+            return np.bincount(codigos, weights=pesos, minlength=k)
+
+        n = np.bincount(codigos, minlength=k)
+        media_x = sumar(x) / n
+        media_y = sumar(y) / n
+        # Centrar con la media de cada grupo antes de acumular para no perder precisión
+        dx = x - media_x[codigos]
+        dy = y - media_y[codigos]
+        s_xx = sumar(dx * dx)
+        s_yy = sumar(dy * dy)
+        s_xy = sumar(dx * dy)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            self.pendientes_ = np.where(s_xx > 0, s_xy / s_xx, 0.0)
+            self.r2_ = np.where(s_yy > 0, s_xy * s_xy / (s_xx * s_yy), 1.0)  # sin variación en y, R² = 1
+        self.r2_[(s_xx == 0) & (s_yy > 0)] = 0.0
+        self.interceptos_ = media_y - self.pendientes_ * media_x
+        self.n_ = n
+
+        self.modelo_global_ = ModeloManual(*_ajuste_global(n, media_x, media_y, s_xx, s_xy))
+        self._indice = pd.Index(self.grupos_)
+        return self
+
+    def indices(self, grupos):
+        """Posición de cada grupo en los arrays del modelo (-1 si no se vio al entrenar)"""
+        return self._indice.get_indexer(np.asarray(grupos, dtype=object))
+
+    def predict(self, grupos, X):
+        """Predice cada fila con la recta de su grupo"""
+        x = np.asarray(X, dtype=float).ravel()
+        indices = self.indices(grupos)
+        conocidos = indices >= 0
+        pendientes = np.where(conocidos, self.pendientes_[indices], self.modelo_global_.coef_[0])
+        interceptos = np.where(conocidos, self.interceptos_[indices], self.modelo_global_.intercept_)
+        return pendientes * x + interceptos
+
+    def modelo(self, grupo):
+        """ModeloManual del grupo indicado"""
+        i = self.indices([grupo])[0]
+        if i < 0:
+            raise KeyError(f"Grupo desconocido: {grupo}")
+        return ModeloManual(self.pendientes_[i], self.interceptos_[i])
+
+    def tabla(self):
+        """DataFrame con una fila por grupo"""
+        return pd.DataFrame({
+            'Grupo': self.grupos_,
+            'n': self.n_,
+            'Pendiente': self.pendientes_,
+            'Intercepto': self.interceptos_,
+            'R2': self.r2_,
+        })
+
+def _codificar(grupos):
+    """(código por fila, etiquetas) en orden de aparición; las filas sin grupo tienen código -1.
+
+    pd.factorize admite etiquetas de tipos mezclados, que np.unique no puede ordenar.
+    """
+    codigos, etiquetas = pd.factorize(np.asarray(grupos, dtype=object))
+    return codigos, np.asarray(etiquetas, dtype=object)
+
+def _ajuste_global(n, media_x, media_y, s_xx, s_xy):
+    """Combina los estadísticos de todos los grupos en el ajuste con todas las filas"""
+    total = n.sum()
+    x_media = np.dot(n, media_x) / total
+    y_media = np.dot(n, media_y) / total
+    s_xx_total = s_xx.sum() + np.dot(n, (media_x - x_media) ** 2)
+    s_xy_total = s_xy.sum() + np.dot(n, (media_x - x_media) * (media_y - y_media))
+    m = s_xy_total / s_xx_total if s_xx_total > 0 else 0.0
+    return m, y_media - m * x_media
+
+def entrenar_por_grupos(grupos, X, y, registro=None):
+    """Entrena una RegresionGrupos, o la recupera del registro si ya se entrenó con estos datos.
+
+    Devuelve (modelo, reutilizado).
+    """
+    if registro is None:
+        return RegresionGrupos().fit(grupos, X, y), False
+    codigos, etiquetas = _codificar(grupos)
+    datos_clave = np.column_stack([codigos, np.asarray(X, dtype=float).ravel()])
+    parametros = {'grupos': [str(g) for g in etiquetas]}
+    return registro.obtener_o_entrenar(datos_clave, y, 'grupos',
+                                       lambda _X, _y: RegresionGrupos().fit(grupos, X, y), parametros)
@@ -0,0 +1,128 @@
+import time
+import numpy as np
+import pandas as pd
+
+class RegresionMultisalida:
+    """Regresión lineal de muchas variables objetivo (columnas de Y) con las mismas X.
+
+    X se factoriza una sola vez (QR de [1, X]) y todas las columnas de Y se
+    resuelven juntas con Z = Qᵀ·Y, así que añadir objetivos solo cuesta una
+    columna más en ese producto. Los datos pueden llegar por bloques con
+    agregar(): cada bloque se apila bajo el R acumulado y se vuelve a
+    factorizar (QR por bloques), sin guardar las filas ya vistas.
+    X e Y se desplazan con las medias del primer bloque para no perder
+    precisión en las sumas de cuadrados. Con la interfaz de sklearn: coef_ es
+    [objetivos, variables] e intercept_ [objetivos]; r2_ tiene el R² de cada objetivo.
+    """
+    def __init__(self):
+        self.n_ = 0
+        self._R = None
+
+    def fit(self, X, Y, tamano_bloque=None):
+        """Ajusta con todas las filas (por bloques de `tamano_bloque` filas si se indica)"""
+        X, Y = _como_matrices(X, Y)
+        self.__init__()
+        paso = tamano_bloque or max(len(X), 1)
+        for inicio in range(0, len(X), paso):
+            self.agregar(X[inicio:inicio + paso], Y[inicio:inicio + paso])
+        return self
+
+    def agregar(self, X, Y):
+        """Incorpora un bloque de filas y actualiza coeficientes y R²"""
+        X, Y = _como_matrices(X, Y)
+        if len(X) == 0:
+            return self
+        if self._R is None:
+            self._x0 = X.mean(axis=0)
+            self._y0 = Y.mean(axis=0)
+            self._suma = np.zeros(Y.shape[1])
+            self._ss = np.zeros(Y.shape[1])
+            self._R = np.empty((0, X.shape[1] + 1))
+            self._Z = np.empty((0, Y.shape[1]))
+
+        A = np.empty((len(X), X.shape[1] + 1))
+        A[:, 0] = 1.0
+        np.subtract(X, self._x0, out=A[:, 1:])
+        Yc = Y - self._y0
+        self._suma += Yc.sum(axis=0)
+        self._ss += np.einsum('ij,ij->j', Yc, Yc)
+
+        filas_previas = len(self._R)
+        Q, self._R = np.linalg.qr(np.vstack([self._R, A]))
+        # Qᵀ·[Z; Yc] por partes, sin apilar el bloque de Y
+        self._Z = Q[:filas_previas].T @ self._Z + Q[filas_previas:].T @ Yc
+        self.n_ += len(X)
+        self._resolver()
+        return self
+
+    def _resolver(self):
+        """Coeficientes y R² a partir de R, Z y las sumas (coste independiente del número de filas)"""
+        B = np.linalg.lstsq(self._R, self._Z, rcond=None)[0]
+        self.coef_ = B[1:].T
+        self.intercept_ = B[0] + self._y0 - self._x0 @ B[1:]
+        # ‖Y - A·B‖² = ‖Y‖² - ‖Z‖² + ‖Z - R·B‖², válido aunque X no tenga rango completo
+        desajuste = self._Z - self._R @ B
+        ss_res = np.maximum(self._ss - np.einsum('ij,ij->j', self._Z, self._Z), 0.0)
+        ss_res += np.einsum('ij,ij->j', desajuste, desajuste)
+        ss_tot = self._ss - self._suma ** 2 / self.n_
+        with np.errstate(divide='ignore', invalid='ignore'):
+            self.r2_ = np.where(ss_tot > 0, 1 - ss_res / ss_tot, 1.0)  # sin variación en y, R² = 1
+
+    def predict(self, X):
+        """Predice todos los objetivos a la vez: array [filas, objetivos]"""
+        X = np.asarray(X, dtype=float)
+        if X.ndim == 1:
+            X = X.reshape(-1, 1)
+        return X @ self.coef_.T + self.intercept_
+
+def _como_matrices(X, Y):
+    X = np.asarray(X, dtype=float)
+    Y = np.asarray(Y, dtype=float)
+    if X.ndim == 1:
+        X = X.reshape(-1, 1)
+    if Y.ndim == 1:
+        Y = Y.reshape(-1, 1)
+    if len(X) != len(Y):
+        raise ValueError("X e Y deben tener el mismo número de filas")
+    return X, Y
+
+def ajustar_csv(nombre_archivo, columnas_x, columnas_y, tamano_bloque=100_000):
+    """Ajusta varias columnas objetivo de un CSV leyéndolo por bloques"""
+    modelo = RegresionMultisalida()
+    for bloque in pd.read_csv(nombre_archivo, usecols=list(columnas_x) + list(columnas_y),
+                              chunksize=tamano_bloque):
+        modelo.agregar(bloque[list(columnas_x)].to_numpy(dtype=float),
+                       bloque[list(columnas_y)].to_numpy(dtype=float))
+    return modelo
+
+def main():
+    """Ejemplo: nota de muchas asignaturas a partir de las horas de estudio"""
+    print("📚 REGRESIÓN CON VARIAS SALIDAS (UNA COLUMNA POR ASIGNATURA)")
+    print("=" * 60)
+
+    rng = np.random.RandomState(42)
+    n, asignaturas = 20_000, 500
+    horas = rng.uniform(0.5, 8.0, n)
+    pendientes = rng.uniform(0.3, 1.2, asignaturas)
+    interceptos = rng.uniform(0.5, 3.0, asignaturas)
+    notas = np.clip(horas[:, None] * pendientes + interceptos + rng.normal(0, 0.8, (n, asignaturas)), 0, 10)
+
+    inicio = time.perf_counter()
+    RegresionMultisalida().fit(horas, notas[:, 0])
+    segundos_una = time.perf_counter() - inicio
+    inicio = time.perf_counter()
+    modelo = RegresionMultisalida().fit(horas, notas, tamano_bloque=5_000)
+    segundos_todas = time.perf_counter() - inicio
+
+    print(f"⏱️  1 asignatura: {segundos_una * 1000:.1f} ms · {asignaturas} asignaturas: {segundos_todas * 1000:.1f} ms")
+    print(f"{'Asignatura':>10} {'Pendiente':>10} {'Intercepto':>11} {'R²':>7}")
+    for j in range(5):
+        print(f"{j:>10} {modelo.coef_[j, 0]:>10.3f} {modelo.intercept_[j]:>11.3f} {modelo.r2_[j]:>7.4f}")
+    print(f"R² medio: {modelo.r2_.mean():.4f}")
+
+    prediccion = np.clip(modelo.predict([[5.0]])[0], 0, 10)
+    print(f"\n📈 Con 5 horas: nota media prevista {prediccion.mean():.2f} "
+          f"(entre {prediccion.min():.2f} y {prediccion.max():.2f} según la asignatura)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+import numpy as np
+
+CRITERIOS = ('cv', 'aic', 'bic')
+
+class RegresionPolinomica:
+    """Regresión polinómica sobre una base de polinomios ortogonales en los datos.
+
+    Los polinomios se generan con la recurrencia de tres términos
+        p₀ = 1,  p₁ = (z - α₀)·p₀,  pₖ₊₁ = (z - αₖ)·pₖ - βₖ·pₖ₋₁
+    con z = x reescalada a [-1, 1], y son ortogonales entre sí sobre los
+    puntos de entrenamiento. Por eso el coeficiente de cada grado no cambia al
+    añadir los siguientes: subir un grado solo cuesta calcular una columna
+    nueva (O(n)), y la suma de cuadrados residual, el apalancamiento y el
+    error de validación cruzada dejando uno fuera (e_i / (1 - h_i)) de cada
+    grado se actualizan con esa columna. El grado se elige con `criterio`:
+    'cv' (validación cruzada dejando uno fuera), 'aic' o 'bic'.
+    Fuera del rango de x de entrenamiento un polinomio se dispara, así que
+    predict sigue ahí en línea recta desde el borde con la pendiente del
+    ajuste de grado 1.
+    """
+    def __init__(self, grado_max=8, criterio='cv'):
+        if criterio not in CRITERIOS:
+            raise ValueError(f"Criterio desconocido: {criterio} (opciones: {', '.join(CRITERIOS)})")
+        self.grado_max = grado_max
+        self.criterio = criterio
+
+    def fit(self, X, y):
+        """Recorre los grados 0..grado_max (o hasta donde los datos lo permitan) y elige uno"""
+        x = np.asarray(X, dtype=float).ravel()
+        y = np.asarray(y, dtype=float).ravel()
+        if len(x) != len(y):
+            raise ValueError("X e y deben tener la misma longitud")
+        minimo, maximo = x.min(), x.max()
+        self.rango_ = (float(minimo), float(maximo))
+        self.centro_ = (maximo + minimo) / 2
+        self.escala_ = (maximo - minimo) / 2 or 1.0
+        # Con d valores distintos de x solo hay d polinomios no nulos en los datos
+        self._limite = min(len(np.unique(x)) - 1, len(x) - 2)
+
+        self.n_ = len(x)
+        self._z = (x - self.centro_) / self.escala_
+        self._y = y
+        self._residuos = y.copy()
+        self._apalancamiento = np.zeros(len(x))
+        self._p_anterior = np.zeros(len(x))
+        self._p = np.ones(len(x))
+        self.ss_tot_ = float(np.dot(y - y.mean(), y - y.mean()))
+        self.coeficientes_ = []
+        self.alfas_ = []
+        self.betas_ = []
+        self.normas_ = []
+        self.rss_ = []
+        self.cv_ = []
+
+        self.subir_grado()
+        while self.grado_alcanzado_ < self.grado_max and self.subir_grado():
+            pass
+        return self
+
+    def subir_grado(self):
+        """Añade el siguiente grado a la base (O(n)) y vuelve a elegir el grado; False si no se puede"""
+        k = len(self.coeficientes_)
+        if k > 0:
+            if k > self._limite:
+                return False
+            p_nuevo = (self._z - self.alfas_[-1]) * self._p - self.betas_[-1] * self._p_anterior
+            self._p_anterior, self._p = self._p, p_nuevo
+        p = self._p
+        norma = float(np.dot(p, p))
+
+        # Coeficiente sobre el residuo actual (Gram-Schmidt modificado): más estable que sobre y
+        coeficiente = float(np.dot(p, self._residuos)) / norma
+        self._residuos -= coeficiente * p
+        self._apalancamiento += p * p / norma
+        self.coeficientes_.append(coeficiente)
+        self.normas_.append(norma)
+        self.alfas_.append(float(np.dot(self._z * p, p)) / norma)
+        self.betas_.append(norma / self.normas_[-2] if k > 0 else 0.0)
+
+        self.rss_.append(float(np.dot(self._residuos, self._residuos)))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            errores_loo = self._residuos / (1.0 - self._apalancamiento)
+        self.cv_.append(float(np.mean(errores_loo ** 2)) if np.all(self._apalancamiento < 1 - 1e-12) else np.inf)
+        self._elegir()
+        return True
+
+    @property
+    def grado_alcanzado_(self):
+        return len(self.coeficientes_) - 1
+
+    @property
+    def r2_(self):
+        """R² de cada grado 0..grado_alcanzado_"""
+        if self.ss_tot_ == 0:
+            return np.ones(len(self.rss_))
+        return 1 - np.array(self.rss_) / self.ss_tot_
+
+    @property
+    def criterios_(self):
+        """Valor del criterio de selección en cada grado (menor es mejor)"""
+        if self.criterio == 'cv':
+            return np.array(self.cv_)
+        n = self.n_
+        parametros = np.arange(1, len(self.rss_) + 1)
+        with np.errstate(divide='ignore'):
+            ajuste = n * np.log(np.maximum(self.rss_, 1e-300) / n)
+        penalizacion = 2 * parametros if self.criterio == 'aic' else parametros * np.log(n)
+        return ajuste + penalizacion
+
+    def _elegir(self):
+        self.grado_ = int(np.argmin(self.criterios_))
+
+    def fuera_de_rango(self, X):
+        """Máscara de los valores de X fuera del rango visto al entrenar"""
+        x = np.asarray(X, dtype=float).ravel()
+        return (x < self.rango_[0]) | (x > self.rango_[1])
+
+    def predict(self, X, grado=None):
+        """Evalúa el polinomio del grado elegido (o de `grado`); fuera del rango de entrenamiento, recta desde el borde"""
+        grado = self.grado_ if grado is None else min(grado, self.grado_alcanzado_)
+        x = np.asarray(X, dtype=float).ravel()
+        borde = np.clip(x, *self.rango_)
+        # p₁ = z - α₀ y dz/dx = 1/escala: pendiente de la recta de mínimos cuadrados
+        pendiente = self.coeficientes_[1] / self.escala_ if grado >= 1 else 0.0
+        return self._evaluar(borde, grado) + pendiente * (x - borde)
+
+    def _evaluar(self, x, grado):
+        z = (x - self.centro_) / self.escala_
+        p_anterior = np.zeros_like(z)
+        p = np.ones_like(z)
+        resultado = np.full_like(z, self.coeficientes_[0])
+        for k in range(1, grado + 1):
+            p_anterior, p = p, (z - self.alfas_[k - 1]) * p - self.betas_[k - 1] * p_anterior
+            resultado += self.coeficientes_[k] * p
+        return resultado
+
+    def liberar_datos(self):
+        """Descarta los arrays de entrenamiento (ya no se podrá subir_grado)"""
+        for nombre in ('_z', '_y', '_residuos', '_apalancamiento', '_p_anterior', '_p'):
+            setattr(self, nombre, None)
+        self._limite = self.grado_alcanzado_
+        return self
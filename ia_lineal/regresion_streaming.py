@@ -0,0 +1,186 @@
+from collections import deque, namedtuple
+import numpy as np
+import pandas as pd
+from modelo_manual import entrenar_modelo_manual, calcular_r2_manual
+
+ResultadoVentana = namedtuple('ResultadoVentana', ['n', 'pendiente', 'intercepto', 'r2', 'tiempo'])
+
+def _dias_entre(t_inicio, t_fin):
+    """Devuelve los días transcurridos entre dos marcas de tiempo (números o fechas)"""
+    diferencia = t_fin - t_inicio
+    if hasattr(diferencia, 'total_seconds'):
+        return diferencia.total_seconds() / 86400.0
+    if isinstance(diferencia, np.timedelta64):
+        return diferencia / np.timedelta64(1, 'D')
+    return float(diferencia)
+
+class RegresionVentana:
+    """Regresión lineal sobre una ventana deslizante de los últimos N registros o T días.
+
+    Mantiene sumas acumuladas (desplazadas respecto a un origen) para añadir y
+    expulsar registros en O(1), y recalcula las sumas exactamente cada
+    `recalcular_cada` actualizaciones para acotar el error de punto flotante.
+    """
+    def __init__(self, max_registros=None, max_dias=None, recalcular_cada=1000,
+                 emitir_cada=1, al_emitir=None):
+        if max_registros is None and max_dias is None:
+            raise ValueError("Hay que indicar max_registros, max_dias o ambos")
+        if max_registros is not None and max_registros < 2:
+            raise ValueError("La ventana debe contener al menos 2 registros")
+
+        self.max_registros = max_registros
+        self.max_dias = max_dias
+        self.recalcular_cada = recalcular_cada
+        self.emitir_cada = emitir_cada
+        self.al_emitir = al_emitir
+
+        self.ventana = deque()
+        self.actualizaciones = 0
+        self._reiniciar_sumas(0.0, 0.0)
+
+    def _reiniciar_sumas(self, x0, y0):
+        """Fija un nuevo origen para las sumas y las pone a cero"""
+        self.x0 = x0
+        self.y0 = y0
+        self.sx = self.sy = 0.0
+        self.sxx = self.sxy = self.syy = 0.0
+
+    def _sumar(self, x, y, signo):
+        """Añade (signo=1) o quita (signo=-1) un registro de las sumas acumuladas"""
+        dx = x - self.x0
+        dy = y - self.y0
+        self.sx += signo * dx
+        self.sy += signo * dy
+        self.sxx += signo * dx * dx
+        self.sxy += signo * dx * dy
+        self.syy += signo * dy * dy
+
+    def recalcular(self):
+        """Recalcula las sumas exactamente a partir del contenido de la ventana"""
+        if not self.ventana:
+            self._reiniciar_sumas(0.0, 0.0)
+            return
+        _, X, y = self.arrays()
+        # Centrar en las medias actuales minimiza la cancelación en las sumas
+        self._reiniciar_sumas(float(np.mean(X)), float(np.mean(y)))
+        dx = X - self.x0
+        dy = y - self.y0
+        self.sx = float(np.sum(dx))
+        self.sy = float(np.sum(dy))
+        self.sxx = float(np.dot(dx, dx))
+        self.sxy = float(np.dot(dx, dy))
+        self.syy = float(np.dot(dy, dy))
+
+    def _expulsar_antiguos(self, t):
+        """Expulsa los registros que ya no caben en la ventana"""
+        if self.max_registros is not None:
+            while len(self.ventana) > self.max_registros:
+                _, x_viejo, y_viejo = self.ventana.popleft()
+                self._sumar(x_viejo, y_viejo, -1)
+        if self.max_dias is not None and t is not None:
+            while self.ventana and _dias_entre(self.ventana[0][0], t) > self.max_dias:
+                _, x_viejo, y_viejo = self.ventana.popleft()
+                self._sumar(x_viejo, y_viejo, -1)
+
+    def agregar(self, x, y, t=None):
+        """Añade un registro y devuelve el resultado si toca emitirlo (si no, None)"""
+        if self.max_dias is not None and t is None:
+            raise ValueError("Una ventana por días necesita la marca de tiempo t")
+
+        x = float(x)
+        y = float(y)
+        if not self.ventana:
+            self._reiniciar_sumas(x, y)
+        self.ventana.append((t, x, y))
+        self._sumar(x, y, 1)
+        self._expulsar_antiguos(t)
+
+        self.actualizaciones += 1
+        if self.recalcular_cada and self.actualizaciones % self.recalcular_cada == 0:
+            self.recalcular()
+
+        if self.actualizaciones % self.emitir_cada == 0:
+            resultado = self.resultado()
+            if self.al_emitir is not None:
+                self.al_emitir(resultado)
+            return resultado
+        return None
+
+    def procesar(self, registros):
+        """Consume un flujo de registros (t, x, y) y va generando los resultados emitidos"""
+        for t, x, y in registros:
+            resultado = self.agregar(x, y, t)
+            if resultado is not None:
+                yield resultado
+
+    def resultado(self):
+        """Calcula pendiente, intercepto y R² de la ventana a partir de las sumas"""
+        n = len(self.ventana)
+        t = self.ventana[-1][0] if self.ventana else None
+        if n < 2:
+            return ResultadoVentana(n, float('nan'), float('nan'), float('nan'), t)
+
+        media_dx = self.sx / n
+        media_dy = self.sy / n
+        s_xx = self.sxx - self.sx * media_dx
+        s_xy = self.sxy - self.sx * media_dy
+        s_yy = self.syy - self.sy * media_dy
+
+        # Mismo criterio que entrenar_modelo_manual: sin variación en x, m = 0
+        m = s_xy / s_xx if s_xx > 0 else 0.0
+        b = (self.y0 + media_dy) - m * (self.x0 + media_dx)
+
+        # Mismo criterio que calcular_r2_manual: sin variación en y, R² = 1
+        if s_yy <= 0:
+            r2 = 1.0
+        else:
+            ss_res = max(s_yy - m * s_xy, 0.0)
+            r2 = 1 - ss_res / s_yy
+
+        return ResultadoVentana(n, m, b, r2, t)
+
+    def arrays(self):
+        """Devuelve los arrays (t, X, y) de los registros de la ventana"""
+        t = [registro[0] for registro in self.ventana]
+        X = np.fromiter((registro[1] for registro in self.ventana), dtype=float, count=len(self.ventana))
+        y = np.fromiter((registro[2] for registro in self.ventana), dtype=float, count=len(self.ventana))
+        return t, X, y
+
+    def resultado_exacto(self):
+        """Resultado de referencia con las fórmulas manuales sobre la ventana completa"""
+        _, X, y = self.arrays()
+        t = self.ventana[-1][0] if self.ventana else None
+        if len(X) < 2:
+            return ResultadoVentana(len(X), float('nan'), float('nan'), float('nan'), t)
+        modelo = entrenar_modelo_manual(X, y)
+        r2 = calcular_r2_manual(y, modelo.predict(X))
+        return ResultadoVentana(len(X), modelo.coef_[0], modelo.intercept_, r2, t)
+
+def regresion_ventana_desde_df(df, columna_x='Horas', columna_y='Nota', columna_tiempo=None, **kwargs):
+    """Aplica una regresión por ventana deslizante a un DataFrame ordenado en el tiempo"""
+    regresion = RegresionVentana(**kwargs)
+    if columna_tiempo is None:
+        tiempos = [None] * len(df)
+    else:
+        tiempos = df[columna_tiempo].tolist()
+    registros = zip(tiempos, df[columna_x].to_numpy(), df[columna_y].to_numpy())
+    return pd.DataFrame(list(regresion.procesar(registros)))
+
+def main():
+    """Ejemplo: deriva de la pendiente en un flujo de notas"""
+    print("🌊 REGRESIÓN EN VENTANA DESLIZANTE")
+    print("=" * 50)
+
+    np.random.seed(42)
+    n = 2000
+    horas = np.random.uniform(0.5, 8.0, n)
+    # La relación horas→nota cambia a mitad del flujo
+    pendiente_real = np.where(np.arange(n) < n // 2, 0.8, 0.4)
+    notas = np.clip(pendiente_real * horas + 1.5 + np.random.normal(0, 0.5, n), 0, 10)
+    df = pd.DataFrame({'Dia': np.arange(n) / 20.0, 'Horas': horas, 'Nota': notas})
+
+    resultados = regresion_ventana_desde_df(df, columna_tiempo='Dia', max_dias=10, emitir_cada=250)
+    print(resultados.to_string(index=False))
+
+if __name__ == "__main__":
+    main()
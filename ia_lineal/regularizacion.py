@@ -0,0 +1,208 @@
+import numpy as np
+
+class ModeloRegularizado:
+    """Modelo lineal con la interfaz de sklearn (coef_, intercept_, predict) y su penalización"""
+    def __init__(self, coef, intercept, alpha, tipo, l1_ratio=None):
+        self.coef_ = np.asarray(coef, dtype=float)
+        self.intercept_ = float(intercept)
+        self.alpha_ = float(alpha)
+        self.tipo = tipo
+        self.l1_ratio = l1_ratio
+
+    def predict(self, X):
+        X = np.asarray(X, dtype=float)
+        if X.ndim == 1:
+            X = X.reshape(-1, 1)
+        return X @ self.coef_ + self.intercept_
+
+def _centrar(X, y):
+    """Centra X e y; el intercepto se recupera después a partir de las medias"""
+    X = np.asarray(X, dtype=float)
+    if X.ndim == 1:
+        X = X.reshape(-1, 1)
+    y = np.asarray(y, dtype=float).ravel()
+    x_media = X.mean(axis=0)
+    y_media = y.mean()
+    return X - x_media, y - y_media, x_media, y_media
+
+def rejilla_alphas(X, y, n_alphas=100, eps=1e-3, l1_ratio=1.0):
+    """Rejilla logarítmica decreciente desde el alpha que anula todos los coeficientes"""
+    Xc, yc, _, _ = _centrar(X, y)
+    n = len(yc)
+    alpha_max = np.max(np.abs(Xc.T @ yc)) / (n * max(l1_ratio, 1e-3))
+    if alpha_max == 0:
+        alpha_max = 1.0
+    return np.logspace(np.log10(alpha_max), np.log10(alpha_max * eps), n_alphas)
+
+def camino_ridge(X, y, alphas):
+    """Coeficientes ridge para todas las penalizaciones con una sola SVD.
+
+    Minimiza ‖y - Xβ‖² + α·‖β‖², igual que Ridge(alpha) de sklearn (sin dividir
+    por n, a diferencia de lasso/elastic-net, que siguen a Lasso/ElasticNet).
+    Con X = U·S·Vᵀ, β(α) = V · diag(s / (s² + α)) · Uᵀy, así que cada alpha
+    adicional solo cuesta un producto de tamaño p.
+    Devuelve (coeficientes [n_alphas, p], interceptos [n_alphas]).
+    """
+    Xc, yc, x_media, y_media = _centrar(X, y)
+    U, s, Vt = np.linalg.svd(Xc, full_matrices=False)
+    uty = U.T @ yc
+    alphas = np.asarray(alphas, dtype=float)
+    factores = s / (s[None, :] ** 2 + alphas[:, None])
+    coeficientes = (factores * uty) @ Vt
+    interceptos = y_media - coeficientes @ x_media
+    return coeficientes, interceptos
+
+def _umbral_suave(z, gamma):
+    return np.sign(z) * np.maximum(np.abs(z) - gamma, 0.0)
+
+def _descenso_coordenadas(Xc, yc, normas, alpha, l1_ratio, beta, activos, max_iter, tol):
+    """Descenso por coordenadas de elastic-net sobre las columnas activas (modifica beta)"""
+    n = len(yc)
+    residuo = yc - Xc @ beta
+    penal_l1 = alpha * l1_ratio * n
+    penal_l2 = alpha * (1 - l1_ratio) * n
+    for _ in range(max_iter):
+        cambio_maximo = 0.0
+        for j in activos:
+            if normas[j] == 0:
+                continue
+            anterior = beta[j]
+            rho = Xc[:, j] @ residuo + normas[j] * anterior
+            beta[j] = _umbral_suave(rho, penal_l1) / (normas[j] + penal_l2)
+            if beta[j] != anterior:
+                residuo -= Xc[:, j] * (beta[j] - anterior)
+                cambio_maximo = max(cambio_maximo, abs(beta[j] - anterior))
+        if cambio_maximo < tol:
+            break
+    return beta
+
+def camino_elastic_net(X, y, alphas=None, l1_ratio=1.0, max_iter=1000, tol=1e-6):
+    """Camino de lasso (l1_ratio=1) o elastic-net con warm starts y cribado de variables.
+
+    Las penalizaciones se recorren de mayor a menor partiendo de la solución
+    anterior. En cada alpha la regla fuerte secuencial descarta las columnas
+    que casi seguro valen cero; se itera solo sobre las que quedan y al final
+    se comprueban las condiciones KKT de las descartadas por si hay que
+    añadirlas. Devuelve (alphas, coeficientes [n_alphas, p], interceptos).
+    """
+    Xc, yc, x_media, y_media = _centrar(X, y)
+    n, p = Xc.shape
+    if alphas is None:
+        alphas = rejilla_alphas(X, y, l1_ratio=l1_ratio)
+    alphas = np.sort(np.asarray(alphas, dtype=float))[::-1]
+
+    normas = np.einsum('ij,ij->j', Xc, Xc)
+    beta = np.zeros(p)
+    coeficientes = np.zeros((len(alphas), p))
+    alpha_anterior = alphas[0]
+
+    for k, alpha in enumerate(alphas):
+        # Regla fuerte: |x_jᵀ r| < l1·n·(2α - α_anterior) ⇒ β_j = 0 casi seguro
+        correlaciones = np.abs(Xc.T @ (yc - Xc @ beta))
+        umbral = l1_ratio * n * (2 * alpha - alpha_anterior)
+        candidatos = (correlaciones >= umbral) | (beta != 0)
+
+        while True:
+            activos = np.flatnonzero(candidatos)
+            _descenso_coordenadas(Xc, yc, normas, alpha, l1_ratio, beta, activos, max_iter, tol)
+            # Comprobar KKT en las columnas descartadas
+            correlaciones = np.abs(Xc.T @ (yc - Xc @ beta))
+            violaciones = ~candidatos & (correlaciones > l1_ratio * n * alpha * (1 + 1e-9))
+            if not violaciones.any():
+                break
+            candidatos |= violaciones
+
+        coeficientes[k] = beta
+        alpha_anterior = alpha
+
+    interceptos = y_media - coeficientes @ x_media
+    return alphas, coeficientes, interceptos
+
+def _particiones(n, k, semilla):
+    indices = np.random.RandomState(semilla).permutation(n)
+    return np.array_split(indices, k)
+
+def validacion_cruzada(X, y, tipo='ridge', alphas=None, l1_ratio=1.0, k=5, semilla=42):
+    """Elige la penalización por validación cruzada en k bloques.
+
+    En cada bloque se calcula el camino completo (una SVD para ridge, un
+    recorrido con warm starts para lasso/elastic-net) y se evalúan todos los
+    alphas a la vez con un producto matricial.
+    Devuelve (modelo con el mejor alpha ajustado en todos los datos, alphas, error medio por alpha).
+    """
+    X = np.asarray(X, dtype=float)
+    if X.ndim == 1:
+        X = X.reshape(-1, 1)
+    y = np.asarray(y, dtype=float).ravel()
+    if alphas is None:
+        alphas = rejilla_alphas(X, y, l1_ratio=l1_ratio if tipo != 'ridge' else 1.0)
+        if tipo == 'ridge':
+            # La rejilla está en la escala por muestra de lasso; ridge penaliza sin dividir por n
+            alphas = alphas * len(y)
+    alphas = np.sort(np.asarray(alphas, dtype=float))[::-1]
+
+    errores = np.zeros(len(alphas))
+    for bloque in _particiones(len(y), k, semilla):
+        entrenamiento = np.ones(len(y), dtype=bool)
+        entrenamiento[bloque] = False
+        X_ent, y_ent = X[entrenamiento], y[entrenamiento]
+        if tipo == 'ridge':
+            coeficientes, interceptos = camino_ridge(X_ent, y_ent, alphas)
+        else:
+            _, coeficientes, interceptos = camino_elastic_net(X_ent, y_ent, alphas, l1_ratio)
+        predicciones = X[bloque] @ coeficientes.T + interceptos
+        errores += np.sum((predicciones - y[bloque, None]) ** 2, axis=0)
+    errores /= len(y)
+
+    mejor = int(np.argmin(errores))
+    modelo = ajustar_regularizado(X, y, alphas[mejor], tipo, l1_ratio)
+    return modelo, alphas, errores
+
+def ajustar_regularizado(X, y, alpha, tipo='ridge', l1_ratio=1.0):
+    """Ajusta un único modelo ridge, lasso o elastic-net"""
+    if tipo == 'ridge':
+        coeficientes, interceptos = camino_ridge(X, y, [alpha])
+        return ModeloRegularizado(coeficientes[0], interceptos[0], alpha, tipo)
+    if tipo == 'lasso':
+        l1_ratio = 1.0
+    # Warm start desde el alpha que anula todo hasta el alpha pedido
+    alpha_max = rejilla_alphas(X, y, n_alphas=1, l1_ratio=l1_ratio)[0]
+    alphas = np.logspace(np.log10(max(alpha_max, alpha)), np.log10(alpha), 10)
+    _, coeficientes, interceptos = camino_elastic_net(X, y, alphas, l1_ratio)
+    return ModeloRegularizado(coeficientes[-1], interceptos[-1], alpha, tipo, l1_ratio)
+
+def main():
+    """Ejemplo: nota a partir de varias variables con selección automática de la penalización"""
+    from main import guardar_modelo
+    # Importar el módulo por su nombre para que el pickle no dependa de __main__
+    import regularizacion
+
+    print("🎯 REGRESIÓN REGULARIZADA (RIDGE / LASSO)")
+    print("=" * 50)
+
+    np.random.seed(42)
+    n = 300
+    variables = ['Horas', 'Horas_Sueno', 'Asistencia', 'Ejercicios', 'Redes_Sociales', 'Cafe']
+    X = np.column_stack([
+        np.random.uniform(0.5, 8.0, n),
+        np.random.uniform(4.0, 10.0, n),
+        np.random.uniform(0.5, 1.0, n),
+        np.random.randint(0, 20, n),
+        np.random.uniform(0, 5, n),
+        np.random.randint(0, 4, n),
+    ])
+    # Solo algunas variables influyen realmente en la nota
+    notas = 0.6 * X[:, 0] + 0.2 * X[:, 1] + 2.0 * X[:, 2] - 0.3 * X[:, 4] + np.random.normal(0, 0.5, n)
+    notas = np.clip(notas, 0, 10)
+
+    for tipo in ['ridge', 'lasso']:
+        modelo, alphas, errores = regularizacion.validacion_cruzada(X, notas, tipo)
+        print(f"\n{tipo.upper()}: alpha elegido = {modelo.alpha_:.5f} (ECM validación = {errores.min():.4f})")
+        for nombre, coef in zip(variables, modelo.coef_):
+            print(f"   {nombre:15s} {coef:+.3f}")
+        print(f"   {'Intercepto':15s} {modelo.intercept_:+.3f}")
+
+    guardar_modelo(modelo, 'modelo_regularizado.pkl')
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+from functools import cached_property
+import numpy as np
+from diagnosticos import calcular_diagnosticos
+from intervalos import BandaIntervalos, calcular_intervalos
+
+class ReporteAjuste:
+    """Resultado de un ajuste lineal simple.
+
+    Las cantidades derivadas (predicciones, residuos, R², RMSE, errores estándar
+    y puntos de la línea de regresión) se calculan la primera vez que se piden
+    y se guardan, de modo que mostrar, graficar y experimentar con el mismo
+    ajuste no repite las pasadas de predict sobre los datos.
+    """
+    def __init__(self, modelo, X, y):
+        self.modelo = modelo
+        self.X = X
+        self.y = np.asarray(y, dtype=float)
+
+    @property
+    def m(self):
+        return self.modelo.coef_[0]
+
+    @property
+    def b(self):
+        return self.modelo.intercept_
+
+    @property
+    def n(self):
+        return len(self.y)
+
+    @cached_property
+    def x(self):
+        """Variable independiente como array plano"""
+        return np.asarray(self.X, dtype=float).ravel()
+
+    @cached_property
+    def y_pred(self):
+        return np.asarray(self.modelo.predict(self.X), dtype=float).ravel()
+
+    @cached_property
+    def residuos(self):
+        return self.y - self.y_pred
+
+    @cached_property
+    def ss_res(self):
+        return float(np.dot(self.residuos, self.residuos))
+
+    @cached_property
+    def ss_tot(self):
+        centrados = self.y - np.mean(self.y)
+        return float(np.dot(centrados, centrados))
+
+    @cached_property
+    def r2(self):
+        if self.ss_tot == 0:
+            return 1.0  # Si no hay variación, R² = 1
+        return 1 - self.ss_res / self.ss_tot
+
+    @cached_property
+    def rmse(self):
+        return float(np.sqrt(self.ss_res / self.n))
+
+    @cached_property
+    def s_xx(self):
+        centrados = self.x - np.mean(self.x)
+        return float(np.dot(centrados, centrados))
+
+    @cached_property
+    def varianza_residual(self):
+        """Estimación insesgada de la varianza del error: SS_res / (n - 2)"""
+        if self.n <= 2:
+            return float('nan')
+        return self.ss_res / (self.n - 2)
+
+    @cached_property
+    def errores_estandar(self):
+        """Errores estándar de (pendiente, intercepto)"""
+        if self.n <= 2 or self.s_xx == 0:
+            return float('nan'), float('nan')
+        s2 = self.varianza_residual
+        x_media = np.mean(self.x)
+        error_m = np.sqrt(s2 / self.s_xx)
+        error_b = np.sqrt(s2 * (1 / self.n + x_media ** 2 / self.s_xx))
+        return float(error_m), float(error_b)
+
+    @cached_property
+    def linea(self):
+        """Puntos (X_line, y_line) de la recta entre min(x) - 0.5 y max(x) + 0.5"""
+        X_line = np.linspace(self.x.min() - 0.5, self.x.max() + 0.5, 100)
+        return X_line, self.m * X_line + self.b
+
+    @cached_property
+    def banda(self):
+        """Intervalos de confianza y predicción al 95 % precalculados entre 0 y max(10, max(x) + 1)"""
+        return BandaIntervalos.desde_reporte(self, x_min=0.0, x_max=max(10.0, self.x.max() + 1))
+
+    def intervalos(self, x, nivel=0.95):
+        """Predicción e intervalos exactos para un lote de valores de x"""
+        return calcular_intervalos(x, self.m, self.b, self.n, float(np.mean(self.x)),
+                                   self.s_xx, self.varianza_residual, nivel)
+
+    @cached_property
+    def diagnosticos(self):
+        """Apalancamiento, residuos studentizados, DFFITS y distancia de Cook de cada punto"""
+        return calcular_diagnosticos(self.x, self.y, self.m, self.b)